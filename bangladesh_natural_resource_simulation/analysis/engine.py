@@ -1,71 +1,121 @@
+import logging
 import os
-import matplotlib.pyplot as plt
+import numpy as np
+
+from ..instrumentation import Profiler
+from .plotting import PlotSpec, FanChartSpec, PlotRenderer
+from .metrics import MetricTable
+
+logger = logging.getLogger(__name__)
+
+# Headline metrics of the report: name -> (model, indicator, metric from analysis.metrics.METRICS)
+HEADLINE_METRICS = {
+    "total_simulated_urban_expansion": ("land", "urban_area_expansion", "cumulative"),
+    "agricultural_land_total_change_sqkm": ("land", "agricultural_land_area_change", "cumulative"),
+    "groundwater_level_total_change_m": ("water", "groundwater_level_change", "cumulative"),
+    "wetland_area_total_change_sqkm": ("water", "wetland_area_change", "cumulative"),
+    "soil_organic_matter_total_change": ("land", "average_soil_organic_matter_change", "cumulative"),
+    "forest_carbon_balance": ("forest", "carbon_stock_change", "cumulative"),
+    "biodiversity_index_change": ("biodiversity", "threatened_species_index_change", "cumulative"),
+    "energy_renewable_share_change_percent_points": ("energy", "energy_mix_renewable_share_change_percent_points", "cumulative"),
+    "marine_stock_sustainability_change": ("marine", "hilsa_catch_sustainability_index_change", "cumulative"),
+    "climate_vulnerability_end_change": ("climate", "overall_vulnerability_index_change", "end_state"),
+    "governance_effectiveness_change": ("governance", "overall_governance_effectiveness_index_change", "cumulative"),
+    "community_empowerment_end_change": ("community", "community_empowerment_index_change", "end_state"),
+    "resource_efficiency_improvement": ("sustainable_use", "overall_resource_efficiency_index_change", "cumulative"),
+    "conservation_effectiveness_change": ("conservation", "protected_area_effectiveness_score_change", "cumulative"),
+}
 
 class NaturalResourceAnalysisEngine:
     """Analyze and visualize natural resource simulation results"""
-    def __init__(self, simulation_results, config):
+    def __init__(self, simulation_results, config, profiler=None, ensemble_statistics=None):
         """
         Initializes the AnalysisEngine.
         
         Args:
             simulation_results (dict): The results collected from the simulation run.
             config: Configuration object/dictionary.
+            profiler (Profiler, optional): The simulation's profiler (simulation.profiler), so the
+                                           report covers model steps, data loading and analysis
+                                           stages together. A new one is created if not given.
+            ensemble_statistics (EnsembleStatistics, optional): Streaming ensemble statistics
+                                           (EnsembleRunner.run(statistics=...)); adds fan charts and
+                                           exceedance probabilities to the report. Defaults to the
+                                           .statistics of ensemble results, if any.
         """
         self.results = simulation_results
         self.config = config
+        self.profiler = profiler if profiler is not None else Profiler.from_config(config)
         self.metrics = None # To store calculated metrics
+        self.metric_table = None # MetricTable of every metric for every indicator
         self.summary = None # To store analysis summary
         self.output_dir = config.get("output_dir", "./outputs/")
         self.viz_dir = os.path.join(self.output_dir, 'visualizations')
         self.report_file = os.path.join(self.output_dir, 'report.html')
+        self.indicator_plots = [] # (model, indicator, filename relative to viz_dir), set by generate_visualizations
+        self.ensemble_statistics = (ensemble_statistics if ensemble_statistics is not None
+                                    else getattr(simulation_results, 'statistics', None))
+        self.ensemble_plots = [] # (model, indicator, filename) of the fan charts
         
         # Ensure output directories exist
         os.makedirs(self.output_dir, exist_ok=True)
         os.makedirs(self.viz_dir, exist_ok=True)
             
-        print("Initializing Natural Resource Analysis Engine...")
+        logger.debug("Initializing Natural Resource Analysis Engine...")
+
+    def _is_ensemble(self):
+        """True when the results are an EnsembleResults store (n_members x n_columns x n_years)."""
+        return hasattr(self.results, 'n_members')
+
+    def _years(self):
+        """Returns the simulated years in ascending order."""
+        if self._is_ensemble():
+            if self.ensemble_statistics is not None:
+                return np.asarray(self.ensemble_statistics.years)
+            return self.results.years
+        if hasattr(self.results, 'recorded_years'):
+            return self.results.recorded_years
+        return np.array(sorted(self.results.keys()))
+
+    def _series(self, model, indicator):
+        """
+        Returns one indicator's values over the simulated years as an array.
+        Reads the column directly when results come from the columnar store, and
+        falls back to a per-year walk for plain nested dictionaries. For ensemble results
+        this is the median across members.
+        """
+        if self._is_ensemble():
+            return np.nanmedian(self.results.series(model, indicator), axis=0)
+        if hasattr(self.results, 'series'):
+            return self.results.series(model, indicator)
+        return np.array([self.results[y][model][indicator] for y in sorted(self.results.keys())], dtype=float)
 
     def generate_resource_metrics(self):
         """
         Calculate key natural resource indicators and metrics from simulation results for Bangladesh.
+
+        Every metric in analysis.metrics.METRICS (cumulative sum, mean, trend slope, end state;
+        plus percentiles across members for ensemble results) is computed for every numeric
+        indicator in one vectorized pass, and stored in self.metric_table. The headline
+        metrics (HEADLINE_METRICS) are selected from that table.
         
         Returns:
-            dict: A dictionary of calculated metrics.
+            dict: Headline metric name -> value.
         """
-        print("Generating resource metrics...")
+        logger.info("Generating resource metrics...")
         metrics = {}
-        
-        # Placeholder logic: Iterate through self.results 
-        # Example: Extract end-state value or calculate trend
         try:
-            years = sorted(self.results.keys())
-            start_year = years[0]
-            end_year = years[-1]
-            
-            # Example: Calculate total change in urban area
-            start_urban_change = self.results[start_year]['land']['urban_area_expansion']
-            end_urban_change = self.results[end_year]['land']['urban_area_expansion']
-            # This is simplistic as it uses the *change* value, not the total area
-            metrics['total_simulated_urban_expansion'] = sum(self.results[y]['land']['urban_area_expansion'] for y in years)
-            
-            metrics['water_availability_trend_placeholder'] = -0.5 
-            metrics['land_degradation_rate_placeholder'] = 0.2 
-            metrics['forest_carbon_balance_placeholder'] = -5e6 
-            metrics['biodiversity_index_change_placeholder'] = -3.0 
-            metrics['energy_renewable_share_2035'] = self.results[end_year]['energy']['energy_mix_renewable_share_change_percent_points'] + 3 # Assuming start was 3%
-            metrics['marine_stock_sustainability_score_placeholder'] = 45 
-            metrics['climate_vulnerability_end_change'] = self.results[end_year]['climate']['overall_vulnerability_index_change'] # Example end value
-            metrics['governance_effectiveness_score_placeholder'] = 62 
-            metrics['community_empowerment_end_change'] = self.results[end_year]['community']['community_empowerment_index_change'] # Example end value
-            metrics['resource_efficiency_improvement_placeholder'] = 15 
-            metrics['conservation_coverage_effectiveness_placeholder'] = 58
-
+            self.metric_table = MetricTable.from_results(self.results)
+            for name, (model, indicator, metric) in HEADLINE_METRICS.items():
+                if (model, indicator) in self.metric_table:
+                    metrics[name] = self.metric_table.get(model, indicator, metric)
+                else:
+                    logger.debug("Headline metric %s skipped: no %s.%s in the results", name, model, indicator)
         except Exception as e:
-            print(f"Error calculating metrics: {e}. Using placeholder values.")
-            metrics = {k: v for k, v in metrics.items() if 'placeholder' in k} # Keep only placeholders if error
+            logger.error("Error calculating metrics: %s", e)
             metrics['error'] = str(e)
             
-        print(f"Generated metrics (examples): {metrics}")
+        logger.debug("Generated metrics: %s", metrics)
         self.metrics = metrics # Store for reporting
         return metrics
 
@@ -74,7 +124,7 @@ class NaturalResourceAnalysisEngine:
         Assess resource system evolution under different scenarios (if applicable) 
         and overall sustainability trends.
         """
-        print("Analyzing sustainability dynamics...")
+        logger.info("Analyzing sustainability dynamics...")
         # Placeholder logic:
         analysis_summary = {
             "scenario_name": self.config.get("scenario", "Unknown"),
@@ -83,61 +133,92 @@ class NaturalResourceAnalysisEngine:
             "key_tradeoffs": ["Land Use (Agri vs Urban) Placeholder", "Water (Irrigation vs Environment) Placeholder"],
             "critical_risks": ["Coastal Vulnerability Placeholder", "Groundwater Depletion Placeholder"],
         }
-        print(f"Sustainability analysis summary (example): {analysis_summary}")
+        logger.debug("Sustainability analysis summary (example): %s", analysis_summary)
         self.summary = analysis_summary # Store for reporting
         return analysis_summary
 
+    def _numeric_indicators(self):
+        """Yields (model, indicator) for every numeric indicator in the results."""
+        if hasattr(self.results, 'models'):
+            for model in self.results.models():
+                for indicator in self.results.indicators(model):
+                    if self.results.series(model, indicator).dtype == np.float64:
+                        yield model, indicator
+            return
+        first_year = self.results[min(self.results.keys())]
+        for model, outputs in first_year.items():
+            for indicator, value in outputs.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    yield model, indicator
+
     def generate_visualizations(self):
         """
-        Generate plots and potentially dashboards to visualize the results.
+        Generate plots to visualize the results: the headline trends plus one plot per numeric
+        indicator (config['plot_all_indicators']), rendered in a process pool of
+        config['plot_workers'] (all CPU cores if unset). Plots whose input series are
+        unchanged since the last run are not re-rendered. For ensemble results the headline
+        trends show the member median and the per-indicator plots are replaced by fan charts.
         """
-        print(f"Generating visualizations in {self.viz_dir}...")
+        logger.info("Generating visualizations in %s...", self.viz_dir)
         
         try:
-            years = sorted(self.results.keys())
-            # Example: Plot simulated urban area expansion per year
-            urban_expansion = [self.results[y]['land']['urban_area_expansion'] for y in years]
-            
-            plt.figure(figsize=(10, 5))
-            plt.plot(years, urban_expansion, marker='o', linestyle='-')
-            plt.title('Simulated Annual Urban Area Expansion')
-            plt.xlabel('Year')
-            plt.ylabel('Area Expansion (sq km/yr - Placeholder)')
-            plt.grid(True)
-            plot_filename = os.path.join(self.viz_dir, 'urban_expansion_trend.png')
-            plt.savefig(plot_filename)
-            plt.close() # Close the plot to free memory
-            print(f"Generated plot: {plot_filename}")
-
-            # Add more plots here for other key variables...
-            # Example: Water - Groundwater Level Change
-            gw_level_change = [self.results[y]['water']['groundwater_level_change'] for y in years]
-            plt.figure(figsize=(10, 5))
-            plt.plot(years, gw_level_change, marker='s', linestyle='--', color='blue')
-            plt.title('Simulated Annual Groundwater Level Change')
-            plt.xlabel('Year')
-            plt.ylabel('Change (m - Placeholder)')
-            plt.grid(True)
-            plot_filename_gw = os.path.join(self.viz_dir, 'groundwater_level_change.png')
-            plt.savefig(plot_filename_gw)
-            plt.close()
-            print(f"Generated plot: {plot_filename_gw}")
+            years = self._years()
+            specs = [
+                # Example: Plot simulated urban area expansion per year
+                PlotSpec('urban_expansion_trend.png', 'Simulated Annual Urban Area Expansion',
+                         'Area Expansion (sq km/yr)', years, self._series('land', 'urban_area_expansion')),
+                # Example: Water - Groundwater Level Change
+                PlotSpec('groundwater_level_change.png', 'Simulated Annual Groundwater Level Change',
+                         'Change (m - Placeholder)', years, self._series('water', 'groundwater_level_change'),
+                         marker='s', linestyle='--', color='blue'),
+            ]
+            self.indicator_plots = []
+            if self.config.get("plot_all_indicators", True) and not self._is_ensemble():
+                for model, indicator in self._numeric_indicators():
+                    filename = f"indicators/{model}/{indicator}.png"
+                    title = f"{model.replace('_', ' ').title()}: {indicator.replace('_', ' ')}"
+                    specs.append(PlotSpec(filename, title, indicator, years, self._series(model, indicator)))
+                    self.indicator_plots.append((model, indicator, filename))
+            specs.extend(self._fan_chart_specs())
+
+            # Same default as config.SIMULATION_CONFIG: None renders on all CPU cores
+            renderer = PlotRenderer(self.viz_dir, max_workers=self.config.get("plot_workers"))
+            rendered, skipped = renderer.render(specs)
+            logger.info("Rendered %s plots (%s unchanged, skipped)", len(rendered), len(skipped))
             
         except Exception as e:
-            print(f"Error generating visualizations: {e}")
+            logger.error("Error generating visualizations: %s", e)
+
+    def _fan_chart_specs(self):
+        """One fan chart per indicator from the streamed ensemble quantiles (no member data needed)."""
+        self.ensemble_plots = []
+        statistics = self.ensemble_statistics
+        if statistics is None or statistics.count == 0:
+            return []
+        specs = []
+        columns = statistics.columns if self.config.get("plot_all_indicators", True) else [
+            ('land', 'urban_area_expansion'), ('water', 'groundwater_level_change')]
+        for model, indicator in columns:
+            filename = f"ensemble/{model}/{indicator}.png"
+            title = f"{model.replace('_', ' ').title()}: {indicator.replace('_', ' ')} ({statistics.count} members)"
+            specs.append(FanChartSpec(filename, title, indicator, statistics.years,
+                                      statistics.mean(model, indicator), statistics.quantile_levels,
+                                      statistics.quantiles(model, indicator)))
+            self.ensemble_plots.append((model, indicator, filename))
+        return specs
 
     def generate_html_report(self):
         """
         Generates a simple HTML report summarizing the simulation results.
         """
-        print(f"Generating HTML report: {self.report_file}...")
+        logger.info("Generating HTML report: %s...", self.report_file)
         
         if not self.metrics:
-            print("Metrics not calculated yet. Running metric generation first.")
+            logger.debug("Metrics not calculated yet. Running metric generation first.")
             self.generate_resource_metrics()
             
         if not self.summary:
-            print("Sustainability analysis not performed yet. Running analysis first.")
+            logger.debug("Sustainability analysis not performed yet. Running analysis first.")
             self.analyze_sustainability_dynamics()
             
         # Basic HTML Structure
@@ -201,8 +282,12 @@ class NaturalResourceAnalysisEngine:
         <h3>Groundwater Level Change</h3>
         <img src="visualizations/groundwater_level_change.png" alt="Groundwater Level Change Plot">
     </div>
-    <!-- Add more img tags for other generated plots -->
-
+"""
+        html_content += self._metric_table_section()
+        html_content += self._indicator_plot_section()
+        html_content += self._ensemble_section()
+        html_content += self._profile_section()
+        html_content += """
 </body>
 </html>
 """
@@ -210,20 +295,141 @@ class NaturalResourceAnalysisEngine:
         try:
             with open(self.report_file, 'w', encoding='utf-8') as f:
                 f.write(html_content)
-            print(f"HTML report successfully generated: {self.report_file}")
+            logger.info("HTML report successfully generated: %s", self.report_file)
         except Exception as e:
-            print(f"Error writing HTML report: {e}")
+            logger.error("Error writing HTML report: %s", e)
             
+    def _metric_table_section(self):
+        """Renders every metric of every indicator (self.metric_table) as an HTML table."""
+        if self.metric_table is None or not self.metric_table.columns:
+            return ""
+        names = self.metric_table.metric_names()
+        headers = "".join(f"<th>{name.replace('_', ' ').title()}</th>" for name in names)
+        section = f"""
+    <h2>Indicator Metrics</h2>
+    <table>
+        <thead>
+            <tr><th>Model</th><th>Indicator</th>{headers}</tr>
+        </thead>
+        <tbody>
+"""
+        for model, indicator, values in self.metric_table.rows():
+            cells = "".join(f"<td>{values[name]:.4g}</td>" for name in names)
+            section += f"            <tr><td>{model}</td><td>{indicator}</td>{cells}</tr>\n"
+        section += """        </tbody>
+    </table>
+"""
+        return section
+
+    def _indicator_plot_section(self):
+        """Renders the per-indicator plots, grouped by model."""
+        if not self.indicator_plots:
+            return ""
+        section = """
+    <h2>Indicator Plots</h2>
+"""
+        current_model = None
+        for model, indicator, filename in self.indicator_plots:
+            if model != current_model:
+                section += f"    <h3>{model.replace('_', ' ').title()}</h3>\n"
+                current_model = model
+            section += (f'    <img src="visualizations/{filename}" alt="{indicator}" title="{indicator}" '
+                        f'loading="lazy" style="max-width: 49%;">\n')
+        return section
+
+    def _ensemble_section(self):
+        """Renders exceedance probabilities, final-year ensemble spread and fan charts."""
+        statistics = self.ensemble_statistics
+        if statistics is None or statistics.count == 0:
+            return ""
+        final_year = int(statistics.years[-1])
+        section = f"""
+    <h2>Ensemble Statistics ({statistics.count} members)</h2>
+"""
+        probabilities = statistics.exceedance_probabilities()
+        if probabilities:
+            section += f"""    <h3>Exceedance Probabilities</h3>
+    <table>
+        <thead>
+            <tr><th>Event</th><th>Probability by {final_year}</th><th>First Year Above 50%</th></tr>
+        </thead>
+        <tbody>
+"""
+            for event, probability in probabilities:
+                side, threshold = ("<", event["below"]) if "below" in event else (">", event["above"])
+                metric = "cumulative " if event.get("metric", "value") == "cumulative" else ""
+                likely = np.flatnonzero(probability > 0.5)
+                first_year = int(statistics.years[likely[0]]) if likely.size else "-"
+                section += (f"            <tr><td>{metric}{event['model']}.{event['indicator']} {side} {threshold:g}</td>"
+                            f"<td>{probability[-1]:.1%}</td><td>{first_year}</td></tr>\n")
+            section += """        </tbody>
+    </table>
+"""
+        levels = statistics.quantile_levels
+        quantile_headers = "".join(f"<th>P{q * 100:g}</th>" for q in levels)
+        section += f"""    <h3>Spread in {final_year}</h3>
+    <table>
+        <thead>
+            <tr><th>Model</th><th>Indicator</th><th>Mean</th><th>Std</th>{quantile_headers}</tr>
+        </thead>
+        <tbody>
+"""
+        for model, indicator in statistics.columns:
+            quantiles = statistics.quantiles(model, indicator)[:, -1]
+            cells = "".join(f"<td>{value:.4g}</td>" for value in quantiles)
+            section += (f"            <tr><td>{model}</td><td>{indicator}</td><td>{statistics.mean(model, indicator)[-1]:.4g}</td>"
+                        f"<td>{statistics.std(model, indicator)[-1]:.4g}</td>{cells}</tr>\n")
+        section += """        </tbody>
+    </table>
+"""
+        for model, indicator, filename in self.ensemble_plots:
+            section += (f'    <img src="visualizations/{filename}" alt="{indicator}" title="{indicator}" '
+                        f'loading="lazy" style="max-width: 49%;">\n')
+        return section
+
+    def _profile_section(self):
+        """
+        Renders the profiler summary as an HTML table, slowest stages first.
+        The report stage itself is still running at this point and is not included.
+        """
+        rows = self.profiler.summary()
+        if not rows:
+            return ""
+        traced = "alloc_net_bytes" in rows[0]
+        alloc_headers = "<th>Net Alloc (KiB)</th><th>Peak Alloc (KiB)</th>" if traced else ""
+        section = f"""
+    <h2>Performance Profile</h2>
+    <table>
+        <thead>
+            <tr><th>Stage</th><th>Name</th><th>Calls</th><th>Total (ms)</th><th>Mean (ms)</th><th>Max (ms)</th><th>Share (%)</th>{alloc_headers}</tr>
+        </thead>
+        <tbody>
+"""
+        for row in rows:
+            alloc_cells = (f"<td>{row['alloc_net_bytes'] / 1024:.1f}</td><td>{row['alloc_peak_bytes'] / 1024:.1f}</td>"
+                           if traced else "")
+            section += (f"            <tr><td>{row['category']}</td><td>{row['name']}</td><td>{row['calls']}</td>"
+                        f"<td>{row['total_ms']:.3f}</td><td>{row['mean_ms']:.4f}</td><td>{row['max_ms']:.3f}</td>"
+                        f"<td>{row['share_percent']:.1f}</td>{alloc_cells}</tr>\n")
+        section += """        </tbody>
+    </table>
+"""
+        return section
+
     def run_analysis(self):
         """
         Run the full analysis pipeline.
         """
-        print("\n--- Running Analysis Engine ---")
-        self.generate_resource_metrics() # Calculate metrics
-        self.analyze_sustainability_dynamics() # Perform summary analysis
-        self.generate_visualizations() # Generate plots
-        self.generate_html_report() # Generate HTML report using calculated metrics/summary
-        print("--- Analysis Engine Finished ---\n")
+        logger.info("--- Running Analysis Engine ---")
+        with self.profiler.measure('analysis', 'generate_resource_metrics'):
+            self.generate_resource_metrics() # Calculate metrics
+        with self.profiler.measure('analysis', 'analyze_sustainability_dynamics'):
+            self.analyze_sustainability_dynamics() # Perform summary analysis
+        with self.profiler.measure('analysis', 'generate_visualizations'):
+            self.generate_visualizations() # Generate plots
+        with self.profiler.measure('analysis', 'generate_html_report'):
+            self.generate_html_report() # Generate HTML report using calculated metrics/summary
+        logger.info("--- Analysis Engine Finished ---")
         # Return the calculated metrics and summary for potential further use
         return {"metrics": self.metrics, "summary": self.summary}
 
@@ -244,6 +450,7 @@ if __name__ == '__main__':
         "output_dir": "./outputs_test/"
     }
     
+    logging.basicConfig(level=logging.INFO)
     analyzer = NaturalResourceAnalysisEngine(dummy_results, dummy_config)
     analysis_output = analyzer.run_analysis()
     print(f"\nFinal Analysis Output Dictionary:\n{analysis_output}") 
\ No newline at end of file
@@ -0,0 +1,175 @@
+import numpy as np
+
+# Markers of the P-square algorithm (Jain & Chlamtac, 1985): min, two intermediate markers
+# around the target quantile, the quantile itself and max
+_P2_MARKERS = 5
+
+
+class P2Quantiles:
+    """
+    Streaming P-square estimates of several quantiles for every cell of a fixed-shape array,
+    in O(n_quantiles * cells) memory regardless of the number of observations.
+    """
+    def __init__(self, quantiles, shape):
+        """
+        Args:
+            quantiles (tuple): Probabilities in (0, 1), e.g. (0.05, 0.5, 0.95).
+            shape (tuple): Shape of each observation, e.g. (n_columns, n_years).
+        """
+        self.quantiles = np.asarray(quantiles, dtype=float)
+        self.shape = tuple(shape)
+        p = self.quantiles[:, None]
+        self._increments = np.hstack((np.zeros_like(p), p / 2, p, (1 + p) / 2, np.ones_like(p))) # (Q, 5)
+        self._initial_desired = 1 + 4 * self._increments
+        self.count = 0
+        self._first = np.empty((_P2_MARKERS,) + self.shape) # Observations until the markers start
+        self._heights = None # (Q, *shape, 5)
+        self._positions = None # (Q, *shape, 5), 1-based marker positions
+
+    def _expand(self, array):
+        # Per-quantile (Q, 5) constants broadcast against (Q, *shape, 5)
+        return array.reshape((len(self.quantiles),) + (1,) * len(self.shape) + (_P2_MARKERS,))
+
+    def add(self, x):
+        """Adds one observation of shape self.shape (e.g. one ensemble member)."""
+        x = np.asarray(x, dtype=float)
+        if self.count < _P2_MARKERS:
+            self._first[self.count] = x
+            self.count += 1
+            if self.count == _P2_MARKERS:
+                ordered = np.moveaxis(np.sort(self._first, axis=0), 0, -1)
+                self._heights = np.repeat(ordered[None], len(self.quantiles), axis=0)
+                self._positions = np.broadcast_to(np.arange(1.0, _P2_MARKERS + 1), self._heights.shape).copy()
+            return
+        self.count += 1
+        q, n = self._heights, self._positions
+        x = np.broadcast_to(x, q.shape[:-1])
+
+        # Extend the extremes and shift the positions of every marker above the observation
+        np.minimum(q[..., 0], x, out=q[..., 0])
+        np.maximum(q[..., 4], x, out=q[..., 4])
+        n[..., 1:] += x[..., None] < q[..., 1:]
+        n[..., 4] += x >= q[..., 4] # Equal to the new maximum: counted in the last cell
+        desired = self._expand(self._initial_desired + (self.count - 1 - 4) * self._increments)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for i in (1, 2, 3):
+                d = desired[..., i] - n[..., i]
+                move = (((d >= 1) & (n[..., i + 1] - n[..., i] > 1))
+                        | ((d <= -1) & (n[..., i - 1] - n[..., i] < -1)))
+                if not move.any():
+                    continue
+                s = np.sign(d)
+                parabolic = q[..., i] + s / (n[..., i + 1] - n[..., i - 1]) * (
+                    (n[..., i] - n[..., i - 1] + s) * (q[..., i + 1] - q[..., i]) / (n[..., i + 1] - n[..., i])
+                    + (n[..., i + 1] - n[..., i] - s) * (q[..., i] - q[..., i - 1]) / (n[..., i] - n[..., i - 1]))
+                neighbor_q = np.where(s > 0, q[..., i + 1], q[..., i - 1])
+                neighbor_n = np.where(s > 0, n[..., i + 1], n[..., i - 1])
+                linear = q[..., i] + s * (neighbor_q - q[..., i]) / (neighbor_n - n[..., i])
+                inside = (q[..., i - 1] < parabolic) & (parabolic < q[..., i + 1])
+                q[..., i] = np.where(move, np.where(inside, parabolic, linear), q[..., i])
+                n[..., i] = np.where(move, n[..., i] + s, n[..., i])
+
+    def estimates(self):
+        """
+        Returns:
+            np.ndarray: Quantile estimates of shape (n_quantiles, *shape); exact sample quantiles
+                        while fewer than five observations have been added.
+        """
+        if self.count == 0:
+            return np.full((len(self.quantiles),) + self.shape, np.nan)
+        if self.count < _P2_MARKERS:
+            return np.quantile(self._first[:self.count], self.quantiles, axis=0)
+        return self._heights[..., 2].copy()
+
+
+class EnsembleStatistics:
+    """
+    Per-indicator, per-year ensemble statistics updated one member at a time in bounded memory:
+    Welford mean/variance, P-square quantiles (fan charts) and exceedance probabilities.
+    """
+    def __init__(self, columns, years, quantiles=(0.05, 0.25, 0.5, 0.75, 0.95), exceedance=()):
+        """
+        Args:
+            columns (list): (model, indicator) pairs, the layout of every member's values.
+            years: Simulated years.
+            quantiles (tuple): Probabilities tracked with P-square estimators.
+            exceedance (iterable): Threshold events, each a dict with 'model', 'indicator',
+                                   'metric' ('value' for the yearly value or 'cumulative' for
+                                   the running total) and 'below' or 'above' (the threshold),
+                                   e.g. {"model": "water", "indicator": "groundwater_level_change",
+                                         "metric": "cumulative", "below": -2.0}.
+        """
+        self.columns = [tuple(column) for column in columns]
+        self.years = np.asarray(years)
+        self._index = {column: c for c, column in enumerate(self.columns)}
+        shape = (len(self.columns), len(self.years))
+        self.count = 0
+        self._mean = np.zeros(shape)
+        self._m2 = np.zeros(shape)
+        self._quantiles = P2Quantiles(quantiles, shape)
+        self.exceedance = [dict(event) for event in exceedance]
+        for event in self.exceedance:
+            if (event["model"], event["indicator"]) not in self._index:
+                raise ValueError(f"Exceedance event on unknown indicator {event['model']}.{event['indicator']}")
+            if event.get("metric", "value") not in ("value", "cumulative") or ("below" in event) == ("above" in event):
+                raise ValueError(f"Exceedance event {event} needs metric 'value' or 'cumulative' and one of 'below'/'above'")
+        self._exceedance_counts = np.zeros((len(self.exceedance), len(self.years)))
+
+    @property
+    def quantile_levels(self):
+        return tuple(self._quantiles.quantiles)
+
+    def add_member(self, values, columns=None):
+        """
+        Adds one finished member.
+
+        Args:
+            values: SimulationResults of the member, or a float array of shape
+                    (n_columns, n_years) laid out like 'columns'.
+            columns (list, optional): Column layout of 'values' if it differs from self.columns.
+        """
+        if hasattr(values, 'column_array'):
+            columns, values = values.column_array()
+        values = np.asarray(values, dtype=float)
+        if columns is not None and [tuple(column) for column in columns] != self.columns:
+            index = {tuple(column): c for c, column in enumerate(columns)}
+            values = values[[index[column] for column in self.columns]]
+
+        self.count += 1
+        delta = values - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (values - self._mean)
+        self._quantiles.add(values)
+        for e, event in enumerate(self.exceedance):
+            series = values[self._index[(event["model"], event["indicator"])]]
+            if event.get("metric", "value") == "cumulative":
+                series = np.cumsum(series)
+            self._exceedance_counts[e] += series < event["below"] if "below" in event else series > event["above"]
+
+    def mean(self, model, indicator):
+        """Ensemble mean per year."""
+        return self._mean[self._index[(model, indicator)]].copy()
+
+    def std(self, model, indicator):
+        """Ensemble (sample) standard deviation per year."""
+        if self.count < 2:
+            return np.full(len(self.years), np.nan)
+        return np.sqrt(self._m2[self._index[(model, indicator)]] / (self.count - 1))
+
+    def quantiles(self, model, indicator):
+        """
+        Returns:
+            np.ndarray: Approximate quantiles of shape (n_quantiles, n_years), see quantile_levels.
+        """
+        return self._quantiles.estimates()[:, self._index[(model, indicator)]]
+
+    def exceedance_probabilities(self):
+        """
+        Returns:
+            list: (event, probability per year) pairs; for 'cumulative' events the probability
+                  that the running total has crossed the threshold by each year.
+        """
+        if self.count == 0:
+            return [(event, np.full(len(self.years), np.nan)) for event in self.exceedance]
+        return [(event, counts / self.count) for event, counts in zip(self.exceedance, self._exceedance_counts)]
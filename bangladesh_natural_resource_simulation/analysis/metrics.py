@@ -0,0 +1,129 @@
+import numpy as np
+
+# --- Metric definitions: reductions over the year axis of a (..., n_years) array ---
+# NaN marks unrecorded years (e.g. ensemble members that have not finished), so every
+# reduction ignores NaNs.
+
+
+def cumulative(values, years):
+    """Sum over the simulated years (total change for '..._change' indicators)."""
+    return np.nansum(values, axis=-1)
+
+
+def mean(values, years):
+    return np.nanmean(values, axis=-1)
+
+
+def trend_slope(values, years):
+    """Least-squares linear trend, in indicator units per year."""
+    mask = np.isfinite(values)
+    count = np.maximum(mask.sum(axis=-1, keepdims=True), 1)
+    t = np.where(mask, years, 0.0)
+    y = np.where(mask, values, 0.0)
+    t_centered = np.where(mask, t - t.sum(axis=-1, keepdims=True) / count, 0.0)
+    y_centered = np.where(mask, y - y.sum(axis=-1, keepdims=True) / count, 0.0)
+    denominator = (t_centered ** 2).sum(axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(denominator > 0, (t_centered * y_centered).sum(axis=-1) / denominator, np.nan)
+
+
+def end_state(values, years):
+    """Value in the last recorded year."""
+    mask = np.isfinite(values)
+    last = values.shape[-1] - 1 - np.argmax(mask[..., ::-1], axis=-1)
+    end = np.take_along_axis(values, last[..., None], axis=-1)[..., 0]
+    return np.where(mask.any(axis=-1), end, np.nan)
+
+
+# Metric name -> reduction; every metric is computed for every numeric indicator
+METRICS = {
+    "cumulative": cumulative,
+    "mean": mean,
+    "trend_slope": trend_slope,
+    "end_state": end_state,
+}
+
+# Percentiles of each metric across ensemble members
+ENSEMBLE_PERCENTILES = (5, 50, 95)
+
+
+class MetricTable:
+    """Every metric for every (model, indicator) column, from one vectorized pass over the results"""
+    def __init__(self, columns, values, n_members=1):
+        """
+        Args:
+            columns (list): (model, indicator) pairs.
+            values (dict): Metric name -> float64 array of shape (n_columns,).
+            n_members (int): Number of ensemble members the metrics summarize.
+        """
+        self.columns = list(columns)
+        self.values = values
+        self.n_members = n_members
+        self._index = {column: c for c, column in enumerate(self.columns)}
+
+    @classmethod
+    def compute(cls, columns, values, years, metrics=METRICS, percentiles=ENSEMBLE_PERCENTILES):
+        """
+        Applies every metric to a columnar results array.
+
+        Args:
+            columns (list): (model, indicator) pairs, one per column.
+            values (np.ndarray): Shape (n_columns, n_years) for one run, or
+                                 (n_members, n_columns, n_years) for an ensemble.
+            years (np.ndarray): Simulated years, shape (n_years,).
+            metrics (dict): Metric name -> reduction over the last axis.
+            percentiles (tuple): For ensembles, percentiles across members reported per metric
+                                 as '<metric>_p<q>'; the plain metric name holds the median.
+
+        Returns:
+            MetricTable
+        """
+        values = np.asarray(values, dtype=float)
+        years = np.asarray(years, dtype=float)
+        table = {}
+        if values.ndim == 2:
+            for name, reduce in metrics.items():
+                table[name] = reduce(values, years)
+            return cls(columns, table)
+        for name, reduce in metrics.items():
+            per_member = reduce(values, years)
+            bands = np.nanpercentile(per_member, percentiles, axis=0)
+            for q, band in zip(percentiles, bands):
+                table[f"{name}_p{q}"] = band
+            table[name] = np.nanmedian(per_member, axis=0)
+        return cls(columns, table, n_members=values.shape[0])
+
+    @classmethod
+    def from_results(cls, results, **kwargs):
+        """
+        Builds the table from a SimulationResults, an EnsembleResults or a nested
+        {year: {model: {indicator: value}}} dictionary.
+        """
+        if hasattr(results, 'column_array'):
+            columns, values = results.column_array()
+            return cls.compute(columns, values, results.recorded_years, **kwargs)
+        if hasattr(results, 'n_members'):
+            # EnsembleResults values are (n_members, n_columns, n_years), NaN where unrecorded
+            return cls.compute(results.columns, results.values, results.years, **kwargs)
+        years = sorted(results)
+        columns = [(model, indicator) for model, outputs in results[years[0]].items()
+                   for indicator, value in outputs.items()
+                   if isinstance(value, (int, float)) and not isinstance(value, bool)]
+        values = np.array([[results[year][model].get(indicator, np.nan) for year in years]
+                           for model, indicator in columns], dtype=float).reshape(len(columns), len(years))
+        return cls.compute(columns, values, np.array(years), **kwargs)
+
+    def metric_names(self):
+        return list(self.values)
+
+    def get(self, model, indicator, metric):
+        """Returns one metric of one indicator as a float (the median for ensembles)."""
+        return float(self.values[metric][self._index[(model, indicator)]])
+
+    def __contains__(self, column):
+        return tuple(column) in self._index
+
+    def rows(self):
+        """Yields (model, indicator, {metric: value}) per column, e.g. for report tables."""
+        for c, (model, indicator) in enumerate(self.columns):
+            yield model, indicator, {name: float(values[c]) for name, values in self.values.items()}
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Bump when the rendering code changes, so existing images are re-rendered
+PLOT_STYLE_VERSION = 1
+MANIFEST_FILE = ".plot_inputs.json"
+
+
+class PlotSpec:
+    """Everything needed to render one line plot; picklable so it can be sent to worker processes"""
+    def __init__(self, filename, title, ylabel, years, values, marker='o', linestyle='-', color=None):
+        """
+        Args:
+            filename (str): Output path relative to the plot directory (e.g. 'indicators/water/x.png').
+            title (str): Figure title.
+            ylabel (str): Y axis label.
+            years: X values.
+            values: Y values, same length as years.
+        """
+        self.filename = filename
+        self.title = title
+        self.ylabel = ylabel
+        self.years = np.asarray(years, dtype=float)
+        self.values = np.asarray(values, dtype=float)
+        self.marker = marker
+        self.linestyle = linestyle
+        self.color = color
+
+    def _hash_arrays(self):
+        return (self.years, self.values)
+
+    def input_hash(self):
+        """Hash of the plotted series and all styling; the image only changes when this does."""
+        digest = hashlib.sha256()
+        digest.update(json.dumps([PLOT_STYLE_VERSION, type(self).__name__, self.title, self.ylabel,
+                                  self.marker, self.linestyle, self.color]).encode())
+        for array in self._hash_arrays():
+            digest.update(np.ascontiguousarray(array).tobytes())
+        return digest.hexdigest()
+
+    def draw(self, axes):
+        axes.plot(self.years, self.values, marker=self.marker, linestyle=self.linestyle, color=self.color)
+
+
+class FanChartSpec(PlotSpec):
+    """Ensemble fan chart: nested quantile bands around the median, plus the mean as a line"""
+    def __init__(self, filename, title, ylabel, years, mean, quantile_levels, quantiles, color='tab:blue'):
+        """
+        Args:
+            mean: Ensemble mean per year (drawn as the line).
+            quantile_levels (tuple): Probabilities of the rows of 'quantiles', ascending and
+                                     symmetric around 0.5 (e.g. 0.05, 0.25, 0.5, 0.75, 0.95).
+            quantiles: Array of shape (n_quantiles, n_years).
+        """
+        super().__init__(filename, title, ylabel, years, mean, marker=None, color=color)
+        self.quantile_levels = tuple(float(q) for q in quantile_levels)
+        self.quantiles = np.asarray(quantiles, dtype=float)
+
+    def _hash_arrays(self):
+        return (self.years, self.values, np.asarray(self.quantile_levels), self.quantiles)
+
+    def draw(self, axes):
+        n = len(self.quantile_levels)
+        for lower in range(n // 2):
+            upper = n - 1 - lower
+            axes.fill_between(self.years, self.quantiles[lower], self.quantiles[upper], color=self.color,
+                              alpha=0.15 + 0.15 * lower, linewidth=0,
+                              label=f"{self.quantile_levels[lower]:.0%}-{self.quantile_levels[upper]:.0%}")
+        if n % 2:
+            axes.plot(self.years, self.quantiles[n // 2], color=self.color, linestyle='--', label="Median")
+        axes.plot(self.years, self.values, color=self.color, label="Mean")
+        axes.legend(loc='best')
+
+
+def render_plot(spec, directory):
+    """
+    Renders one PlotSpec to a PNG in 'directory', written atomically.
+
+    Returns:
+        str: The path of the written image.
+    """
+    # Imported here, not at module import: matplotlib is slow to import and runs that never plot
+    # (ensemble workers, benchmarks) should not pay for it. The object-oriented API on the Agg
+    # canvas has no pyplot state machine and no GUI backend, so figures can be rendered from
+    # worker threads and processes.
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    path = os.path.join(directory, spec.filename)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    figure = Figure(figsize=(10, 5))
+    FigureCanvasAgg(figure)
+    axes = figure.add_subplot()
+    spec.draw(axes)
+    axes.set_title(spec.title)
+    axes.set_xlabel('Year')
+    axes.set_ylabel(spec.ylabel)
+    axes.grid(True)
+    tmp_path = path + '.tmp'
+    figure.savefig(tmp_path, format='png')
+    os.replace(tmp_path, path)
+    return path
+
+
+def _render_task(task):
+    spec, directory = task
+    return render_plot(spec, directory)
+
+
+class PlotRenderer:
+    """Renders batches of plots into a directory, in parallel, skipping images whose inputs are unchanged"""
+    def __init__(self, directory, max_workers=1):
+        """
+        Args:
+            directory (str): Plot directory; it also holds the manifest of input hashes.
+            max_workers (int, optional): Processes used for rendering. 1 renders in-process;
+                                         None uses os.cpu_count().
+        """
+        self.directory = directory
+        self.max_workers = max_workers
+        self.manifest_path = os.path.join(directory, MANIFEST_FILE)
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def render(self, specs):
+        """
+        Renders every spec whose image is missing or whose input hash differs from the manifest.
+
+        Returns:
+            tuple: (rendered filenames, skipped filenames).
+        """
+        manifest = self._load_manifest()
+        hashes = {spec.filename: spec.input_hash() for spec in specs}
+        stale = [spec for spec in specs if manifest.get(spec.filename) != hashes[spec.filename]
+                 or not os.path.exists(os.path.join(self.directory, spec.filename))]
+        stale_names = {spec.filename for spec in stale}
+        skipped = [spec.filename for spec in specs if spec.filename not in stale_names]
+
+        tasks = [(spec, self.directory) for spec in stale]
+        workers = min(self.max_workers or os.cpu_count() or 1, len(tasks))
+        if workers <= 1:
+            for task in tasks:
+                _render_task(task)
+        else:
+            chunksize = max(1, len(tasks) // (4 * workers))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for _ in executor.map(_render_task, tasks, chunksize=chunksize):
+                    pass
+
+        manifest.update({spec.filename: hashes[spec.filename] for spec in stale})
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=0, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+        logger.debug("Rendered %s plots, %s unchanged", len(stale), len(skipped))
+        return [spec.filename for spec in stale], skipped
@@ -0,0 +1,175 @@
+# cache.py
+
+import copy
+import glob
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .checkpoint import Checkpoint
+from .data.handler import path_signature
+
+logger = logging.getLogger(__name__)
+
+# Settings that change how a run is logged, timed, parallelized, plotted or written out, but not
+# its results (the kernel backends agree to rounding, see kernels.check_parity)
+NON_RESULT_KEYS = frozenset({
+    "simulation_name", "scenario", "end_year", "model_workers", "log_level", "log_format", "quiet",
+    "profiling", "trace_allocations", "output_dir", "results_format", "results_chunk_years",
+    "checkpoint_every_years", "checkpoint_dir", "result_cache", "result_cache_dir", "incremental_models",
+    "plot_workers", "plot_all_indicators", "kernel_backend",
+})
+
+_CODE_VERSION = None
+
+
+def code_version():
+    """
+    Returns a hash of the package's Python sources, so cached results are never reused
+    after the model code changes. Computed once per process.
+    """
+    global _CODE_VERSION
+    if _CODE_VERSION is None:
+        package_dir = os.path.dirname(os.path.abspath(__file__))
+        digest = hashlib.sha256()
+        for path in sorted(glob.glob(os.path.join(package_dir, '**', '*.py'), recursive=True)):
+            digest.update(os.path.relpath(path, package_dir).encode())
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        _CODE_VERSION = digest.hexdigest()
+    return _CODE_VERSION
+
+
+def config_fingerprint(config, start_year):
+    """
+    Content hash of everything that determines a run's results up to any end year:
+    the configuration without NON_RESULT_KEYS (including model_params), the start year,
+    the path, modification time and size of every file under the configured data paths and
+    of every historical source, and the code version.
+
+    Returns:
+        str: Hex digest usable as a cache key.
+    """
+    normalized = {key: value for key, value in config.items() if key not in NON_RESULT_KEYS}
+    data_files = {name: path_signature(path) for name, path in sorted(config.get("data_paths", {}).items())}
+    source_files = {f"{resource_type}/{series}": path_signature(path)
+                    for resource_type, sources in config.get("historical_sources", {}).items()
+                    for series, path in sources.items()}
+    payload = json.dumps({"config": normalized, "start_year": start_year, "data_files": data_files,
+                          "source_files": source_files, "code_version": code_version()}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def content_digest(value):
+    """Short content hash of a picklable value (model outputs, parameters, internal state)."""
+    return hashlib.blake2b(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), digest_size=16).hexdigest()
+
+
+def _detach(value):
+    # Copy of model outputs that shares immutable scalars and strings and copies containers and
+    # arrays; much cheaper than copy.deepcopy for the small output dictionaries of a model step
+    if isinstance(value, dict):
+        return {key: _detach(item) for key, item in value.items()}
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    if isinstance(value, list):
+        return [_detach(item) for item in value]
+    return value
+
+
+class ModelOutputCache:
+    """
+    In-memory LRU cache of single model steps: one model's outputs for one year and its internal
+    state afterwards, keyed by a digest of everything the step depends on (see
+    BangladeshNaturalResourceSimulation._incremental_step). Shared by every simulation in the
+    process, so a rerun with changed downstream parameters reuses the upstream models' steps.
+    """
+    def __init__(self, max_entries=50000):
+        """
+        Args:
+            max_entries (int): Least recently used steps are evicted beyond this many.
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock() # Models may run in scheduler threads
+
+    def get(self, key):
+        """Returns (outputs, model state, outputs digest) for a step key, or None. The values are copies."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        outputs, model_state, digest = entry
+        return _detach(outputs), copy.deepcopy(model_state) if model_state else {}, digest
+
+    def put(self, key, outputs, model_state, digest):
+        entry = (_detach(outputs), copy.deepcopy(model_state) if model_state else {}, digest)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Process-wide model step cache used by simulations with config['incremental_models']
+MODEL_OUTPUT_CACHE = ModelOutputCache()
+
+
+class ScenarioResultCache:
+    """Content-addressed on-disk cache of simulation results, reusable at per-year prefix granularity"""
+    def __init__(self, cache_dir):
+        """
+        Each entry is a Checkpoint (see checkpoint.py) named by config_fingerprint(): the results
+        of the years simulated so far plus the model state after the last one. A request ending
+        at or before the cached year is served from the results alone; a longer one resumes
+        from the stored state, so only the missing years are simulated.
+
+        Args:
+            cache_dir (str): Directory holding the entries; created if missing.
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.ckpt")
+
+    def get(self, key):
+        """Returns the cached Checkpoint for a key, or None (also for unreadable entries)."""
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            return Checkpoint.load(path)
+        except Exception as e:
+            logger.warning("Ignoring unreadable result cache entry %s: %s", path, e)
+            return None
+
+    def put(self, key, checkpoint):
+        """Stores a checkpoint unless the existing entry already covers more years."""
+        existing = self.get(key)
+        if existing is not None and existing.year >= checkpoint.year:
+            return
+        checkpoint.save(self.path(key))
+
+    def clear(self):
+        """Removes all entries."""
+        for path in glob.glob(os.path.join(self.cache_dir, '*.ckpt')):
+            os.remove(path)
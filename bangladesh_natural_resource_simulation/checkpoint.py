@@ -0,0 +1,83 @@
+# checkpoint.py
+
+import os
+import pickle
+
+import numpy as np
+
+CHECKPOINT_FORMAT_VERSION = 1
+
+
+def checkpoint_path(directory, scenario, year):
+    """Returns the file name used for a scenario's checkpoint after 'year'."""
+    return os.path.join(directory, f"{scenario}_{year}.ckpt")
+
+
+class Checkpoint:
+    """Snapshot of a simulation after a completed year, from which a run can be resumed or forked"""
+    def __init__(self, year, current_state, model_states, results, scenario=None, spatial=None):
+        """
+        Args:
+            year (int): Last completed simulation year.
+            current_state (dict): The simulation state after 'year' ({model: {indicator: value}}).
+            model_states (dict): Model key -> internal state (see ResourceModel.get_checkpoint_state).
+            results (dict): Results recorded up to 'year', as produced by snapshot_results().
+            scenario (str, optional): Name of the scenario that produced the checkpoint.
+            spatial (dict, optional): Spatial fields of the run (see SpatialState.snapshot).
+        """
+        self.year = year
+        self.current_state = current_state
+        self.model_states = model_states
+        self.results = results
+        self.scenario = scenario
+        self.spatial = spatial
+
+    @staticmethod
+    def snapshot_results(results):
+        """
+        Copies the recorded years of a results store into a columnar dictionary:
+            {"years": array, "models": {model: {indicator: float64 array or list of labels}}}
+        """
+        models = {}
+        for model in results.models():
+            models[model] = {}
+            for indicator in results.indicators(model):
+                series = results.series(model, indicator)
+                models[model][indicator] = series.copy() if series.dtype == np.float64 else list(series)
+        return {"years": np.array(results.recorded_years), "models": models}
+
+    def restore_results(self, results):
+        """Records the checkpointed years that fall inside the target store's period into it."""
+        for offset, year in enumerate(self.results["years"]):
+            if not results.start_year <= year <= results.end_year:
+                continue
+            for model, indicators in self.results["models"].items():
+                results.record(int(year), model, {indicator: values[offset]
+                                                  for indicator, values in indicators.items()})
+
+    def save(self, path):
+        """Writes the checkpoint atomically as a single binary (pickle) file."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({"version": CHECKPOINT_FORMAT_VERSION, "year": self.year, "scenario": self.scenario,
+                         "current_state": self.current_state, "model_states": self.model_states,
+                         "results": self.results, "spatial": self.spatial}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a checkpoint written by save(). Checkpoints are pickles and must only be loaded
+        from trusted locations.
+
+        Raises:
+            ValueError: If the file was written by an incompatible checkpoint format version.
+        """
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+        if data.get("version") != CHECKPOINT_FORMAT_VERSION:
+            raise ValueError(f"Checkpoint {path} has format version {data.get('version')}, "
+                             f"expected {CHECKPOINT_FORMAT_VERSION}")
+        return cls(data["year"], data["current_state"], data["model_states"], data["results"],
+                   scenario=data["scenario"], spatial=data.get("spatial"))
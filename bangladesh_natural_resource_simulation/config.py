@@ -1,5 +1,7 @@
 # config.py
 
+from .frozen_config import FrozenConfig
+
 # Basic configuration settings for the simulation
 
 SIMULATION_CONFIG = {
@@ -7,7 +9,27 @@ SIMULATION_CONFIG = {
     "start_year": 2025,
     "end_year": 2035,
     "time_step": 1, # Years
+    "water_time_step": "annual", # Water model resolution within each year: "annual", "monthly" or "daily" (vectorized seasonal kernel)
+    # Spatial land/water/climate state: None (national scalars only),
+    # {"kind": "raster", "rows": 390, "cols": 390, "cell_km": 1.0} (synthetic ~1 km raster, ~150k cells) or
+    # {"kind": "units", "path": "./data/input/spatial/upazilas.npz"} (district/upazila polygons with adjacency)
+    "spatial_grid": None,
     "scenario": "Baseline",
+    "model_workers": 1, # Threads for running independent models concurrently (1 = sequential)
+    "plot_workers": None, # Processes rendering report plots (1 = in-process, None = all CPU cores)
+    "plot_all_indicators": True, # One plot per numeric indicator in the report, besides the headline trends
+    "kernel_backend": "auto", # Inner loop kernels: 'auto' (numba when installed), 'numpy' or 'numba'
+    "log_level": "INFO", # DEBUG adds per-model and data loading detail
+    "quiet": False, # True: warnings/errors only, progress messages are never formatted
+    "profiling": True, # Time every model step, data load and analysis stage (perf_counter_ns)
+    "trace_allocations": False, # Also record per-stage memory with tracemalloc (slow, opt-in)
+    "results_format": "ndjson", # Streamed raw results: 'ndjson' (one line per year), 'npz' (columnar chunks) or 'none'
+    "results_chunk_years": 10, # Years per chunk for the 'npz' format
+    "checkpoint_every_years": 0, # Checkpoint the run every N years (0 = off); resume with run_simulation(resume_from=...)
+    "checkpoint_dir": None, # Defaults to <output_dir>/checkpoints
+    "result_cache": True, # Reuse results of identical runs (keyed by config, start year and code version)
+    "result_cache_dir": "./cache/results/",
+    "incremental_models": False, # Interactive reruns: recompute only the models whose inputs changed since an earlier run in this process (not with spatial_grid; no gain for ensembles or sweeps)
     
     # Placeholder for data paths (if loading real data)
     "data_paths": {
@@ -15,7 +37,19 @@ SIMULATION_CONFIG = {
         "land_data": "./data/input/land/",
         "forest_data": "./data/input/forest/",
         # ... etc
+        "store": "./data/store/", # Binary (.npy + manifest) copies of ingested historical series
+    },
+
+    # Historical CSV sources ingested by NaturalResourceDataHandler (resource type -> series -> file).
+    # First column is 'year' or an ISO date, remaining columns are values (e.g. one per district).
+    "historical_sources": {
+        "water": {
+            "river_flow_ganges_1990_2020": "./data/input/water/river_flow_ganges_1990_2020.csv",
+            "groundwater_levels_all_districts": "./data/input/water/groundwater_levels_all_districts.csv",
+        },
+        # ... other resource types
     },
+    "data_extrapolation": "linear", # Beyond the historical record: "linear" trend or "hold" last value
     
     # Placeholder for specific model parameters (can be nested)
     "model_params": {
@@ -36,16 +70,76 @@ SIMULATION_CONFIG = {
     "output_dir": "./outputs/"
 }
 
-# You could also define configurations for different scenarios
-SCENARIO_HIGH_CLIMATE_IMPACT = SIMULATION_CONFIG.copy()
-SCENARIO_HIGH_CLIMATE_IMPACT["scenario"] = "High Climate Impact"
-SCENARIO_HIGH_CLIMATE_IMPACT["model_params"]["climate"]["rcp_scenario"] = "RCP8.5"
-SCENARIO_HIGH_CLIMATE_IMPACT["model_params"]["water"]["transboundary_flow_multiplier"] = 0.85
+# Scenario configurations are immutable overlays on a frozen snapshot of the baseline
+# (see frozen_config.FrozenConfig): they share every section they do not override, and
+# cannot modify the baseline or each other
+BASELINE_CONFIG = FrozenConfig(SIMULATION_CONFIG)
+
+SCENARIO_HIGH_CLIMATE_IMPACT = BASELINE_CONFIG.override({
+    "scenario": "High Climate Impact",
+    "model_params.climate.rcp_scenario": "RCP8.5",
+    "model_params.water.transboundary_flow_multiplier": 0.85,
+})
 
-SCENARIO_GREEN_POLICY = SIMULATION_CONFIG.copy()
-SCENARIO_GREEN_POLICY["scenario"] = "Green Policy Push"
-SCENARIO_GREEN_POLICY["model_params"]["policy"]["renewable_energy_subsidy_level"] = 0.25
-SCENARIO_GREEN_POLICY["model_params"]["water"]["irrigation_efficiency_target"] = 50
+SCENARIO_GREEN_POLICY = BASELINE_CONFIG.override({
+    "scenario": "Green Policy Push",
+    "model_params.policy.renewable_energy_subsidy_level": 0.25,
+    "model_params.water.irrigation_efficiency_target": 50,
+})
+
+# Monte Carlo ensemble settings (see ensemble.EnsembleRunner)
+# Distributions are keyed by dotted path into the configuration dictionary
+ENSEMBLE_SETTINGS = {
+    "n_members": 100,
+    "seed": 42, # Root seed; member seeds are derived from it deterministically
+    "max_workers": None, # None uses all CPU cores
+    "distributions": {
+        "model_params.water.transboundary_flow_multiplier": ("uniform", 0.8, 1.1),
+        "model_params.climate.rcp_scenario": ("choice", ["RCP4.5", "RCP8.5"]),
+    },
+    "quantiles": (0.05, 0.25, 0.5, 0.75, 0.95), # Streamed per indicator and year for fan charts
+    "exceedance": [ # Threshold events reported as probabilities across members
+        {"model": "water", "indicator": "groundwater_level_change", "metric": "cumulative", "below": -2.0},
+    ],
+}
+
+# Global sensitivity analysis settings (see sensitivity.SensitivityStudy)
+# Ranges are keyed by dotted path into the configuration; every path must be a declared model
+# parameter. A Sobol study runs n_samples * (k + 2) simulations for k ranges, Morris n_samples * (k + 1).
+SENSITIVITY_SETTINGS = {
+    "method": "sobol", # 'sobol' (first/total-order indices) or 'morris' (elementary effects screening)
+    "n_samples": 256, # Base samples (Sobol, best a power of two) or trajectories (Morris)
+    "seed": 7,
+    "metric": "cumulative", # Reduction of each output over the years (analysis.metrics.METRICS)
+    "batch_size": 2048, # Scenarios per vectorized run_batch call
+    "max_workers": 1, # Processes running batches (None = all CPU cores)
+    "morris_levels": 4,
+    "ranges": {
+        "model_params.climate.rcp_scenario": ("choice", ["RCP2.6", "RCP4.5", "RCP6.0", "RCP8.5"]),
+        "model_params.climate.adaptation_investment_multiplier": ("uniform", 0.5, 2.0),
+        "model_params.water.transboundary_flow_multiplier": ("uniform", 0.6, 1.2),
+        "model_params.water.irrigation_efficiency_target": ("uniform", 30, 60),
+        "model_params.land.urban_growth_multiplier": ("uniform", 0.5, 2.0),
+        "model_params.land.slm_adoption_rate": ("uniform", 0, 10),
+        "model_params.forest.deforestation_multiplier": ("uniform", 0.5, 1.5),
+        "model_params.forest.community_forestry_expansion_sqkm_yr": ("uniform", 0, 30),
+        "model_params.biodiversity.habitat_loss_multiplier": ("uniform", 0.5, 1.5),
+        "model_params.marine.fishing_effort_multiplier": ("uniform", 0.7, 1.3),
+        "model_params.marine.hilsa_regulation_compliance_percent": ("uniform", 30, 90),
+        "model_params.mineral.extraction_multiplier": ("uniform", 0.5, 1.5),
+        "model_params.policy.renewable_energy_subsidy_level": ("uniform", 0.0, 0.4),
+        "model_params.community.capacity_building_multiplier": ("uniform", 0.5, 2.0),
+        "model_params.governance.enforcement_effort_multiplier": ("uniform", 0.5, 2.0),
+        "model_params.sustainable_use.green_technology_investment_multiplier": ("uniform", 0.5, 2.0),
+        "model_params.conservation.restoration_budget_multiplier": ("uniform", 0.5, 2.0),
+        "model_params.conservation.protected_area_staffing_multiplier": ("uniform", 0.5, 2.0),
+    },
+    # Outputs whose parameter rankings are printed by 'python -m ...sensitivity'
+    "report_outputs": [
+        ("climate", "overall_vulnerability_index_change"),
+        ("marine", "hilsa_catch_sustainability_index_change"),
+    ],
+}
 
 # Select the configuration to use
 ACTIVE_CONFIG = SIMULATION_CONFIG 
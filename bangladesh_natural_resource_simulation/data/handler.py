@@ -1,3 +1,154 @@
+import contextlib
+import csv
+import functools
+import json
+import logging
+import os
+
+import numpy as np
+
+
+# Series the simulation expects, by resource type. Sources for them are configured in
+# config['historical_sources']; series without a configured source stay None.
+DEFAULT_HISTORICAL_SERIES = {
+    'water': ['river_flow_ganges_1990_2020', 'groundwater_levels_all_districts'],
+    'land': ['land_use_maps_2000_2010_2020', 'soil_fertility_data_upazila'],
+    'forest': ['forest_cover_maps_1990_2020', 'inventory_data_sundarbans'],
+    # ... other resource types ...
+    'climate': ['temperature_records_stations', 'rainfall_data_divisional'],
+    'socioeconomic': ['population_census_data', 'gdp_growth_data'],
+}
+
+MANIFEST_FILENAME = 'manifest.json'
+
+logger = logging.getLogger(__name__)
+
+
+def path_signature(path):
+    """
+    Returns a signature of a data file or directory that changes whenever any file in it is
+    added, removed or rewritten: (relative path, st_mtime_ns, st_size) of the file, or of every
+    file below the directory in sorted order. A directory's own mtime is not enough, since
+    editing a file in place leaves it unchanged.
+
+    Args:
+        path (str): File or directory path.
+
+    Returns:
+        tuple: The signature; empty if the path does not exist.
+    """
+    if not path or not os.path.exists(path):
+        return ()
+    if not os.path.isdir(path):
+        stat = os.stat(path)
+        return ((os.path.basename(path), stat.st_mtime_ns, stat.st_size),)
+    signature = []
+    for directory, subdirectories, files in os.walk(path):
+        subdirectories.sort()
+        for name in sorted(files):
+            file_path = os.path.join(directory, name)
+            try:
+                stat = os.stat(file_path)
+            except FileNotFoundError:
+                continue # Removed while walking, e.g. a temporary file of a concurrent ingest
+            signature.append((os.path.relpath(file_path, path), stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+class HistoricalSeries:
+    """Memory-mapped historical time series: a time axis and a (n_times, n_columns) value matrix"""
+    def __init__(self, name, time, values, columns):
+        """
+        Args:
+            name (str): Series identifier (e.g. 'groundwater_levels_all_districts').
+            time (np.ndarray): Years (int64) or dates (datetime64[D]), one per row.
+            values (np.ndarray): float64 values of shape (n_times, n_columns); usually an np.memmap.
+            columns (list): Column names (e.g. district names or gauge stations).
+        """
+        self.name = name
+        self.time = time
+        self.values = values
+        self.columns = list(columns)
+
+    def column(self, name):
+        """Returns the values of one column (e.g. one district) as a 1-D view."""
+        return self.values[:, self.columns.index(name)]
+
+    def __len__(self):
+        return len(self.time)
+
+    def __repr__(self):
+        return f"HistoricalSeries({self.name!r}, rows={len(self.time)}, columns={len(self.columns)})"
+
+
+class SeriesIndex:
+    """Annual index over a HistoricalSeries for constant-time year lookup and vectorized interpolation"""
+    def __init__(self, series, extrapolation="linear"):
+        """
+        Aggregates the series to one row per year (mean of all observations in that year,
+        ignoring NaN) and keeps the years sorted.
+
+        Args:
+            series (HistoricalSeries): The series to index.
+            extrapolation (str): 'linear' continues the trend of the first/last two years,
+                                 'hold' repeats the first/last value.
+        """
+        if len(series.time) == 0:
+            raise ValueError(f"Cannot index historical series '{series.name}': it has no rows")
+        time = np.asarray(series.time)
+        if np.issubdtype(time.dtype, np.datetime64):
+            years = time.astype('datetime64[Y]').astype(np.int64) + 1970
+        else:
+            years = time.astype(np.int64)
+        order = np.argsort(years, kind='stable')
+        years = years[order]
+        values = np.asarray(series.values)[order]
+
+        self.columns = series.columns
+        self.extrapolation = extrapolation
+        self.years, starts = np.unique(years, return_index=True)
+        finite = ~np.isnan(values)
+        counts = np.add.reduceat(finite, starts, axis=0)
+        sums = np.add.reduceat(np.where(finite, values, 0.0), starts, axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.values = sums / counts
+        self.first_year = int(self.years[0])
+        # Contiguous years allow direct offset lookup instead of binary search
+        self.dense = len(self.years) == int(self.years[-1]) - self.first_year + 1
+
+    def values_for_year(self, year):
+        """Returns the row for one year (direct offset, binary search or interpolation)."""
+        if float(year).is_integer():
+            year = int(year)
+            if self.dense:
+                offset = year - self.first_year
+                if 0 <= offset < len(self.years):
+                    return self.values[offset].copy()
+            else:
+                position = int(np.searchsorted(self.years, year))
+                if position < len(self.years) and self.years[position] == year:
+                    return self.values[position].copy()
+        return self.values_for_years(np.array([year], dtype=float))[0]
+
+    def values_for_years(self, years):
+        """
+        Vectorized linear interpolation/extrapolation for an array of years.
+
+        Returns:
+            np.ndarray: Shape (len(years), n_columns).
+        """
+        if len(self.years) == 1:
+            return np.repeat(self.values, len(years), axis=0)
+        known = self.years.astype(float)
+        # Bracketing rows; outside the record these are the first/last two years
+        upper = np.clip(np.searchsorted(known, years), 1, len(known) - 1)
+        lower = upper - 1
+        weight = (years - known[lower]) / (known[upper] - known[lower])
+        if self.extrapolation == "hold":
+            weight = np.clip(weight, 0.0, 1.0)
+        return self.values[lower] + weight[:, None] * (self.values[upper] - self.values[lower])
+
+
 class NaturalResourceDataHandler:
     """Handle natural resource data loading and preprocessing for the simulation"""
     def __init__(self, config):
@@ -6,40 +157,209 @@ class NaturalResourceDataHandler:
         
         Args:
             config: Configuration object/dictionary potentially containing data paths, API keys, etc.
+                    'historical_sources' maps resource type -> series -> CSV path, and
+                    data_paths['store'] is where ingested binary series are kept.
         """
         self.config = config
         self.historical_data = {}
         self.realtime_data_sources = {}
-        print("Initializing Natural Resource Data Handler...")
+        self.store_dir = config.get("data_paths", {}).get("store", "./data/store/")
+        self.extrapolation = config.get("data_extrapolation", "linear")
+        self._indexes = {} # (resource_type, series) -> SeriesIndex, built on first lookup
+        self._cached_lookup = functools.lru_cache(maxsize=config.get("data_lookup_cache_size", 4096))(self._lookup)
+        logger.debug("Initializing Natural Resource Data Handler...")
+
+    # --- Binary series store ---
+
+    def _manifest_path(self):
+        return os.path.join(self.store_dir, MANIFEST_FILENAME)
+
+    def _read_manifest(self):
+        try:
+            with open(self._manifest_path()) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    @contextlib.contextmanager
+    def _manifest_lock(self):
+        # Exclusive lock on <store>/manifest.json.lock for a manifest read-modify-write, so
+        # workers ingesting different series at the same time do not drop each other's entries
+        os.makedirs(self.store_dir, exist_ok=True)
+        with open(f"{self._manifest_path()}.lock", 'a+') as lock_file:
+            if os.name == 'nt':
+                import msvcrt
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                try:
+                    yield
+                finally:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _write_manifest(self, manifest):
+        # Write-then-rename so concurrent readers never see a partial manifest
+        temp_path = f"{self._manifest_path()}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(temp_path, self._manifest_path())
+
+    @staticmethod
+    def _source_signature(csv_path):
+        stat = os.stat(csv_path)
+        return {"source": os.path.abspath(csv_path), "source_mtime": stat.st_mtime, "source_size": stat.st_size}
+
+    def ingest_csv(self, resource_type, series, csv_path):
+        """
+        Converts one CSV source into the binary store (<store>/<resource_type>/<series>.values.npy
+        and .time.npy) and records it in the store manifest.
+
+        The CSV needs a header row. Its first column is the time axis, holding either years
+        ('year' header) or ISO dates; every other column is a float64 value column
+        (e.g. one per district or gauge). Empty cells become NaN. Rows are streamed into a
+        memory-mapped output, so sources larger than memory can be ingested.
+
+        Args:
+            resource_type (str): Resource type (e.g. 'water').
+            series (str): Series identifier (e.g. 'groundwater_levels_all_districts').
+            csv_path (str): Path to the CSV source.
+
+        Returns:
+            dict: The manifest entry of the ingested series.
+
+        Raises:
+            ValueError: If the CSV has no header, no value column or no data rows, or a row has
+                        the wrong number of columns. No partial files are left in the store.
+        """
+        logger.info("Ingesting %s into binary store as %s/%s...", csv_path, resource_type, series)
+        with open(csv_path, newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            n_rows = sum(1 for row in reader if row)
+        if not header or len(header) < 2:
+            raise ValueError(f"{csv_path}: expected a header row with a time column and at least one value column")
+        if n_rows == 0:
+            raise ValueError(f"{csv_path}: no data rows below the header")
+
+        series_dir = os.path.join(self.store_dir, resource_type)
+        os.makedirs(series_dir, exist_ok=True)
+        values_file = os.path.join(resource_type, f"{series}.values.npy")
+        time_file = os.path.join(resource_type, f"{series}.time.npy")
+        temp_suffix = f".{os.getpid()}.tmp.npy"
+        values_temp = os.path.join(self.store_dir, values_file) + temp_suffix
+        time_temp = os.path.join(self.store_dir, time_file) + temp_suffix
+
+        is_yearly = header[0].strip().lower() == 'year'
+        values = None
+        try:
+            values = np.lib.format.open_memmap(values_temp, mode='w+', dtype=np.float64,
+                                               shape=(n_rows, len(header) - 1))
+            time = np.empty(n_rows, dtype=np.int64 if is_yearly else 'datetime64[D]')
+            with open(csv_path, newline='') as f:
+                reader = csv.reader(f)
+                next(reader)
+                row_index = 0
+                for line, row in enumerate(reader, start=2):
+                    if not row:
+                        continue
+                    if len(row) != len(header):
+                        raise ValueError(f"{csv_path}, line {line}: expected {len(header)} columns, got {len(row)}")
+                    time[row_index] = int(row[0]) if is_yearly else np.datetime64(row[0].strip(), 'D')
+                    values[row_index] = [float(cell) if cell.strip() else np.nan for cell in row[1:]]
+                    row_index += 1
+            values.flush()
+            values = None
+            np.save(time_temp, time)
+            os.replace(values_temp, os.path.join(self.store_dir, values_file))
+            os.replace(time_temp, os.path.join(self.store_dir, time_file))
+        except BaseException:
+            # Leave no partial column files behind; the previously ingested copy, if any, stays valid
+            values = None # Release the memory map before removing its file
+            for temp_path in (values_temp, time_temp):
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            raise
+
+        entry = {"resource_type": resource_type, "values_file": values_file, "time_file": time_file,
+                 "columns": [name.strip() for name in header[1:]], "rows": n_rows,
+                 **self._source_signature(csv_path)}
+        with self._manifest_lock():
+            manifest = self._read_manifest()
+            manifest[f"{resource_type}/{series}"] = entry
+            self._write_manifest(manifest)
+        return entry
+
+    def open_series(self, resource_type, series):
+        """
+        Opens an ingested series from the binary store without reading it into memory.
+        Every process that opens the same series shares one page-cache copy.
+
+        Returns:
+            HistoricalSeries: Series backed by np.memmap, or None if it has not been ingested.
+        """
+        entry = self._read_manifest().get(f"{resource_type}/{series}")
+        if entry is None:
+            return None
+        values = np.load(os.path.join(self.store_dir, entry["values_file"]), mmap_mode='r')
+        time = np.load(os.path.join(self.store_dir, entry["time_file"]), mmap_mode='r')
+        return HistoricalSeries(series, time, values, entry["columns"])
+
+    def _is_current(self, entry, csv_path):
+        if entry is None:
+            return False
+        signature = self._source_signature(csv_path)
+        return all(entry.get(key) == value for key, value in signature.items())
 
     def load_historical_data(self, sources=None):
         """
         Load and preprocess historical natural resource data from specified Bangladesh sources.
+
+        CSV sources are ingested into the binary store only when they are new or have changed
+        (by path, modification time and size); otherwise the existing binary files are reused.
+        Every series is served as a read-only memory map.
         
         Args:
-            sources (list, optional): List of data source identifiers or file paths. 
-                                      Defaults to None, potentially loading all default sources from config.
+            sources (list, optional): Series identifiers to load, either 'resource_type/series' or
+                                      just 'series'. Defaults to None, loading all series.
         
         Returns:
-            dict: A dictionary containing the loaded historical data, possibly structured by source or resource type.
+            dict: {resource_type: {series: HistoricalSeries or None}}. None marks series without
+                  a configured or existing source.
         """
-        print(f"Loading historical data from sources: {sources or 'default'}...")
-        # Placeholder logic:
-        # - Identify data files/databases based on 'sources' or config
-        # - Use libraries like pandas, geopandas to load data
-        # - Perform necessary preprocessing (cleaning, validation, unit conversion)
-        # - Store data in self.historical_data
-        
-        # Example synthetic structure:
-        self.historical_data = {
-            'water': {'river_flow_ganges_1990_2020': None, 'groundwater_levels_all_districts': None}, # Replace None with actual loaded data (e.g., DataFrame)
-            'land': {'land_use_maps_2000_2010_2020': None, 'soil_fertility_data_upazila': None},
-            'forest': {'forest_cover_maps_1990_2020': None, 'inventory_data_sundarbans': None},
-            # ... other resource types ...
-            'climate': {'temperature_records_stations': None, 'rainfall_data_divisional': None},
-            'socioeconomic': {'population_census_data': None, 'gdp_growth_data': None}
-        }
-        print("Historical data loaded (placeholders).")
+        logger.info("Loading historical data from sources: %s...", sources or 'default')
+        configured_sources = self.config.get("historical_sources", {})
+        series_by_type = {resource_type: list(series) for resource_type, series in DEFAULT_HISTORICAL_SERIES.items()}
+        for resource_type, series_sources in configured_sources.items():
+            for series in series_sources:
+                if series not in series_by_type.setdefault(resource_type, []):
+                    series_by_type[resource_type].append(series)
+
+        manifest = self._read_manifest()
+        self.historical_data = {}
+        self._indexes = {}
+        self._cached_lookup.cache_clear()
+        for resource_type, series_names in series_by_type.items():
+            loaded = self.historical_data.setdefault(resource_type, {})
+            for series in series_names:
+                if sources is not None and series not in sources and f"{resource_type}/{series}" not in sources:
+                    continue
+                csv_path = configured_sources.get(resource_type, {}).get(series)
+                if csv_path and os.path.exists(csv_path):
+                    if not self._is_current(manifest.get(f"{resource_type}/{series}"), csv_path):
+                        manifest[f"{resource_type}/{series}"] = self.ingest_csv(resource_type, series, csv_path)
+                    loaded[series] = self.open_series(resource_type, series)
+                else:
+                    # No source available: fall back to a previously ingested copy, if any
+                    loaded[series] = self.open_series(resource_type, series)
+
+        logger.info("Historical data loaded.")
         return self.historical_data
 
     def integrate_realtime_data(self, api_connections=None):
@@ -51,7 +371,7 @@ class NaturalResourceDataHandler:
             api_connections (dict, optional): Configuration for API connections (endpoints, keys). 
                                              Defaults to None, using config settings.
         """
-        print(f"Setting up real-time data integration: {api_connections or 'default'}...")
+        logger.info("Setting up real-time data integration: %s...", api_connections or 'default')
         # Placeholder logic:
         # - Configure connections to weather APIs, satellite data streams (e.g., GEE), 
         #   sensor networks (e.g., water level sensors via BWDB API if available).
@@ -62,33 +382,66 @@ class NaturalResourceDataHandler:
             'satellite_imagery': {'platform': 'Google Earth Engine', 'status': 'Credentials Needed'},
             'water_level_sensors': {'api_endpoint': None, 'status': 'Not Available'}
         }
-        print("Real-time data sources configured (placeholders).")
+        logger.info("Real-time data sources configured (placeholders).")
+
+    def _series_index(self, resource_type, parameter):
+        """Returns the (lazily built) annual index of a loaded series, or None if unavailable."""
+        key = (resource_type, parameter)
+        if key not in self._indexes:
+            series = self.historical_data.get(resource_type, {}).get(parameter)
+            self._indexes[key] = SeriesIndex(series, self.extrapolation) if series is not None else None
+        return self._indexes[key]
 
-    def get_data_for_year(self, year, resource_type, parameter):
+    def get_data_for_years(self, years, resource_type, parameter, column=None):
+        """
+        Vectorized lookup of a whole year range in one call.
+
+        Args:
+            years (array-like): Years to retrieve.
+            resource_type (str): The type of resource (e.g., 'water', 'land').
+            parameter (str): The series identifier (e.g., 'groundwater_levels_all_districts').
+            column (str, optional): Restrict to one column (e.g. one district).
+
+        Returns:
+            np.ndarray: Shape (len(years), n_columns), or (len(years),) when a column is given
+                        or the series has a single column. None if the series is not loaded.
+        """
+        index = self._series_index(resource_type, parameter)
+        if index is None:
+            return None
+        values = index.values_for_years(np.asarray(years, dtype=float))
+        if column is not None:
+            return values[:, index.columns.index(column)]
+        return values[:, 0] if values.shape[1] == 1 else values
+
+    def _lookup(self, year, resource_type, parameter, column):
+        index = self._series_index(resource_type, parameter)
+        if index is None:
+            return None
+        values = index.values_for_year(year)
+        if column is not None:
+            return float(values[index.columns.index(column)])
+        if len(values) == 1:
+            return float(values[0])
+        values.flags.writeable = False # Cached and shared between callers
+        return values
+
+    def get_data_for_year(self, year, resource_type, parameter, column=None):
         """
         Retrieves specific data for a given year, resource type, and parameter.
-        This would handle accessing historical data or fetching/interpolating real-time data.
+        Years inside the record are read directly from a precomputed annual index (daily data is
+        aggregated to annual means once), gaps are interpolated linearly and years outside the
+        record are extrapolated (see 'data_extrapolation' in the config). Results are memoized
+        in an LRU cache, so repeated calls from model steps cost a dictionary lookup.
         
         Args:
             year (int): The simulation year for which data is needed.
             resource_type (str): The type of resource (e.g., 'water', 'land').
-            parameter (str): The specific parameter needed (e.g., 'ganges_padma_flow', 'forest_cover').
+            parameter (str): The series identifier (e.g., 'river_flow_ganges_1990_2020').
+            column (str, optional): Restrict to one column (e.g. one district or gauge).
             
         Returns:
-            The requested data value or structure (e.g., float, dict, DataFrame).
+            float for single-column series or when a column is given, otherwise a read-only
+            np.ndarray with one value per column. None if the series is not loaded.
         """
-        print(f"Fetching data for Year: {year}, Resource: {resource_type}, Parameter: {parameter}")
-        # Placeholder logic:
-        # - Check if data exists in self.historical_data for the year/parameter
-        # - If not, potentially try to fetch from a real-time source (if configured and relevant)
-        # - May involve interpolation/extrapolation if exact year data isn't available
-        # - Return the relevant data slice or value
-        
-        # Example lookup (replace with actual logic)
-        if resource_type in self.historical_data and parameter in self.historical_data[resource_type]:
-             # In reality, you'd filter the loaded data (e.g., DataFrame) for the specific year
-            print(f"Found placeholder for {resource_type}/{parameter} in historical data.")
-            return self.historical_data[resource_type][parameter] # Returning placeholder structure
-        else:
-            print(f"Data not found for {resource_type}/{parameter}. Returning default/None.")
-            return None # Or some default value 
\ No newline at end of file
+        return self._cached_lookup(year, resource_type, parameter, column)
@@ -0,0 +1,315 @@
+# emulator.py
+
+import logging
+
+import numpy as np
+
+from .simulation import BangladeshNaturalResourceSimulation
+from .results import SimulationResults
+from .frozen_config import FrozenConfig
+from .logging_config import preserved_log_level
+
+logger = logging.getLogger(__name__)
+
+# Diagonal jitter keeping the kernel matrix positive definite
+_JITTER = 1e-8
+
+
+class EmulatedResults(SimulationResults):
+    """SimulationResults predicted by an Emulator, with a predictive standard deviation per value"""
+    emulated = True
+
+    def __init__(self, start_year, end_year, columns, values, std):
+        """
+        Args:
+            columns (list): (model, indicator) pairs.
+            values (np.ndarray): Predicted values, shape (n_columns, n_years).
+            std (np.ndarray): Predictive standard deviations, same shape.
+        """
+        super().__init__(start_year, end_year, columns=dict(zip(columns, values)),
+                         recorded=np.ones(end_year - start_year + 1, dtype=bool))
+        self._std = dict(zip(columns, std))
+
+    def uncertainty(self, model, indicator):
+        """Predictive standard deviation per year, in the indicator's units."""
+        return self._std[(model, indicator)]
+
+
+def _negative_log_likelihood(theta, sq_dists, rr, n_outputs):
+    """
+    Negative log marginal likelihood of n_outputs independent outputs sharing one ARD
+    squared-exponential kernel, and its gradient with respect to
+    theta = (log lengthscales, log signal sd, log noise sd).
+
+    Args:
+        sq_dists (np.ndarray): Per-dimension squared input distances, shape (d, n, n).
+        rr (np.ndarray): R @ R.T of the standardized residuals R (n, n_outputs), so the
+                         cost does not grow with the number of outputs.
+    """
+    from scipy.linalg import cho_factor, cho_solve, LinAlgError
+
+    d, n = sq_dists.shape[0], sq_dists.shape[1]
+    lengthscales = np.exp(theta[:d])
+    signal_var, noise_var = np.exp(2 * theta[d]), np.exp(2 * theta[d + 1])
+    scaled = sq_dists / lengthscales[:, None, None] ** 2
+    kf = signal_var * np.exp(-0.5 * scaled.sum(axis=0))
+    try:
+        factor = cho_factor(kf + (noise_var + _JITTER) * np.eye(n), lower=True)
+    except LinAlgError:
+        return 1e25, np.zeros_like(theta)
+    k_inv = cho_solve(factor, np.eye(n))
+    value = (0.5 * np.sum(k_inv * rr) + n_outputs * np.sum(np.log(np.diag(factor[0])))
+             + 0.5 * n_outputs * n * np.log(2 * np.pi))
+    # d(value)/dK, then the chain rule through each hyperparameter
+    dk = 0.5 * (n_outputs * k_inv - k_inv @ rr @ k_inv)
+    weighted = dk * kf
+    gradient = np.empty_like(theta)
+    gradient[:d] = np.einsum('ij,kij->k', weighted, scaled)
+    gradient[d] = 2 * weighted.sum()
+    gradient[d + 1] = 2 * noise_var * np.trace(dk)
+    return value, gradient
+
+
+class Emulator:
+    """
+    Gaussian-process surrogate of the simulation: maps model_params to the per-year trajectory
+    of every numeric indicator in well under a millisecond.
+
+    Trained on ensemble outputs (EnsembleRunner.run or run_batch results, whose .parameters
+    hold the sampled values). The prediction is a linear trend in the parameters plus a GP on
+    the residuals, with one ARD squared-exponential kernel shared by all outputs.
+    Queries outside the training range, or changing parameters the training did not vary,
+    fall back to the full simulation.
+    """
+    def __init__(self, base_config, start_year, end_year, columns, ranges, defaults):
+        """
+        Use Emulator.fit() to build a trained emulator.
+
+        Args:
+            base_config (dict): Configuration the training ensemble was run with.
+            columns (list): (model, indicator) of every emulated output.
+            ranges (dict): Dotted parameter path -> ("uniform", low, high) or ("choice", options),
+                           the training range of each varied parameter.
+            defaults (dict): Dotted path -> value in base_config (or the model's declared
+                             default) of every model parameter, used for parameters a query
+                             leaves out.
+        """
+        self.base_config = FrozenConfig(base_config).override({"quiet": True})
+        self.start_year = start_year
+        self.end_year = end_year
+        self.columns = [tuple(column) for column in columns]
+        self.parameters = sorted(ranges)
+        self.ranges = {path: tuple(ranges[path]) for path in self.parameters}
+        self.defaults = defaults
+        self.fallbacks = 0 # Queries answered by the full simulation
+        self.validation_rmse = None # Leave-one-out RMSE per output, shape (n_columns, n_years)
+
+    @staticmethod
+    def _declared_defaults(config):
+        """Dotted path -> resolved value of every declared model parameter under 'config'."""
+        with preserved_log_level():
+            simulation = BangladeshNaturalResourceSimulation(config=config)
+        defaults = {}
+        for model in simulation.models:
+            for name, value in model.get_parameters().items():
+                defaults[f"model_params.{model.PARAMETERS[name][0]}.{name}"] = value
+        return defaults
+
+    @classmethod
+    def fit(cls, results, base_config, ranges=None, max_iterations=200):
+        """
+        Trains an emulator on ensemble outputs.
+
+        Args:
+            results (EnsembleResults): Members to learn from, with .parameters mapping each
+                                       varied dotted path to the members' values. Members with
+                                       unrecorded years are skipped.
+            base_config (dict): Configuration the members were derived from.
+            ranges (dict, optional): Dotted path -> ("uniform", low, high) or ("choice", options),
+                                     the range the members were sampled from (e.g.
+                                     SENSITIVITY_SETTINGS["ranges"]). Defaults to the min/max
+                                     (or the set of options) of the sampled values.
+            max_iterations (int): L-BFGS iterations for the kernel hyperparameters.
+
+        Returns:
+            Emulator
+        """
+        from scipy.optimize import minimize # Imported here: scipy is slow to import
+
+        if not results.parameters:
+            raise ValueError("The results carry no sampled parameters to learn from")
+        complete = np.isfinite(results.values).all(axis=(1, 2))
+        ranges = dict(ranges or {})
+        for path, values in results.parameters.items():
+            values = np.asarray(values)[complete]
+            if path in ranges:
+                continue
+            if values.dtype.kind in 'iuf':
+                ranges[path] = ("uniform", float(values.min()), float(values.max()))
+            else:
+                ranges[path] = ("choice", sorted(set(values.tolist())))
+        unknown = set(ranges) - set(results.parameters)
+        if unknown:
+            raise ValueError(f"Ranges given for parameters the results did not vary: {sorted(unknown)}")
+        frozen = FrozenConfig(base_config)
+        emulator = cls(frozen, results.start_year, results.end_year, results.columns, ranges,
+                       cls._declared_defaults(frozen.override({"quiet": True})))
+
+        x = emulator._encode_rows({path: np.asarray(results.parameters[path])[complete] for path in emulator.parameters})
+        y = results.values[complete].reshape(int(complete.sum()), -1)
+        n, d = x.shape
+        logger.info("Training emulator on %s members, %s parameters, %s outputs", n, d, y.shape[1])
+
+        # Standardize outputs, remove the linear trend, and keep the outputs with residual variation
+        y_mean, y_scale = y.mean(axis=0), y.std(axis=0)
+        y_scale[y_scale == 0] = 1.0
+        design = np.hstack([np.ones((n, 1)), x])
+        beta = np.linalg.lstsq(design, (y - y_mean) / y_scale, rcond=None)[0]
+        residuals = (y - y_mean) / y_scale - design @ beta
+        residual_scale = residuals.std(axis=0)
+        active = np.flatnonzero(residual_scale > 1e-8)
+        standardized = residuals[:, active] / residual_scale[active]
+
+        sq_dists = (x.T[:, :, None] - x.T[:, None, :]) ** 2
+        rr = standardized @ standardized.T
+        theta0 = np.concatenate([np.full(d, np.log(0.5)), [0.0, np.log(0.1)]])
+        bounds = [(np.log(0.01), np.log(100.0))] * d + [(np.log(1e-3), np.log(10.0)), (np.log(1e-5), np.log(1.0))]
+        if active.size:
+            fitted = minimize(_negative_log_likelihood, theta0, args=(sq_dists, rr, active.size), jac=True,
+                              method='L-BFGS-B', bounds=bounds, options={"maxiter": max_iterations})
+            theta = fitted.x
+        else:
+            theta = theta0
+
+        emulator._x = x
+        emulator._y_mean, emulator._y_scale, emulator._beta = y_mean, y_scale, beta
+        emulator._active, emulator._residual_scale = active, residual_scale[active]
+        emulator._lengthscales = np.exp(theta[:d])
+        emulator._signal_var, emulator._noise_var = np.exp(2 * theta[d]), np.exp(2 * theta[d + 1])
+        kernel = emulator._signal_var * np.exp(-0.5 * (sq_dists / emulator._lengthscales[:, None, None] ** 2).sum(axis=0))
+        emulator._k_inv = np.linalg.inv(kernel + (emulator._noise_var + _JITTER) * np.eye(n))
+        emulator._alpha = emulator._k_inv @ standardized
+
+        # Leave-one-out residuals of a GP come from K^-1 directly, without refitting
+        loo = np.zeros_like(y)
+        loo[:, active] = emulator._alpha / np.diag(emulator._k_inv)[:, None] * emulator._residual_scale
+        emulator.validation_rmse = (np.sqrt(np.mean(loo ** 2, axis=0)) * y_scale).reshape(len(emulator.columns), -1)
+        return emulator
+
+    # --- Inputs ---
+
+    def _encode_rows(self, values):
+        """Maps parameter values (dotted path -> array of shape (n,)) to [0, 1]^d inputs."""
+        columns = []
+        for path in self.parameters:
+            kind, *args = self.ranges[path]
+            if kind == "uniform":
+                low, high = args
+                columns.append((np.asarray(values[path], dtype=float) - low) / (high - low) if high > low
+                               else np.zeros(len(values[path])))
+            else:
+                index = {option: i for i, option in enumerate(args[0])}
+                columns.append(np.array([index[value] for value in np.asarray(values[path]).tolist()], dtype=float)
+                               / max(len(args[0]) - 1, 1))
+        return np.column_stack(columns)
+
+    def in_range(self, params):
+        """
+        Whether the emulator can answer a query: every varied parameter within its training
+        range and every other parameter at its base configuration value.
+
+        Args:
+            params (dict): Dotted path -> value.
+        """
+        for path, value in params.items():
+            if path not in self.ranges:
+                if path not in self.defaults or value != self.defaults[path]:
+                    return False
+                continue
+            kind, *args = self.ranges[path]
+            if kind == "uniform":
+                if not args[0] <= value <= args[1]:
+                    return False
+            elif value not in args[0]:
+                return False
+        return True
+
+    def _encode(self, params):
+        x = np.empty(len(self.parameters))
+        for i, path in enumerate(self.parameters):
+            value = params.get(path, self.defaults[path])
+            kind, *args = self.ranges[path]
+            if kind == "uniform":
+                x[i] = (value - args[0]) / (args[1] - args[0]) if args[1] > args[0] else 0.0
+            else:
+                x[i] = args[0].index(value) / max(len(args[0]) - 1, 1)
+        return x
+
+    # --- Queries ---
+
+    def predict(self, params):
+        """
+        Emulated trajectories for one parameter set, without range checks.
+
+        Returns:
+            tuple: (values, std), each of shape (n_columns, n_years).
+        """
+        x = self._encode(params)
+        diff = (self._x - x) / self._lengthscales
+        k = self._signal_var * np.exp(-0.5 * np.einsum('ij,ij->i', diff, diff))
+        mean = self._beta[0] + x @ self._beta[1:]
+        mean[self._active] += (k @ self._alpha) * self._residual_scale
+        variance = max(self._signal_var + self._noise_var - k @ self._k_inv @ k, 0.0)
+        std = np.zeros_like(mean)
+        std[self._active] = np.sqrt(variance) * self._residual_scale
+        shape = (len(self.columns), -1)
+        return (self._y_mean + mean * self._y_scale).reshape(shape), (std * self._y_scale).reshape(shape)
+
+    def evaluate(self, params):
+        """
+        Results for one parameter set, through the SimulationResults interface.
+
+        Args:
+            params (dict): Dotted path -> value, e.g. {"model_params.land.urban_growth_multiplier": 1.4}.
+                           Parameters not given keep their base configuration value.
+
+        Returns:
+            SimulationResults: EmulatedResults (with .uncertainty()) inside the training range;
+                               otherwise the results of a full simulation run (.emulated is False).
+        """
+        if self.in_range(params):
+            values, std = self.predict(params)
+            return EmulatedResults(self.start_year, self.end_year, self.columns, values, std)
+
+        self.fallbacks += 1
+        logger.info("Parameters outside the emulator's training range; running the full simulation")
+        with preserved_log_level():
+            simulation = BangladeshNaturalResourceSimulation(config=self.base_config.override(params))
+            return simulation.run_simulation(start_year=self.start_year, end_year=self.end_year)
+
+
+# Example usage (if run directly)
+if __name__ == '__main__':
+    import time
+
+    from .config import ACTIVE_CONFIG, SENSITIVITY_SETTINGS
+    from .sensitivity import scale_samples
+    from scipy.stats import qmc
+
+    logging.basicConfig(level=logging.INFO)
+
+    # Train on a space-filling batch over the sensitivity ranges, then answer slider-style queries
+    ranges = SENSITIVITY_SETTINGS["ranges"]
+    paths = sorted(ranges)
+    values = scale_samples(qmc.Sobol(d=len(paths), seed=0).random(256), [ranges[path] for path in paths])
+    simulation = BangladeshNaturalResourceSimulation(config=dict(ACTIVE_CONFIG, quiet=True))
+    training = simulation.run_batch(dict(zip(paths, values)), ACTIVE_CONFIG["start_year"], ACTIVE_CONFIG["end_year"])
+    emulator = Emulator.fit(training, ACTIVE_CONFIG, ranges=ranges)
+
+    query = {"model_params.climate.rcp_scenario": "RCP8.5", "model_params.land.urban_growth_multiplier": 1.5}
+    start = time.perf_counter()
+    results = emulator.evaluate(query)
+    elapsed_ms = (time.perf_counter() - start) * 1e3
+    print(f"\nEmulated in {elapsed_ms:.3f} ms: overall_vulnerability_index_change by year\n"
+          f"{results.series('climate', 'overall_vulnerability_index_change')}\n"
+          f"+/- {results.uncertainty('climate', 'overall_vulnerability_index_change')}")
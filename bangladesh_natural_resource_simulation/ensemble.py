@@ -0,0 +1,215 @@
+# ensemble.py
+
+import logging
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .simulation import BangladeshNaturalResourceSimulation
+from .results import EnsembleResults
+from .frozen_config import FrozenConfig
+from .logging_config import preserved_log_level
+
+logger = logging.getLogger(__name__)
+
+
+def get_by_path(config, path):
+    """Returns the value at a dotted path such as 'model_params.water.transboundary_flow_multiplier'."""
+    value = config
+    for key in path.split('.'):
+        value = value[key]
+    return value
+
+
+def set_by_path(config, path, value):
+    """Sets the value at a dotted path, creating intermediate dictionaries as needed."""
+    keys = path.split('.')
+    target = config
+    for key in keys[:-1]:
+        target = target.setdefault(key, {})
+    target[keys[-1]] = value
+
+
+def sample_distribution(rng, spec):
+    """
+    Draws one value from a parameter distribution specification.
+
+    Supported specifications:
+        ("uniform", low, high)
+        ("normal", mean, std)
+        ("triangular", low, mode, high)
+        ("choice", options) or ("choice", options, probabilities)
+        ("fixed", value)
+
+    Args:
+        rng (np.random.Generator): The member's random generator.
+        spec (tuple): Distribution name followed by its arguments.
+    """
+    kind, *args = spec
+    if kind == "uniform":
+        return float(rng.uniform(args[0], args[1]))
+    if kind == "normal":
+        return float(rng.normal(args[0], args[1]))
+    if kind == "triangular":
+        return float(rng.triangular(args[0], args[1], args[2]))
+    if kind == "choice":
+        options = list(args[0])
+        probabilities = args[1] if len(args) > 1 else None
+        return options[int(rng.choice(len(options), p=probabilities))]
+    if kind == "fixed":
+        return args[0]
+    raise ValueError(f"Unknown distribution '{kind}' in ensemble specification {spec}")
+
+
+def _run_member(task):
+    """
+    Worker entry point: simulates one member and writes it into its row of the shared store.
+    Only the member index is returned, so no results are pickled back to the parent.
+    """
+    store_path, member, member_config, start_year, end_year = task
+    store = EnsembleResults.open(store_path, mode='r+')
+    simulation = BangladeshNaturalResourceSimulation(config=member_config)
+    simulation.run_simulation(start_year=start_year, end_year=end_year, results=store.member(member))
+    store.flush()
+    return member
+
+
+class EnsembleRunner:
+    """Run Monte Carlo ensembles of BangladeshNaturalResourceSimulation across worker processes"""
+    def __init__(self, base_config, distributions, n_members, seed=0, max_workers=None, quiet_members=True):
+        """
+        Initializes the EnsembleRunner.
+
+        Args:
+            base_config (dict): Configuration shared by all members (e.g. config.SIMULATION_CONFIG
+                                or a FrozenConfig scenario).
+            distributions (dict): Dotted config path -> distribution specification, e.g.
+                                  {"model_params.water.transboundary_flow_multiplier": ("uniform", 0.8, 1.1),
+                                   "model_params.climate.rcp_scenario": ("choice", ["RCP4.5", "RCP8.5"])}.
+                                  See sample_distribution() for supported specifications.
+            n_members (int): Number of ensemble members.
+            seed (int): Root seed. Member i always receives the same parameters and random
+                        seed for a given root seed, independent of worker scheduling.
+            max_workers (int, optional): Size of the process pool. None uses os.cpu_count();
+                                         1 runs all members in the current process.
+            quiet_members (bool): Run members with config['quiet'] = True so per-year progress
+                                  logging does not dominate the runtime of large ensembles.
+        """
+        self.base_config = base_config
+        self.frozen_base = FrozenConfig(base_config)
+        self.distributions = distributions
+        self.n_members = n_members
+        self.seed = seed
+        self.max_workers = max_workers
+        self.quiet_members = quiet_members
+        # One independent child seed per member, derived deterministically from the root seed
+        self.member_seeds = np.random.SeedSequence(seed).spawn(n_members)
+
+    def member_config(self, member):
+        """
+        Builds the configuration of one member: an overlay of the frozen base configuration
+        with every distribution sampled from the member's own generator. Sections that no
+        distribution touches are shared with the base, not copied.
+        The member's derived seed is stored as config["random_seed"] for stochastic models.
+        Incremental model reuse (config["incremental_models"]) is switched off for members.
+
+        Returns:
+            FrozenConfig
+        """
+        seed_sequence = self.member_seeds[member]
+        rng = np.random.default_rng(seed_sequence)
+        overrides = {path: sample_distribution(rng, self.distributions[path]) for path in sorted(self.distributions)}
+        overrides["random_seed"] = int(seed_sequence.generate_state(1)[0])
+        overrides["ensemble_member"] = member
+        # Every member has its own seed, so model steps from other members can never be reused
+        overrides["incremental_models"] = False
+        if self.quiet_members:
+            overrides["quiet"] = True
+        return self.frozen_base.override(overrides)
+
+    def _probe_columns(self, start_year):
+        """Runs the base configuration for one year to discover the numeric (model, indicator) columns."""
+        probe = BangladeshNaturalResourceSimulation(config=dict(self.base_config, quiet=self.quiet_members))
+        probe_results = probe.run_simulation(start_year=start_year, end_year=start_year)
+        return [(model, indicator) for model in probe_results.models()
+                for indicator in probe_results.indicators(model)
+                if probe_results.series(model, indicator).dtype == np.float64]
+
+    def run(self, start_year=None, end_year=None, store_path=None, statistics=None):
+        """
+        Runs all members and collects them into one columnar ensemble store.
+
+        Args:
+            start_year (int, optional): Defaults to base_config['start_year'].
+            end_year (int, optional): Defaults to base_config['end_year'].
+            store_path (str, optional): Directory for the memmapped store. Defaults to a new
+                                        temporary directory.
+            statistics (callable, optional): Called as statistics(columns, years) once the column
+                                             layout is known; must return an object with
+                                             add_member(values, columns), e.g.
+                                             analysis.ensemble_stats.EnsembleStatistics. Each member
+                                             is added as soon as it finishes, and the object is
+                                             returned as .statistics of the results.
+
+        Returns:
+            EnsembleResults: Store of shape (n_members, n_columns, n_years), with the sampled
+                             parameter values of every member in .parameters.
+        """
+        start_year = start_year if start_year is not None else self.base_config["start_year"]
+        end_year = end_year if end_year is not None else self.base_config["end_year"]
+        store_path = store_path or tempfile.mkdtemp(prefix="bd_nrs_ensemble_")
+        logger.info("--- Starting Ensemble Run: %s members, %s-%s ---", self.n_members, start_year, end_year)
+
+        with preserved_log_level():
+            columns = self._probe_columns(start_year)
+        store = EnsembleResults.create(store_path, start_year, end_year, columns, self.n_members)
+        configs = [self.member_config(member) for member in range(self.n_members)]
+        store.parameters = {path: [get_by_path(config, path) for config in configs]
+                            for path in self.distributions}
+        tasks = [(store_path, member, configs[member], start_year, end_year)
+                 for member in range(self.n_members)]
+        accumulator = statistics(columns, store.years) if statistics is not None else None
+
+        def finished(member):
+            # The store is a shared memmap, so the worker's flushed row is visible here; only one
+            # member's (n_columns, n_years) block is read at a time
+            if accumulator is not None:
+                accumulator.add_member(np.array(store.values[member]), columns)
+
+        if self.max_workers == 1:
+            with preserved_log_level():
+                for task in tasks:
+                    finished(_run_member(task))
+        else:
+            workers = self.max_workers or os.cpu_count() or 1
+            chunksize = max(1, self.n_members // (4 * workers))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for member in executor.map(_run_member, tasks, chunksize=chunksize):
+                    finished(member)
+
+        # Re-open so the parent sees every member's writes
+        results = EnsembleResults.open(store_path, mode='r')
+        results.parameters = store.parameters
+        results.statistics = accumulator
+        logger.info("--- Ensemble Run Finished: results stored in %s ---", store_path)
+        return results
+
+
+# Example usage (if run directly)
+if __name__ == '__main__':
+    from .config import ACTIVE_CONFIG, ENSEMBLE_SETTINGS
+    from .analysis.ensemble_stats import EnsembleStatistics
+
+    logging.basicConfig(level=logging.INFO)
+
+    runner = EnsembleRunner(ACTIVE_CONFIG, ENSEMBLE_SETTINGS["distributions"],
+                            n_members=ENSEMBLE_SETTINGS["n_members"], seed=ENSEMBLE_SETTINGS["seed"],
+                            max_workers=ENSEMBLE_SETTINGS["max_workers"])
+    ensemble = runner.run(statistics=lambda columns, years: EnsembleStatistics(
+        columns, years, quantiles=ENSEMBLE_SETTINGS["quantiles"], exceedance=ENSEMBLE_SETTINGS["exceedance"]))
+    bands = ensemble.quantiles('water', 'groundwater_level_change')
+    print(f"\nGroundwater level change P5/P50/P95 by year:\n{bands}")
+    for event, probability in ensemble.statistics.exceedance_probabilities():
+        print(f"P({event}) by year: {np.round(probability, 3)}")
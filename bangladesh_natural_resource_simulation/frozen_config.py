@@ -0,0 +1,127 @@
+# frozen_config.py
+
+import hashlib
+import json
+
+
+def freeze(value):
+    """
+    Returns an immutable equivalent of a configuration value: dictionaries become FrozenConfig,
+    lists and tuples become tuples. Values that are already frozen are returned as they are,
+    so freezing a tree built from frozen subtrees only touches the new parts.
+    """
+    if isinstance(value, FrozenConfig):
+        return value
+    if isinstance(value, dict):
+        return FrozenConfig(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+def thaw(value):
+    """Returns a mutable deep copy of a (possibly frozen) configuration value, with plain dictionaries."""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return tuple(thaw(item) for item in value)
+    return value
+
+
+def _immutable(self, *args, **kwargs):
+    raise TypeError("FrozenConfig is immutable; use override() to derive a variant")
+
+
+class FrozenConfig(dict):
+    """
+    Immutable, hashable configuration dictionary with cheap overlay variants.
+
+    A FrozenConfig reads like the plain configuration dictionaries used everywhere else
+    (config["model_params"]["water"], config.get(...), json.dumps), but cannot be modified in
+    place. Variants are derived with override(): only the dictionaries along the overridden
+    paths are rebuilt and every other subtree is shared with the original, so thousands of
+    sweep or ensemble configurations cost a few small dictionaries each instead of a deep copy.
+    """
+    __slots__ = ("_hash", "_digest")
+
+    def __init__(self, mapping=(), **kwargs):
+        super().__init__((key, freeze(value)) for key, value in dict(mapping, **kwargs).items())
+        self._hash = None
+        self._digest = None
+
+    @classmethod
+    def _from_frozen(cls, items):
+        # Wraps a dictionary whose values are already frozen, without visiting them again
+        config = cls.__new__(cls)
+        dict.update(config, items)
+        config._hash = None
+        config._digest = None
+        return config
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(frozenset(self.items()))
+        return self._hash
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (FrozenConfig, (dict(self),))
+
+    def __repr__(self):
+        return f"FrozenConfig({dict.__repr__(self)})"
+
+    def digest(self):
+        """
+        Returns:
+            str: Hex content hash, stable across processes (unlike hash(), which is salted per
+                 process for strings), e.g. to name cache entries or deduplicate sweep points.
+        """
+        if self._digest is None:
+            payload = json.dumps(self, sort_keys=True, default=str)
+            self._digest = hashlib.sha256(payload.encode()).hexdigest()
+        return self._digest
+
+    def override(self, overrides):
+        """
+        Derives a variant with values replaced at dotted paths; this config is unchanged.
+
+        Args:
+            overrides (dict): Dotted path -> value, e.g.
+                              {"scenario": "High Climate Impact", "model_params.climate.rcp_scenario": "RCP8.5"}.
+                              Missing intermediate dictionaries are created.
+
+        Returns:
+            FrozenConfig: The variant, sharing every subtree not on an overridden path.
+        """
+        children = {}
+        for path, value in overrides.items():
+            key, _, rest = path.partition('.')
+            children.setdefault(key, []).append((rest, value))
+        items = dict(self)
+        for key, updates in children.items():
+            for rest, value in updates:
+                if not rest:
+                    items[key] = freeze(value)
+            nested = {rest: value for rest, value in updates if rest}
+            if nested:
+                child = items.get(key)
+                if child is None:
+                    child = FrozenConfig()
+                elif not isinstance(child, dict):
+                    raise TypeError(f"Cannot override '{key}.{next(iter(nested))}': '{key}' is not a dictionary")
+                items[key] = freeze(child).override(nested)
+        return FrozenConfig._from_frozen(items)
+
+    def thaw(self):
+        """Returns a mutable deep copy as plain dictionaries."""
+        return thaw(self)
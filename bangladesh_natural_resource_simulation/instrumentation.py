@@ -0,0 +1,129 @@
+# instrumentation.py
+
+import json
+import time
+import tracemalloc
+
+
+class _NullMeasurement:
+    """Context manager used when profiling is disabled; does nothing."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+_NULL_MEASUREMENT = _NullMeasurement()
+
+
+class _Measurement:
+    """Times one stage with perf_counter_ns and, if enabled, tracks its traced allocations."""
+    __slots__ = ("profiler", "category", "name", "year", "start_ns", "start_bytes")
+
+    def __init__(self, profiler, category, name, year):
+        self.profiler = profiler
+        self.category = category
+        self.name = name
+        self.year = year
+
+    def __enter__(self):
+        if self.profiler.trace_allocations:
+            self.start_bytes = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        elapsed_ns = time.perf_counter_ns() - self.start_ns
+        record = {"category": self.category, "name": self.name, "year": self.year, "elapsed_ns": elapsed_ns}
+        if self.profiler.trace_allocations:
+            current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+            record["alloc_net_bytes"] = current_bytes - self.start_bytes
+            record["alloc_peak_bytes"] = peak_bytes - self.start_bytes
+        self.profiler.records.append(record)
+        return False
+
+
+class Profiler:
+    """Record per-stage timings (and optional allocation statistics) for simulation and analysis runs"""
+    def __init__(self, enabled=True, trace_allocations=False):
+        """
+        Initializes the Profiler.
+
+        Args:
+            enabled (bool): Record timings. When False, measure() returns a no-op context.
+            trace_allocations (bool): Also record net and peak traced memory per stage with
+                                      tracemalloc (opt-in, as tracing slows Python down
+                                      considerably). Peaks of nested stages are attributed
+                                      to the innermost stage.
+        """
+        self.enabled = enabled
+        self.trace_allocations = enabled and trace_allocations
+        self.records = []
+        self._started_tracing = False
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    @classmethod
+    def from_config(cls, config):
+        """Builds a profiler from config['profiling'] and config['trace_allocations']."""
+        return cls(enabled=config.get("profiling", True), trace_allocations=config.get("trace_allocations", False))
+
+    def measure(self, category, name, year=None):
+        """
+        Returns a context manager timing one stage, e.g.
+            with profiler.measure('simulate', 'water', 2030): ...
+
+        Args:
+            category (str): Stage kind: 'load', 'simulate', 'simulate_batch' or 'analysis'.
+            name (str): Stage name (e.g. model key, data section or analysis method).
+            year (int, optional): Simulation year, for per-year stages.
+        """
+        if not self.enabled:
+            return _NULL_MEASUREMENT
+        return _Measurement(self, category, name, year)
+
+    def stop(self):
+        """Stops tracemalloc if this profiler started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def summary(self):
+        """
+        Aggregates the records per (category, name), slowest first.
+
+        Returns:
+            list: Dicts with calls, total/mean/max time in ms, share of all recorded time in
+                  percent and, when traced, total net and maximum peak allocation in bytes.
+        """
+        totals = {}
+        for record in self.records:
+            key = (record["category"], record["name"])
+            entry = totals.setdefault(key, {"category": key[0], "name": key[1], "calls": 0,
+                                            "total_ns": 0, "max_ns": 0})
+            entry["calls"] += 1
+            entry["total_ns"] += record["elapsed_ns"]
+            entry["max_ns"] = max(entry["max_ns"], record["elapsed_ns"])
+            if "alloc_net_bytes" in record:
+                entry["alloc_net_bytes"] = entry.get("alloc_net_bytes", 0) + record["alloc_net_bytes"]
+                entry["alloc_peak_bytes"] = max(entry.get("alloc_peak_bytes", 0), record["alloc_peak_bytes"])
+
+        grand_total_ns = sum(entry["total_ns"] for entry in totals.values()) or 1
+        rows = []
+        for entry in sorted(totals.values(), key=lambda entry: entry["total_ns"], reverse=True):
+            row = {"category": entry["category"], "name": entry["name"], "calls": entry["calls"],
+                   "total_ms": entry["total_ns"] / 1e6, "mean_ms": entry["total_ns"] / entry["calls"] / 1e6,
+                   "max_ms": entry["max_ns"] / 1e6, "share_percent": 100 * entry["total_ns"] / grand_total_ns}
+            if "alloc_net_bytes" in entry:
+                row["alloc_net_bytes"] = entry["alloc_net_bytes"]
+                row["alloc_peak_bytes"] = entry["alloc_peak_bytes"]
+            rows.append(row)
+        return rows
+
+    def to_json(self, path):
+        """Writes the raw records and the summary to a JSON file."""
+        with open(path, 'w') as f:
+            json.dump({"summary": self.summary(), "records": self.records}, f)
@@ -0,0 +1,232 @@
+# kernels.py
+
+import logging
+
+import numpy as np
+
+try:
+    import numba
+except ImportError: # Optional: the NumPy backend is used without it
+    numba = None
+
+logger = logging.getLogger(__name__)
+
+# 'numpy': vectorized array code at the call sites (reference implementation, always available)
+# 'numba': the loop kernels below compiled with @njit (fused loops, no temporaries)
+# 'python': the same loop kernels interpreted; only for parity checks on small inputs
+KERNEL_BACKENDS = ("numpy", "numba", "python")
+
+
+# --- Loop kernels (nopython-compatible; compiled with numba or run as plain Python) ---
+
+def _diffuse_csr(values, indptr, targets, rate, iterations, fixed, fixed_values):
+    """
+    Explicit diffusion on a CSR neighbor graph (see SpatialGrid.diffuse).
+
+    Args:
+        values, rate, fixed_values: float64 arrays of shape (n_rows, n_cells).
+        indptr, targets: CSR neighbor layout of the grid.
+        iterations (int): Number of diffusion steps.
+        fixed: bool array of shape (n_cells,), cells held at fixed_values.
+    """
+    n_rows, n_cells = values.shape
+    current = values.copy()
+    following = np.empty_like(current)
+    for r in range(n_rows):
+        for i in range(n_cells):
+            if fixed[i]:
+                current[r, i] = fixed_values[r, i]
+    for _ in range(iterations):
+        for r in range(n_rows):
+            for i in range(n_cells):
+                start, end = indptr[i], indptr[i + 1]
+                value = current[r, i]
+                if end > start:
+                    total = 0.0
+                    for j in range(start, end):
+                        total += current[r, targets[j]]
+                    value = value + rate[r, i] * (total * (1.0 / (end - start)) - value)
+                following[r, i] = fixed_values[r, i] if fixed[i] else value
+        current, following = following, current
+    return current
+
+
+def _propagate_level_csr(levels, indptr, targets, loss_per_step, iterations):
+    """
+    Level spreading on a CSR neighbor graph (see SpatialGrid.propagate_level), with
+    synchronous updates and an early stop once no cell changes.
+
+    Args:
+        levels: float64 array of shape (n_rows, n_cells).
+        loss_per_step (float): Level lost per cell crossed.
+    """
+    n_rows, n_cells = levels.shape
+    current = levels.copy()
+    following = np.empty_like(current)
+    for _ in range(iterations):
+        changed = False
+        for r in range(n_rows):
+            for i in range(n_cells):
+                best = current[r, i]
+                for j in range(indptr[i], indptr[i + 1]):
+                    candidate = current[r, targets[j]] - loss_per_step
+                    if candidate > best:
+                        best = candidate
+                following[r, i] = best
+                if best != current[r, i]:
+                    changed = True
+        if not changed:
+            break
+        current, following = following, current
+    return current
+
+
+def _level_path_minimum(cumulative_recharge, cumulative_consumed, pumping_multiplier):
+    """
+    Deepest groundwater level change of the year (capped at 0) per pumping multiplier,
+    without materializing the (n_scenarios, n_steps) level path.
+    """
+    n_steps = len(cumulative_recharge)
+    lowest = np.empty(len(pumping_multiplier))
+    for s in range(len(pumping_multiplier)):
+        minimum = 0.0
+        for t in range(n_steps):
+            level = cumulative_recharge[t] - pumping_multiplier[s] * cumulative_consumed[t]
+            if level < minimum:
+                minimum = level
+        lowest[s] = minimum
+    return lowest
+
+
+_LOOP_KERNELS = {
+    "diffuse_csr": _diffuse_csr,
+    "propagate_level_csr": _propagate_level_csr,
+    "level_path_minimum": _level_path_minimum,
+}
+
+_compiled = {} # Kernel name -> numba dispatcher, compiled on first selection
+_backend = None
+_loops = None # Loop kernels of the active backend, None for 'numpy'
+
+
+def available_backends():
+    """Returns the kernel backends usable in this environment."""
+    return tuple(name for name in KERNEL_BACKENDS if name != "numba" or numba is not None)
+
+
+def set_backend(name="auto"):
+    """
+    Selects the process-wide kernel backend.
+
+    Args:
+        name (str): 'auto' (numba when installed, else numpy), 'numpy', 'numba' or 'python'.
+
+    Returns:
+        str: The selected backend.
+
+    Raises:
+        ValueError: If the backend is unknown, or 'numba' is requested but not installed.
+    """
+    global _backend, _loops
+    if name == "auto":
+        name = "numba" if numba is not None else "numpy"
+    if name not in KERNEL_BACKENDS:
+        raise ValueError(f"Unknown kernel backend '{name}'; expected 'auto' or one of {KERNEL_BACKENDS}")
+    if name == "numba":
+        if numba is None:
+            raise ValueError("Kernel backend 'numba' requested but numba is not installed")
+        for kernel, function in _LOOP_KERNELS.items():
+            if kernel not in _compiled:
+                _compiled[kernel] = numba.njit(cache=True, nogil=True)(function)
+        _loops = _compiled
+    elif name == "python":
+        _loops = _LOOP_KERNELS
+    else:
+        _loops = None
+    if name != _backend:
+        logger.debug("Kernel backend: %s", name)
+    _backend = name
+    return name
+
+
+def get_backend():
+    """Returns the active kernel backend, selecting the default ('auto') on first use."""
+    if _backend is None:
+        set_backend()
+    return _backend
+
+
+def loop_kernel(name):
+    """
+    Returns the loop implementation of kernel 'name' for the active backend, or None when
+    the NumPy backend is active and the call site should run its vectorized code.
+    """
+    get_backend()
+    return None if _loops is None else _loops[name]
+
+
+def check_parity(backend=None, n_scenarios=3, rows=12, cols=15, seed=0):
+    """
+    Runs every kernel on the NumPy backend and on a loop backend and compares the results,
+    on a small random raster so the interpreted backend also finishes quickly.
+
+    Args:
+        backend (str, optional): Loop backend to compare ('numba' or 'python'); defaults to
+                                 'numba' when installed, else 'python'.
+
+    Returns:
+        dict: Kernel name -> maximum absolute difference.
+
+    Raises:
+        AssertionError: If any kernel differs beyond floating-point rounding.
+    """
+    from .spatial import SpatialGrid
+    from .models.hydrology import seasonal_water_balance
+
+    backend = backend or ("numba" if numba is not None else "python")
+    previous = get_backend()
+    rng = np.random.default_rng(seed)
+    grid = SpatialGrid.raster(rows, cols)
+    # A CSR-only grid too (with an isolated cell), as the NumPy backend has a raster fast path
+    sources, targets = np.repeat(np.arange(grid.n_cells), grid.degree), grid.targets
+    keep = (sources != 0) & (targets != 0)
+    units = SpatialGrid(grid.attributes, (sources[keep], targets[keep]))
+    values = rng.uniform(0, 30, (n_scenarios, grid.n_cells))
+    levels = np.where(rng.random((n_scenarios, grid.n_cells)) < 0.05, rng.uniform(0, 8, (n_scenarios, grid.n_cells)), 0.0)
+    rate = rng.uniform(0, 0.5, grid.n_cells)
+    fixed = grid.attributes["coastal"]
+    boundary = rng.uniform(5, 10, (n_scenarios, 1))
+    hydrology_inputs = (
+        "daily",
+        {"ganges": {"dry_m3s": 500.0, "peak_m3s": 40000.0, "bankfull_m3s": 30000.0}},
+        {"peak_day": 212, "duration_days": 80},
+        {"monsoon_mm": 2000.0, "dry_season_mm": 400.0},
+        {"recharge_mm": 300.0, "pumping_mm": 350.0, "irrigation_share": 0.8,
+         "return_flow_fraction": 0.23, "specific_yield": 0.1},
+        {"max_area_sqkm": 8000.0, "river": "ganges"},
+        rng.uniform(0.7, 1.2, n_scenarios),
+        rng.uniform(0.5, 2.0, n_scenarios),
+    )
+
+    def run():
+        results = {}
+        for label, g in (("raster", grid), ("units", units)):
+            results[f"diffuse_csr[{label}]"] = g.diffuse(values, rate, iterations=7, fixed=fixed, fixed_values=boundary)
+            results[f"propagate_level_csr[{label}]"] = g.propagate_level(levels, 0.4, 25)
+        results["level_path_minimum"] = seasonal_water_balance(*hydrology_inputs)["groundwater_min_level_change"]
+        return results
+
+    try:
+        set_backend("numpy")
+        expected = run()
+        set_backend(backend)
+        actual = run()
+    finally:
+        set_backend(previous)
+
+    differences = {name: float(np.max(np.abs(actual[name] - expected[name]))) for name in expected}
+    for name, difference in differences.items():
+        scale = max(float(np.max(np.abs(expected[name]))), 1.0)
+        if difference > 1e-12 * scale:
+            raise AssertionError(f"Kernel {name} differs between numpy and {backend} backends by {difference}")
+    return differences
@@ -0,0 +1,46 @@
+# logging_config.py
+
+import logging
+from contextlib import contextmanager
+
+PACKAGE_LOGGER = 'bangladesh_natural_resource_simulation'
+DEFAULT_LOG_FORMAT = "%(asctime)s %(levelname)-7s [%(name)s] %(message)s"
+
+
+def configure_logging(config):
+    """
+    Applies the logging settings of a configuration to the package logger.
+
+    Config keys:
+        log_level (str): 'DEBUG' (per-model and data loading detail), 'INFO' (run and year
+                         progress, the default), 'WARNING' or 'ERROR'.
+        quiet (bool): Only warnings and errors. Progress calls then return at the level check,
+                      before any message formatting, which keeps large ensembles and sweeps
+                      free of terminal I/O.
+        log_format (str, optional): logging.Formatter format string.
+
+    A stream handler is attached to the package logger only if neither it nor the root logger
+    has handlers, so applications that configure logging themselves keep full control.
+
+    Returns:
+        logging.Logger: The package logger.
+    """
+    logger = logging.getLogger(PACKAGE_LOGGER)
+    level = "WARNING" if config.get("quiet", False) else config.get("log_level", "INFO")
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    if not logger.handlers and not logging.getLogger().handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(config.get("log_format", DEFAULT_LOG_FORMAT)))
+        logger.addHandler(handler)
+    return logger
+
+
+@contextmanager
+def preserved_log_level():
+    """Restores the package logger level on exit, e.g. around in-process runs of quiet ensemble members."""
+    logger = logging.getLogger(PACKAGE_LOGGER)
+    level = logger.level
+    try:
+        yield logger
+    finally:
+        logger.setLevel(level)
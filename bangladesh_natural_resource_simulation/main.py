@@ -1,51 +1,65 @@
 # main.py
 
 import time
-import json
+import logging
 import os
 
 from bangladesh_natural_resource_simulation.simulation import BangladeshNaturalResourceSimulation
 from bangladesh_natural_resource_simulation.analysis.engine import NaturalResourceAnalysisEngine
 from bangladesh_natural_resource_simulation.config import ACTIVE_CONFIG # Import the chosen config
+from bangladesh_natural_resource_simulation.logging_config import configure_logging
+from bangladesh_natural_resource_simulation.writers import open_results_writer
+
+logger = logging.getLogger("bangladesh_natural_resource_simulation.main")
 
 def main():
     """Main function to run the simulation and analysis."""
     
     start_time = time.time()
-    print(f"Starting Simulation run with config: {ACTIVE_CONFIG['simulation_name']}")
-    print(f"Scenario: {ACTIVE_CONFIG['scenario']}")
-    print(f"Period: {ACTIVE_CONFIG['start_year']}-{ACTIVE_CONFIG['end_year']}")
+    configure_logging(ACTIVE_CONFIG)
+    logger.info("Starting Simulation run with config: %s", ACTIVE_CONFIG['simulation_name'])
+    logger.info("Scenario: %s", ACTIVE_CONFIG['scenario'])
+    logger.info("Period: %s-%s", ACTIVE_CONFIG['start_year'], ACTIVE_CONFIG['end_year'])
     
     # 1. Initialize Simulation
     simulation = BangladeshNaturalResourceSimulation(config=ACTIVE_CONFIG)
     
-    # 2. Run Simulation
-    results = simulation.run_simulation(
-        start_year=ACTIVE_CONFIG['start_year'],
-        end_year=ACTIVE_CONFIG['end_year']
-        # scenarios parameter could be used here if implemented
-    )
-    
-    # --- Optional: Save raw results --- 
+    # 2. Run Simulation, streaming each year's raw results to the output directory
     output_dir = ACTIVE_CONFIG.get("output_dir", "./outputs/")
     os.makedirs(output_dir, exist_ok=True)
-    results_filename = os.path.join(output_dir, f"simulation_results_{ACTIVE_CONFIG['scenario']}.json")
+    writer = open_results_writer(ACTIVE_CONFIG, output_dir)
     try:
-        with open(results_filename, 'w') as f:
-            # Use default=str to handle potential non-serializable types if models become complex
-            json.dump(results, f, indent=4, default=str) 
-        print(f"Raw simulation results saved to: {results_filename}")
-    except Exception as e:
-        print(f"Error saving raw results: {e}")
+        run = simulation.run_simulation_cached if ACTIVE_CONFIG.get("result_cache", False) else simulation.run_simulation
+        results = run(
+            start_year=ACTIVE_CONFIG['start_year'],
+            end_year=ACTIVE_CONFIG['end_year'],
+            # scenarios parameter could be used here if implemented
+            writer=writer
+        )
+    finally:
+        if writer is not None:
+            writer.close()
+            logger.info("Raw simulation results saved to: %s", writer.path)
         
     # 3. Initialize and Run Analysis Engine
-    analysis_engine = NaturalResourceAnalysisEngine(simulation_results=results, config=ACTIVE_CONFIG)
+    analysis_engine = NaturalResourceAnalysisEngine(simulation_results=results, config=ACTIVE_CONFIG,
+                                                    profiler=simulation.profiler)
     analysis_output = analysis_engine.run_analysis()
+
+    # --- Save the timing profile (model steps, data loading, analysis stages) ---
+    if simulation.profiler.enabled:
+        profile_filename = os.path.join(output_dir, f"profile_{ACTIVE_CONFIG['scenario']}.json")
+        try:
+            simulation.profiler.to_json(profile_filename)
+            logger.info("Timing profile saved to: %s", profile_filename)
+        except Exception as e:
+            logger.error("Error saving timing profile: %s", e)
+    simulation.profiler.stop()
     
     end_time = time.time()
-    print(f"\nTotal execution time: {end_time - start_time:.2f} seconds")
-    print("Simulation and Analysis complete. Check the output directory for results.")
-    print(f"Report generated at: {analysis_engine.report_file}")
+    logger.info("Total execution time: %.2f seconds", end_time - start_time)
+    logger.info("Simulation and Analysis complete. Check the output directory for results.")
+    logger.info("Report generated at: %s", analysis_engine.report_file)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
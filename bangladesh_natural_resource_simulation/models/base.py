@@ -0,0 +1,161 @@
+
+import numpy as np
+
+from ..data.handler import path_signature
+
+
+# Process-wide cache of loaded data sections, keyed by (model class, section name, config data
+# path, data.handler.path_signature of the files under it)
+_SECTION_CACHE = {}
+
+
+def clear_data_cache():
+    """Drops all cached data sections, e.g. after input files were replaced in place."""
+    _SECTION_CACHE.clear()
+
+
+class DataSection:
+    """
+    Lazily loaded, memoized model data section (e.g. WaterResourceModel.river_systems).
+
+    The section's _load_* method runs on first attribute access only. Its result is shared by
+    every model instance in the process whose configuration points at the same data path with
+    unchanged files (path, modification time and size of every file under it), so repeated simulations and ensemble members pay the loading cost once.
+    Sections are shared objects and must be treated as read-only.
+    """
+    def __init__(self, loader):
+        """
+        Args:
+            loader (str): Name of the model's _load_* method, called as loader(config).
+        """
+        self.loader = loader
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        data_path = instance.config.get("data_paths", {}).get(instance.DATA_PATH_KEY) if instance.DATA_PATH_KEY else None
+        key = (type(instance).__name__, self.name, data_path, path_signature(data_path))
+        if key not in _SECTION_CACHE:
+            if instance.profiler is not None:
+                with instance.profiler.measure('load', f"{instance.STATE_KEY}.{self.loader}"):
+                    _SECTION_CACHE[key] = getattr(instance, self.loader)(instance.config)
+            else:
+                _SECTION_CACHE[key] = getattr(instance, self.loader)(instance.config)
+        # Store on the instance so later reads bypass the descriptor entirely
+        instance.__dict__[self.name] = _SECTION_CACHE[key]
+        return instance.__dict__[self.name]
+
+
+def lookup(table, values):
+    """
+    Maps a categorical parameter (e.g. an RCP scenario name) to numbers via 'table'.
+    Works for a single value or an array of values, returning the same shape.
+    """
+    if isinstance(values, np.ndarray):
+        return np.array([table[value] for value in values.ravel()], dtype=float).reshape(values.shape)
+    return table[values]
+
+
+class ResourceModel:
+    """Shared behaviour of the component models: parameters, lazy data, state declarations and batched stepping"""
+
+    # current_state key the model writes its output to (e.g. 'water')
+    STATE_KEY = None
+
+    # Name of the model's one-year simulate method (e.g. 'simulate_step')
+    SIMULATE_METHOD = None
+
+    # current_state keys read from the same year; the scheduler runs their writers first
+    READS = ()
+
+    # current_state keys read from the previous year; these do not constrain execution order
+    LAGGED_READS = ()
+
+    # Model parameters: name -> (section of config['model_params'], default value)
+    PARAMETERS = {}
+
+    # Key of config['data_paths'] holding the model's input data, if any (e.g. 'water_data')
+    DATA_PATH_KEY = None
+
+    # Instance attributes that evolve during a run (e.g. storages, stocks, random generators);
+    # they are saved in checkpoints and restored on resume
+    CHECKPOINT_ATTRIBUTES = ()
+
+    # instrumentation.Profiler timing the model's data loading, set by the simulation
+    profiler = None
+
+    # spatial.SpatialState of the run, set by the simulation when config['spatial_grid'] is given
+    spatial = None
+
+    def data_sections(self):
+        """Returns the names of the model's lazily loaded data sections."""
+        return [name for klass in type(self).__mro__ for name, value in vars(klass).items()
+                if isinstance(value, DataSection)]
+
+    def load_data_sections(self):
+        """Loads every data section now, e.g. before forking ensemble workers that share the cache."""
+        for name in self.data_sections():
+            getattr(self, name)
+
+    def reset_state(self):
+        """Discards evolving internal state so the next run starts from the class defaults."""
+        for name in self.CHECKPOINT_ATTRIBUTES:
+            self.__dict__.pop(name, None)
+
+    def get_checkpoint_state(self):
+        """Returns the model's evolving internal state (see CHECKPOINT_ATTRIBUTES) for a checkpoint."""
+        return {name: getattr(self, name) for name in self.CHECKPOINT_ATTRIBUTES}
+
+    def set_checkpoint_state(self, state):
+        """Restores internal state saved by get_checkpoint_state()."""
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def get_parameters(self):
+        """
+        Resolves the model's parameters from config['model_params'], falling back to defaults.
+
+        Returns:
+            dict: Parameter name -> scalar value.
+        """
+        model_params = self.config.get("model_params", {})
+        return {name: model_params.get(section, {}).get(name, default)
+                for name, (section, default) in self.PARAMETERS.items()}
+
+    def _compute_dynamics(self, year, state, params):
+        """
+        Array-friendly core of the model's simulate method. Parameter and state values may be
+        scalars or arrays of shape (n_scenarios,); outputs broadcast accordingly.
+        """
+        raise NotImplementedError
+
+    def simulate_batch(self, year, state, params, n_scenarios):
+        """
+        Simulates one time step for a whole batch of scenarios in a single NumPy pass.
+
+        Args:
+            year: The current simulation year.
+            state: The batched simulation state ({model: {indicator: array of shape (n_scenarios,)}}).
+            params: Parameter name -> scalar or array of shape (n_scenarios,).
+                    Missing parameters are taken from the configuration.
+            n_scenarios (int): Number of scenarios in the batch.
+
+        Returns:
+            dict: Indicator name -> array of shape (n_scenarios,). Numeric indicators are float64,
+                  categorical ones (e.g. status strings) are object arrays.
+        """
+        batch_params = self.get_parameters()
+        batch_params.update({name: value for name, value in params.items() if name in self.PARAMETERS})
+        outputs = self._compute_dynamics(year, state, batch_params)
+        batch_outputs = {}
+        for indicator, value in outputs.items():
+            if isinstance(value, str):
+                batch_outputs[indicator] = np.full(n_scenarios, value, dtype=object)
+            elif isinstance(value, np.ndarray) and value.dtype.kind in 'OU':
+                batch_outputs[indicator] = np.broadcast_to(value.astype(object), (n_scenarios,)).copy()
+            else:
+                batch_outputs[indicator] = np.broadcast_to(np.asarray(value, dtype=float), (n_scenarios,)).copy()
+        return batch_outputs
@@ -1,5 +1,26 @@
-class BiodiversityModel:
+import logging
+
+from .base import ResourceModel, DataSection
+
+logger = logging.getLogger(__name__)
+
+
+class BiodiversityModel(ResourceModel):
     """Model species diversity, ecosystem function and conservation in Bangladesh"""
+    STATE_KEY = 'biodiversity'
+    SIMULATE_METHOD = 'simulate_biodiversity_dynamics'
+    READS = ('land', 'forest', 'water', 'marine')
+    LAGGED_READS = ('conservation',)
+    PARAMETERS = {
+        "habitat_loss_multiplier": ("biodiversity", 1.0), # 1.0 = current habitat loss rate
+    }
+
+    # Data sections, loaded on first access and cached process-wide
+    species_populations = DataSection('_load_species_data')
+    habitat_conditions = DataSection('_load_habitat_data')
+    ecosystem_services = DataSection('_load_ecosystem_service_data')
+    conservation_measures = DataSection('_load_conservation_measures')
+
     def __init__(self, config):
         """
         Initializes the BiodiversityModel.
@@ -8,16 +29,12 @@ class BiodiversityModel:
             config: Configuration object/dictionary containing simulation parameters.
         """
         self.config = config
-        print("Initializing Biodiversity Model...")
-        # Placeholder for loading initial biodiversity data based on config
-        self.species_populations = self._load_species_data(config)
-        self.habitat_conditions = self._load_habitat_data(config)
-        self.ecosystem_services = self._load_ecosystem_service_data(config)
-        self.conservation_measures = self._load_conservation_measures(config)
+        logger.debug("Initializing Biodiversity Model...")
+        # Initial biodiversity data sections are loaded lazily on first access (see DataSection)
         
     def _load_species_data(self, config):
         # Placeholder
-        print("Loading Species Population Data...")
+        logger.debug("Loading Species Population Data...")
         # Synthetic data examples
         return {"threatened_species_count": {"CR": 50, "EN": 150, "VU": 300}, # Critically Endangered, Endangered, Vulnerable
                 "keystone_species_population": {"bengal_tiger_count": 114, "hilsa_catch_mt": 500000}, # Examples
@@ -30,7 +47,7 @@ class BiodiversityModel:
 
     def _load_habitat_data(self, config):
         # Placeholder
-        print("Loading Habitat Condition Data...")
+        logger.debug("Loading Habitat Condition Data...")
         # Synthetic data examples
         return {"protected_area_network_coverage_percent_land": 5.5,
                 "ecological_corridor_functionality_index": 40, # Scale 0-100
@@ -43,7 +60,7 @@ class BiodiversityModel:
 
     def _load_ecosystem_service_data(self, config):
         # Placeholder
-        print("Loading Ecosystem Service Data...")
+        logger.debug("Loading Ecosystem Service Data...")
         # Synthetic data examples
         return {"provisioning_service_value_usd_yr": 10e9, # Estimated (fisheries, timber, etc.)
                 "regulating_service_value_usd_yr": 8e9, # Estimated (flood control, carbon seq.)
@@ -56,7 +73,7 @@ class BiodiversityModel:
 
     def _load_conservation_measures(self, config):
         # Placeholder
-        print("Loading Conservation Measure Data...")
+        logger.debug("Loading Conservation Measure Data...")
         # Synthetic data examples
         return {"pa_management_effectiveness_avg_score": 50,
                 "species_recovery_programs_count": 15,
@@ -79,7 +96,7 @@ class BiodiversityModel:
         Returns:
             Updated state related to biodiversity.
         """
-        print(f"Simulating Biodiversity Dynamics for year {year}...")
+        logger.debug("Simulating Biodiversity Dynamics for year %s...", year)
         
         # Placeholder for simulation logic:
         # - Update species populations based on habitat changes, threats, conservation efforts
@@ -88,10 +105,15 @@ class BiodiversityModel:
         # - Model effectiveness of conservation measures
         
         # Calculate biodiversity outcomes using Bangladesh ecological data
-        updated_biodiversity_state = {
-            "threatened_species_index_change": -0.02, # Example output
-            "key_habitat_area_change": -10, # Example output (sq km)
-            "ecosystem_service_value_index_change": -0.01, # Example output
+        updated_biodiversity_state = self._compute_dynamics(year, state, self.get_parameters())
+        return updated_biodiversity_state
+
+    def _compute_dynamics(self, year, state, params):
+        # Placeholder: species and ecosystem service indices decline with habitat loss
+        habitat_loss = params["habitat_loss_multiplier"]
+        return {
+            "threatened_species_index_change": -0.02 * habitat_loss, # Example output
+            "key_habitat_area_change": -10 * habitat_loss, # Example output (sq km)
+            "ecosystem_service_value_index_change": -0.01 * habitat_loss, # Example output
             "invasive_species_coverage_change": 0.5 # Example output (% points)
         }
-        return updated_biodiversity_state 
\ No newline at end of file
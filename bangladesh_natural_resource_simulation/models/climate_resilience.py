@@ -1,5 +1,33 @@
-class ClimateResilienceModel:
+import logging
+
+import numpy as np
+
+from .base import ResourceModel, DataSection, lookup
+from ..spatial import indicator, per_scenario
+
+logger = logging.getLogger(__name__)
+
+# Placeholder climate forcing of each RCP scenario relative to RCP4.5
+RCP_FORCING_FACTORS = {"RCP2.6": 0.6, "RCP4.5": 1.0, "RCP6.0": 1.2, "RCP8.5": 1.6}
+
+
+class ClimateResilienceModel(ResourceModel):
     """Model climate impacts, vulnerability and resilience of natural resources in Bangladesh"""
+    STATE_KEY = 'climate'
+    SIMULATE_METHOD = 'simulate_resilience_dynamics'
+    LAGGED_READS = ('water', 'land', 'forest', 'marine')
+    PARAMETERS = {
+        "rcp_scenario": ("climate", "RCP4.5"),
+        "adaptation_investment_multiplier": ("climate", 1.0), # 1.0 = current adaptation spending
+    }
+
+    # Data sections, loaded on first access and cached process-wide
+    climate_projections = DataSection('_load_climate_projections')
+    vulnerability_assessment = DataSection('_load_vulnerability_data')
+    adaptation_strategies = DataSection('_load_adaptation_strategies')
+    resilience_building = DataSection('_load_resilience_data')
+    spatial_parameters = DataSection('_load_spatial_parameters')
+
     def __init__(self, config):
         """
         Initializes the ClimateResilienceModel.
@@ -8,16 +36,12 @@ class ClimateResilienceModel:
             config: Configuration object/dictionary containing simulation parameters.
         """
         self.config = config
-        print("Initializing Climate Resilience Model...")
-        # Placeholder for loading initial climate/resilience data based on config
-        self.climate_projections = self._load_climate_projections(config)
-        self.vulnerability_assessment = self._load_vulnerability_data(config)
-        self.adaptation_strategies = self._load_adaptation_strategies(config)
-        self.resilience_building = self._load_resilience_data(config)
+        logger.debug("Initializing Climate Resilience Model...")
+        # Initial climate/resilience data sections are loaded lazily on first access (see DataSection)
 
     def _load_climate_projections(self, config):
         # Placeholder
-        print("Loading Climate Projection Data...")
+        logger.debug("Loading Climate Projection Data...")
         # Synthetic data examples for 2035 based on RCP scenarios (e.g., RCP 4.5/6.0)
         return {"temperature_increase_degrees_c": 1.2,
                 "precipitation_change_percent_monsoon": 8, # Increased monsoon rainfall
@@ -31,7 +55,7 @@ class ClimateResilienceModel:
 
     def _load_vulnerability_data(self, config):
         # Placeholder
-        print("Loading Ecosystem Vulnerability Data...")
+        logger.debug("Loading Ecosystem Vulnerability Data...")
         # Synthetic data examples (indices 0-100, higher is more vulnerable/threatened)
         return {"forest_ecosystem_sensitivity_index": 65,
                 "freshwater_habitat_vulnerability_index": 70,
@@ -44,7 +68,7 @@ class ClimateResilienceModel:
 
     def _load_adaptation_strategies(self, config):
         # Placeholder
-        print("Loading Adaptation Strategy Data...")
+        logger.debug("Loading Adaptation Strategy Data...")
         # Synthetic data examples
         return {"ecosystem_based_adaptation_projects_implemented": 50,
                 "conservation_corridor_planning_status": "Under Development",
@@ -57,7 +81,7 @@ class ClimateResilienceModel:
 
     def _load_resilience_data(self, config):
         # Placeholder
-        print("Loading Resilience Measurement Data...")
+        logger.debug("Loading Resilience Measurement Data...")
         # Synthetic data examples
         return {"ecological_resilience_indicator_index": 55, # Scale 0-100
                 "social_ecological_system_analysis_framework": "Developing",
@@ -68,6 +92,15 @@ class ClimateResilienceModel:
                 "cross_scale_resilience_linkage_strength": "Weak",
                 "resilience_investment_prioritization_effectiveness": "Moderate"}
 
+    def _load_spatial_parameters(self, config):
+        # Placeholder: salinity propagation settings for the spatial grid
+        logger.debug("Loading Spatial Salinity Parameters...")
+        return {"sea_boundary_salinity_ppt": 30, # At RCP4.5 forcing
+                "salinity_diffusion_rate": 0.25, # Share of the gap to the neighbor mean closed per step
+                "salinity_diffusion_steps_per_year": 10,
+                "salinity_elevation_scale_m": 3, # Intrusion slows e-fold per 3 m of elevation
+                "crop_salinity_threshold_ppt": 4}
+
     def simulate_resilience_dynamics(self, year, state):
         """
         Simulates one time step for climate resilience dynamics.
@@ -80,7 +113,7 @@ class ClimateResilienceModel:
         Returns:
             Updated state related to climate resilience.
         """
-        print(f"Simulating Climate Resilience Dynamics for year {year}...")
+        logger.debug("Simulating Climate Resilience Dynamics for year %s...", year)
         
         # Placeholder for simulation logic:
         # - Apply climate change impacts (from projections) to resource models (water, land, etc.)
@@ -89,10 +122,41 @@ class ClimateResilienceModel:
         # - Track changes in resilience indicators based on capacity, adaptation, and impacts
         
         # Calculate climate resilience using Bangladesh environmental change data
-        updated_resilience_state = {
-            "overall_vulnerability_index_change": 0.3, # Increasing vulnerability
-            "adaptation_effectiveness_score_change": 0.1, # Slight improvement
-            "ecological_resilience_index_change": -0.2, # Slight decrease
-            "adaptive_capacity_index_change": 0.15
+        updated_resilience_state = self._compute_dynamics(year, state, self.get_parameters())
+        return updated_resilience_state
+
+    def _compute_dynamics(self, year, state, params):
+        # Placeholder: climate forcing relative to RCP4.5 scales vulnerability and resilience loss,
+        # adaptation investment scales adaptation gains.
+        forcing = lookup(RCP_FORCING_FACTORS, params["rcp_scenario"])
+        adaptation = params["adaptation_investment_multiplier"]
+        outputs = {
+            "overall_vulnerability_index_change": 0.3 * forcing - 0.1 * (adaptation - 1), # Increasing vulnerability
+            "adaptation_effectiveness_score_change": 0.1 * adaptation, # Slight improvement
+            "ecological_resilience_index_change": -0.2 * forcing, # Slight decrease
+            "adaptive_capacity_index_change": 0.15 * adaptation
+        }
+        if self.spatial is not None:
+            outputs.update(self._spatial_dynamics(forcing))
+        return outputs
+
+    def _spatial_dynamics(self, forcing):
+        """
+        Propagates salinity inland from the coast across the spatial grid: the coastal boundary
+        rises with climate forcing and diffuses into neighboring cells, slowed by elevation.
+        Writes the 'soil_salinity_ppt' field.
+        """
+        grid = self.spatial.grid
+        spatial = self.spatial_parameters
+        salinity = self.spatial.read(self, "soil_salinity_ppt")
+        if salinity is None:
+            salinity = grid.attributes.get("initial_salinity_ppt", np.zeros(grid.n_cells))
+        rate = spatial["salinity_diffusion_rate"] * np.exp(-grid.attributes["elevation_m"] / spatial["salinity_elevation_scale_m"])
+        salinity = grid.diffuse(salinity, rate, iterations=spatial["salinity_diffusion_steps_per_year"],
+                                fixed=grid.attributes["coastal"],
+                                fixed_values=spatial["sea_boundary_salinity_ppt"] * per_scenario(forcing))
+        self.spatial.write(self, "soil_salinity_ppt", salinity)
+        return {
+            "salinity_affected_area_sqkm": indicator(grid.total_area(salinity > spatial["crop_salinity_threshold_ppt"])),
+            "mean_soil_salinity_ppt": indicator(grid.area_weighted_mean(salinity)),
         }
-        return updated_resilience_state 
\ No newline at end of file
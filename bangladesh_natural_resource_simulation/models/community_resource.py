@@ -1,5 +1,26 @@
-class CommunityResourceModel:
+import logging
+
+from .base import ResourceModel, DataSection
+
+logger = logging.getLogger(__name__)
+
+
+class CommunityResourceModel(ResourceModel):
     """Model community engagement, local governance and sustainable use in Bangladesh"""
+    STATE_KEY = 'community'
+    SIMULATE_METHOD = 'simulate_community_dynamics'
+    READS = ('water', 'land', 'forest', 'marine')
+    LAGGED_READS = ('governance',)
+    PARAMETERS = {
+        "capacity_building_multiplier": ("community", 1.0), # 1.0 = current training/project support
+    }
+
+    # Data sections, loaded on first access and cached process-wide
+    local_institutions = DataSection('_load_local_institutions')
+    traditional_practices = DataSection('_load_traditional_practices')
+    benefit_sharing = DataSection('_load_benefit_sharing_data')
+    empowerment_approaches = DataSection('_load_empowerment_data')
+
     def __init__(self, config):
         """
         Initializes the CommunityResourceModel.
@@ -8,16 +29,12 @@ class CommunityResourceModel:
             config: Configuration object/dictionary containing simulation parameters.
         """
         self.config = config
-        print("Initializing Community Resource Model...")
-        # Placeholder for loading initial community data based on config
-        self.local_institutions = self._load_local_institutions(config)
-        self.traditional_practices = self._load_traditional_practices(config)
-        self.benefit_sharing = self._load_benefit_sharing_data(config)
-        self.empowerment_approaches = self._load_empowerment_data(config)
+        logger.debug("Initializing Community Resource Model...")
+        # Initial community data sections are loaded lazily on first access (see DataSection)
 
     def _load_local_institutions(self, config):
         # Placeholder
-        print("Loading Local Resource Governance Structures Data...")
+        logger.debug("Loading Local Resource Governance Structures Data...")
         # Synthetic data examples (counts and effectiveness indices 0-100)
         return {"community_forest_user_group_count": 1500, "effectiveness_index": 60,
                 "water_management_association_count": 3000, "effectiveness_index": 55,
@@ -30,7 +47,7 @@ class CommunityResourceModel:
 
     def _load_traditional_practices(self, config):
         # Placeholder
-        print("Loading Traditional and Indigenous Practice Data...")
+        logger.debug("Loading Traditional and Indigenous Practice Data...")
         # Synthetic data examples
         return {"traditional_ecological_knowledge_application_level": "Moderate but declining",
                 "customary_resource_rules_enforcement": "Weakening",
@@ -43,7 +60,7 @@ class CommunityResourceModel:
 
     def _load_benefit_sharing_data(self, config):
         # Placeholder
-        print("Loading Equitable Benefit Sharing Data...")
+        logger.debug("Loading Equitable Benefit Sharing Data...")
         # Synthetic data examples
         return {"resource_access_right_equity_index": 45, # Scale 0-100, higher is more equitable
                 "revenue_sharing_mechanism_coverage_percent_projects": 40,
@@ -56,7 +73,7 @@ class CommunityResourceModel:
 
     def _load_empowerment_data(self, config):
         # Placeholder
-        print("Loading Community Capacity and Empowerment Data...")
+        logger.debug("Loading Community Capacity and Empowerment Data...")
         # Synthetic data examples (indices 0-100)
         return {"technical_skill_development_index": 55,
                 "organizational_capacity_strengthening_index": 60,
@@ -79,7 +96,7 @@ class CommunityResourceModel:
         Returns:
             Updated state related to community resource management.
         """
-        print(f"Simulating Community Dynamics for year {year}...")
+        logger.debug("Simulating Community Dynamics for year %s...", year)
         
         # Placeholder for simulation logic:
         # - Model the performance and evolution of local institutions (e.g., effectiveness changes)
@@ -90,10 +107,15 @@ class CommunityResourceModel:
         #   forestry impacts forest health)
 
         # Calculate community management using Bangladesh local resource data
-        updated_community_state = {
-            "local_institution_effectiveness_change": 0.15,
+        updated_community_state = self._compute_dynamics(year, state, self.get_parameters())
+        return updated_community_state
+
+    def _compute_dynamics(self, year, state, params):
+        # Placeholder: institutional effectiveness and empowerment scale with capacity building
+        capacity_building = params["capacity_building_multiplier"]
+        return {
+            "local_institution_effectiveness_change": 0.15 * capacity_building,
             "traditional_practice_adherence_change": -0.5, # Slight decline
             "benefit_sharing_equity_index_change": 0.1,
-            "community_empowerment_index_change": 0.2
+            "community_empowerment_index_change": 0.2 * capacity_building
         }
-        return updated_community_state 
\ No newline at end of file
@@ -1,5 +1,26 @@
-class ConservationModel:
+import logging
+
+from .base import ResourceModel, DataSection
+
+logger = logging.getLogger(__name__)
+
+
+class ConservationModel(ResourceModel):
     """Model protection approaches, restoration and biodiversity conservation in Bangladesh"""
+    STATE_KEY = 'conservation'
+    SIMULATE_METHOD = 'simulate_conservation_dynamics'
+    READS = ('biodiversity', 'forest', 'governance')
+    PARAMETERS = {
+        "restoration_budget_multiplier": ("conservation", 1.0), # 1.0 = current restoration funding
+        "protected_area_staffing_multiplier": ("conservation", 1.0),
+    }
+
+    # Data sections, loaded on first access and cached process-wide
+    protected_systems = DataSection('_load_pa_data')
+    restoration_approaches = DataSection('_load_restoration_data')
+    species_conservation = DataSection('_load_species_protection_data')
+    landscape_management = DataSection('_load_landscape_conservation_data')
+
     def __init__(self, config):
         """
         Initializes the ConservationModel.
@@ -8,16 +29,12 @@ class ConservationModel:
             config: Configuration object/dictionary containing simulation parameters.
         """
         self.config = config
-        print("Initializing Conservation Model...")
-        # Placeholder for loading initial conservation data based on config
-        self.protected_systems = self._load_pa_data(config)
-        self.restoration_approaches = self._load_restoration_data(config)
-        self.species_conservation = self._load_species_protection_data(config)
-        self.landscape_management = self._load_landscape_conservation_data(config)
+        logger.debug("Initializing Conservation Model...")
+        # Initial conservation data sections are loaded lazily on first access (see DataSection)
 
     def _load_pa_data(self, config):
         # Placeholder
-        print("Loading Protected Area Management Data...")
+        logger.debug("Loading Protected Area Management Data...")
         # Synthetic data examples
         return {"protected_area_coverage_percent_land": 5.5, "percent_marine": 4.8,
                 "management_effectiveness_avg_score": 50, # PAME score
@@ -30,7 +47,7 @@ class ConservationModel:
 
     def _load_restoration_data(self, config):
         # Placeholder
-        print("Loading Ecosystem Restoration Approach Data...")
+        logger.debug("Loading Ecosystem Restoration Approach Data...")
         # Synthetic data examples
         return {"forest_restoration_area_target_sqkm_yr": 100, "progress_percent": 70,
                 "wetland_restoration_projects_count": 40, "success_rate_percent": 60,
@@ -43,7 +60,7 @@ class ConservationModel:
 
     def _load_species_protection_data(self, config):
         # Placeholder
-        print("Loading Threatened Species Protection Data...")
+        logger.debug("Loading Threatened Species Protection Data...")
         # Synthetic data examples
         return {"flagship_species_conservation_programs": ["Tiger", "Elephant", "Dolphin"],
                 "recovery_plan_implementation_effectiveness": "Moderate for key species",
@@ -56,7 +73,7 @@ class ConservationModel:
 
     def _load_landscape_conservation_data(self, config):
         # Placeholder
-        print("Loading Landscape Conservation Approach Data...")
+        logger.debug("Loading Landscape Conservation Approach Data...")
         # Synthetic data examples
         return {"ecological_network_design_status": "Conceptual stage",
                 "multiple_use_landscape_management_area_sqkm": 3000,
@@ -79,7 +96,7 @@ class ConservationModel:
         Returns:
             Updated state related to conservation and restoration.
         """
-        print(f"Simulating Conservation Dynamics for year {year}...")
+        logger.debug("Simulating Conservation Dynamics for year %s...", year)
         
         # Placeholder for simulation logic:
         # - Model changes in protected area effectiveness based on funding, staffing, threats
@@ -89,10 +106,16 @@ class ConservationModel:
         # - Link conservation outcomes to biodiversity indicators and ecosystem service provision
 
         # Calculate conservation outcomes using Bangladesh biodiversity data
-        updated_conservation_state = {
-            "protected_area_effectiveness_score_change": 0.1,
-            "restoration_area_increase_sqkm": 80,
-            "threatened_species_status_improvement_index_change": 0.05,
-            "landscape_connectivity_index_change": 0.02
+        updated_conservation_state = self._compute_dynamics(year, state, self.get_parameters())
+        return updated_conservation_state
+
+    def _compute_dynamics(self, year, state, params):
+        # Placeholder: restoration area scales with budget, protected area effectiveness with staffing
+        budget = params["restoration_budget_multiplier"]
+        staffing = params["protected_area_staffing_multiplier"]
+        return {
+            "protected_area_effectiveness_score_change": 0.1 * staffing,
+            "restoration_area_increase_sqkm": 80 * budget,
+            "threatened_species_status_improvement_index_change": 0.05 * staffing,
+            "landscape_connectivity_index_change": 0.02 * budget
         }
-        return updated_conservation_state 
\ No newline at end of file
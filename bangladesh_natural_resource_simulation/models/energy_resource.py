@@ -1,5 +1,26 @@
-class EnergyResourceModel:
+import logging
+
+from .base import ResourceModel, DataSection
+
+logger = logging.getLogger(__name__)
+
+
+class EnergyResourceModel(ResourceModel):
     """Model energy sources, production patterns and transition in Bangladesh"""
+    STATE_KEY = 'energy'
+    SIMULATE_METHOD = 'simulate_energy_dynamics'
+    READS = ('mineral',)
+    PARAMETERS = {
+        "renewable_energy_subsidy_level": ("policy", 0.1), # Share of capital cost subsidised
+    }
+
+    # Data sections, loaded on first access and cached process-wide
+    fossil_resources = DataSection('_load_fossil_data')
+    renewable_potential = DataSection('_load_renewable_data')
+    energy_mix_evolution = DataSection('_load_mix_data')
+    transition_pathways = DataSection('_load_transition_data')
+    governance_framework = DataSection('_load_governance_data')
+
     def __init__(self, config):
         """
         Initializes the EnergyResourceModel.
@@ -8,17 +29,12 @@ class EnergyResourceModel:
             config: Configuration object/dictionary containing simulation parameters.
         """
         self.config = config
-        print("Initializing Energy Resource Model...")
-        # Placeholder for loading initial energy data based on config
-        self.fossil_resources = self._load_fossil_data(config)
-        self.renewable_potential = self._load_renewable_data(config)
-        self.energy_mix_evolution = self._load_mix_data(config)
-        self.transition_pathways = self._load_transition_data(config)
-        self.governance_framework = self._load_governance_data(config)
+        logger.debug("Initializing Energy Resource Model...")
+        # Initial energy data sections are loaded lazily on first access (see DataSection)
 
     def _load_fossil_data(self, config):
         # Placeholder
-        print("Loading Fossil Fuel Resource Data...")
+        logger.debug("Loading Fossil Fuel Resource Data...")
         # Synthetic data examples
         return {"natural_gas_field_production_bcf_yr": 900,
                 "coal_reserve_utilization_rate_percent_yr": 0.5,
@@ -31,7 +47,7 @@ class EnergyResourceModel:
 
     def _load_renewable_data(self, config):
         # Placeholder
-        print("Loading Renewable Energy Data...")
+        logger.debug("Loading Renewable Energy Data...")
         # Synthetic data examples
         return {"solar_pv_installed_capacity_mw": 1000,
                 "wind_energy_potential_gw": 30, # Estimated potential
@@ -44,7 +60,7 @@ class EnergyResourceModel:
 
     def _load_mix_data(self, config):
         # Placeholder
-        print("Loading Energy Mix Data...")
+        logger.debug("Loading Energy Mix Data...")
         # Synthetic data examples (current mix %)
         return {"natural_gas_percent": 60,
                 "coal_percent": 5,
@@ -55,7 +71,7 @@ class EnergyResourceModel:
 
     def _load_transition_data(self, config):
         # Placeholder
-        print("Loading Energy Transition Pathway Data...")
+        logger.debug("Loading Energy Transition Pathway Data...")
         # Synthetic data examples
         return {"grid_emission_factor_target_reduction_percent": 30, # Target for 2035
                 "renewable_integration_target_percent_cap": 40, # Target capacity % by 2035
@@ -68,7 +84,7 @@ class EnergyResourceModel:
 
     def _load_governance_data(self, config):
         # Placeholder
-        print("Loading Energy Governance Data...")
+        logger.debug("Loading Energy Governance Data...")
         # Synthetic data examples
         return {"energy_policy_implementation_score": 60, # Scale 0-100
                 "regulatory_reform_effectiveness": "Moderate",
@@ -90,7 +106,7 @@ class EnergyResourceModel:
         Returns:
             Updated state related to energy resources.
         """
-        print(f"Simulating Energy Dynamics for year {year}...")
+        logger.debug("Simulating Energy Dynamics for year %s...", year)
         
         # Placeholder for simulation logic:
         # - Update fossil fuel reserves based on production
@@ -100,10 +116,18 @@ class EnergyResourceModel:
         # - Evaluate impacts of governance measures
         
         # Calculate energy resource outcomes using Bangladesh energy data
-        updated_energy_state = {
-            "renewable_capacity_addition_mw": 150, # Example output
-            "energy_mix_renewable_share_change_percent_points": 0.8,
-            "grid_emission_factor_change": -0.01, # kg CO2/kWh
-            "energy_import_dependency_change_percent_points": 0.2
+        updated_energy_state = self._compute_dynamics(year, state, self.get_parameters())
+        return updated_energy_state
+
+    def _compute_dynamics(self, year, state, params):
+        # Placeholder: renewable capacity additions respond linearly to the subsidy level
+        # (150 MW/yr at the 10% baseline subsidy); mix, emissions and imports follow capacity.
+        subsidy = params["renewable_energy_subsidy_level"]
+        capacity_addition = 100 + 500 * subsidy
+        capacity_ratio = capacity_addition / 150
+        return {
+            "renewable_capacity_addition_mw": capacity_addition, # Example output
+            "energy_mix_renewable_share_change_percent_points": 0.8 * capacity_ratio,
+            "grid_emission_factor_change": -0.01 * capacity_ratio, # kg CO2/kWh
+            "energy_import_dependency_change_percent_points": 0.2 - (subsidy - 0.1)
         }
-        return updated_energy_state 
\ No newline at end of file
@@ -1,5 +1,28 @@
-class ForestResourceModel:
+import logging
+
+from .base import ResourceModel, DataSection
+
+logger = logging.getLogger(__name__)
+
+
+class ForestResourceModel(ResourceModel):
     """Model forest ecosystems, tree cover and woodland dynamics in Bangladesh"""
+    STATE_KEY = 'forest'
+    SIMULATE_METHOD = 'simulate_forest_dynamics'
+    READS = ('climate', 'land')
+    LAGGED_READS = ('community',)
+    PARAMETERS = {
+        "deforestation_multiplier": ("forest", 1.0), # 1.0 = current deforestation pressure
+        "community_forestry_expansion_sqkm_yr": ("forest", 15),
+    }
+
+    DATA_PATH_KEY = 'forest_data'
+    # Data sections, loaded on first access and cached process-wide
+    forest_types = DataSection('_load_forest_types')
+    ecological_processes = DataSection('_load_ecological_processes')
+    management_systems = DataSection('_load_management_systems')
+    deforestation_drivers = DataSection('_load_deforestation_drivers')
+
     def __init__(self, config):
         """
         Initializes the ForestResourceModel.
@@ -8,16 +31,12 @@ class ForestResourceModel:
             config: Configuration object/dictionary containing simulation parameters.
         """
         self.config = config
-        print("Initializing Forest Resource Model...")
-        # Placeholder for loading initial forest data based on config
-        self.forest_types = self._load_forest_types(config)
-        self.ecological_processes = self._load_ecological_processes(config)
-        self.management_systems = self._load_management_systems(config)
-        self.deforestation_drivers = self._load_deforestation_drivers(config)
+        logger.debug("Initializing Forest Resource Model...")
+        # Initial forest data sections are loaded lazily on first access (see DataSection)
 
     def _load_forest_types(self, config):
         # Placeholder
-        print("Loading Forest Type Data...")
+        logger.debug("Loading Forest Type Data...")
         # Synthetic data examples
         return {"sundarbans_health_index": 70, # Scale 0-100
                 "hill_forest_cover_percent_area": 60, # Percent of CHT area
@@ -30,7 +49,7 @@ class ForestResourceModel:
 
     def _load_ecological_processes(self, config):
         # Placeholder
-        print("Loading Forest Ecological Process Data...")
+        logger.debug("Loading Forest Ecological Process Data...")
         # Synthetic data examples
         return {"carbon_sequestration_tC_ha_yr": 2.5, # Average for all forests
                 "biodiversity_support_index": 60, # Scale 0-100
@@ -43,7 +62,7 @@ class ForestResourceModel:
 
     def _load_management_systems(self, config):
         # Placeholder
-        print("Loading Forest Management System Data...")
+        logger.debug("Loading Forest Management System Data...")
         # Synthetic data examples
         return {"protected_area_management_effectiveness_score": 50, # Average PAME score
                 "community_forestry_area_sqkm": 5000,
@@ -56,7 +75,7 @@ class ForestResourceModel:
 
     def _load_deforestation_drivers(self, config):
         # Placeholder
-        print("Loading Deforestation Driver Data...")
+        logger.debug("Loading Deforestation Driver Data...")
         # Synthetic data examples (relative contribution/intensity)
         return {"illegal_logging_intensity_index": 60, # Scale 0-100
                 "fuelwood_extraction_pressure_index": 75,
@@ -78,7 +97,7 @@ class ForestResourceModel:
         Returns:
             Updated state related to forest resources.
         """
-        print(f"Simulating Forest Dynamics for year {year}...")
+        logger.debug("Simulating Forest Dynamics for year %s...", year)
         
         # Placeholder for simulation logic:
         # - Simulate changes in forest cover (deforestation, afforestation, regeneration)
@@ -87,10 +106,17 @@ class ForestResourceModel:
         # - Evaluate effectiveness of different management systems
         
         # Project forest resource outcomes using Bangladesh forestry data
-        updated_forest_state = {
-            "total_forest_cover_change": -20, # Example output (sq km)
+        updated_forest_state = self._compute_dynamics(year, state, self.get_parameters())
+        return updated_forest_state
+
+    def _compute_dynamics(self, year, state, params):
+        # Placeholder: net cover change is gross loss minus community forestry gains,
+        # carbon stock change follows cover change at ~500 tonnes C per sq km.
+        community_forestry = params["community_forestry_expansion_sqkm_yr"]
+        cover_change = -35 * params["deforestation_multiplier"] + community_forestry
+        return {
+            "total_forest_cover_change": cover_change, # Example output (sq km)
             "sundarbans_health_index_change": -0.5, # Example output
-            "carbon_stock_change": -10000, # Example output (tonnes C)
-            "community_forestry_area_increase": 15 # Example output (sq km)
+            "carbon_stock_change": 500 * cover_change, # Example output (tonnes C)
+            "community_forestry_area_increase": community_forestry # Example output (sq km)
         }
-        return updated_forest_state 
\ No newline at end of file
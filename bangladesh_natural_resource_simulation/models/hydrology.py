@@ -0,0 +1,143 @@
+from functools import lru_cache
+
+import numpy as np
+
+from .. import kernels
+
+DAYS_PER_YEAR = 365
+MONTH_DAYS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+# Day-of-year windows (inclusive start, exclusive end)
+MONSOON_WINDOW = (151, 273) # June - September
+BORO_IRRIGATION_WINDOWS = ((0, 120), (334, 365)) # December - April
+
+
+@lru_cache(maxsize=None)
+def time_grid(time_step):
+    """
+    Returns the sub-annual time grid of one year.
+
+    Args:
+        time_step (str): 'monthly' (12 steps) or 'daily' (365 steps).
+
+    Returns:
+        tuple: (day-of-year midpoints, step lengths in days), both float arrays of shape (n_steps,).
+    """
+    if time_step == "daily":
+        step_days = np.ones(DAYS_PER_YEAR)
+    elif time_step == "monthly":
+        step_days = np.array(MONTH_DAYS, dtype=float)
+    else:
+        raise ValueError(f"Unknown sub-annual time step '{time_step}'; expected 'monthly' or 'daily'")
+    edges = np.concatenate(([0.0], np.cumsum(step_days)))
+    midpoints = (edges[:-1] + edges[1:]) / 2
+    midpoints.flags.writeable = False
+    step_days.flags.writeable = False
+    return midpoints, step_days
+
+
+def _window_mask(midpoints, windows):
+    mask = np.zeros(midpoints.shape, dtype=bool)
+    for start, end in windows:
+        mask |= (midpoints >= start) & (midpoints < end)
+    return mask
+
+
+def _spread(annual_total, weights):
+    """Distributes an annual total over the steps in proportion to 'weights' (which sum to > 0)."""
+    return annual_total * (weights / weights.sum())
+
+
+def _days_above(profile, step_days, thresholds):
+    """
+    Number of days on which 'profile' exceeds each threshold, via one sort of the profile
+    and a binary search per threshold instead of a (thresholds x steps) comparison.
+    """
+    order = np.argsort(profile)
+    sorted_profile = profile[order]
+    # Days at or above each sorted position
+    days_from = np.concatenate((np.cumsum(step_days[order][::-1])[::-1], [0.0]))
+    return days_from[np.searchsorted(sorted_profile, thresholds, side='right')]
+
+
+def seasonal_water_balance(time_step, rivers, monsoon_pulse, rainfall, groundwater, haor, flow_multiplier, pumping_multiplier):
+    """
+    Vectorized sub-annual hydrological kernel for one year.
+
+    River flows follow a Gaussian monsoon pulse between dry-season and peak discharge;
+    groundwater integrates rainfall recharge minus consumptive pumping (irrigation concentrated
+    in the Boro season); Haor flooding scales with the driving river's flow above bankfull
+    discharge. The seasonal profiles are evaluated once on the (n_steps,) grid. Scenario
+    forcings enter as non-negative multipliers, so flow statistics, flood extent and flood
+    duration follow from the profiles in closed form; only the groundwater level path is
+    evaluated on a (..., n_steps) array (or in a fused loop with the numba kernel backend).
+    There is no Python loop over steps or scenarios.
+
+    Args:
+        time_step (str): 'monthly' or 'daily'.
+        rivers (dict): River name -> {'dry_m3s', 'peak_m3s', 'bankfull_m3s' (for the Haor driver)}.
+        monsoon_pulse (dict): 'peak_day' (day of year) and 'duration_days' (full width at half maximum).
+        rainfall (dict): 'monsoon_mm' and 'dry_season_mm'.
+        groundwater (dict): 'recharge_mm', 'pumping_mm', 'irrigation_share', 'return_flow_fraction',
+                            'specific_yield'.
+        haor (dict): 'max_area_sqkm' and 'river' (the river driving flooding).
+        flow_multiplier: Scalar or array (>= 0) scaling all river flows (transboundary inflow changes).
+        pumping_multiplier: Scalar or array (>= 0) scaling groundwater pumping.
+
+    Returns:
+        dict: Annual aggregates. Per river: '<river>_mean_flow_m3s', '<river>_min_flow_m3s',
+              '<river>_peak_flow_m3s'; plus 'groundwater_recharge_mm', 'groundwater_level_change'
+              (m, end of year), 'groundwater_min_level_change' (m, deepest point of the year),
+              'haor_peak_flood_area_sqkm' and 'haor_flood_days' (days above half the maximum extent).
+              Values are floats, or arrays shaped like the broadcast multipliers.
+    """
+    midpoints, step_days = time_grid(time_step)
+    flow_multiplier = np.asarray(flow_multiplier, dtype=float)
+    pumping_multiplier = np.asarray(pumping_multiplier, dtype=float)
+    shape = np.broadcast_shapes(flow_multiplier.shape, pumping_multiplier.shape)
+
+    sigma = monsoon_pulse["duration_days"] / (2 * np.sqrt(2 * np.log(2)))
+    pulse = np.exp(-0.5 * ((midpoints - monsoon_pulse["peak_day"]) / sigma) ** 2)
+
+    outputs = {}
+    profiles = {}
+    for name, river in rivers.items():
+        profile = river["dry_m3s"] + (river["peak_m3s"] - river["dry_m3s"]) * pulse
+        profiles[name] = profile
+        outputs[f"{name}_mean_flow_m3s"] = flow_multiplier * (profile @ step_days / DAYS_PER_YEAR)
+        outputs[f"{name}_min_flow_m3s"] = flow_multiplier * profile.min()
+        outputs[f"{name}_peak_flow_m3s"] = flow_multiplier * profile.max()
+
+    # Groundwater: rainfall-proportional recharge minus the consumed part of pumping
+    monsoon = _window_mask(midpoints, (MONSOON_WINDOW,))
+    rain = (_spread(rainfall["monsoon_mm"], step_days * monsoon)
+            + _spread(rainfall["dry_season_mm"], step_days * ~monsoon))
+    recharge = rain * (groundwater["recharge_mm"] / (rainfall["monsoon_mm"] + rainfall["dry_season_mm"]))
+    boro = _window_mask(midpoints, BORO_IRRIGATION_WINDOWS)
+    consumed = (_spread(groundwater["pumping_mm"] * groundwater["irrigation_share"], step_days * boro)
+                + _spread(groundwater["pumping_mm"] * (1 - groundwater["irrigation_share"]), step_days)
+                ) * (1 - groundwater["return_flow_fraction"])
+    to_level = 1 / 1000 / groundwater["specific_yield"] # mm of water -> m of water table
+    cumulative_recharge = np.cumsum(recharge) * to_level
+    cumulative_consumed = np.cumsum(consumed) * to_level
+    outputs["groundwater_recharge_mm"] = np.full(shape, recharge.sum())
+    outputs["groundwater_level_change"] = cumulative_recharge[-1] - pumping_multiplier * cumulative_consumed[-1]
+    loop = kernels.loop_kernel("level_path_minimum")
+    if loop is not None:
+        outputs["groundwater_min_level_change"] = loop(cumulative_recharge, cumulative_consumed, pumping_multiplier.ravel()).reshape(pumping_multiplier.shape)
+    else:
+        level_path = np.multiply.outer(pumping_multiplier, cumulative_consumed)
+        np.subtract(cumulative_recharge, level_path, out=level_path) # In place: one (..., n_steps) buffer
+        outputs["groundwater_min_level_change"] = np.minimum(level_path.min(axis=-1), 0.0)
+
+    # Haor flooding: extent grows linearly from bankfull to design peak discharge
+    driver = rivers[haor["river"]]
+    peak_flow = flow_multiplier * profiles[haor["river"]].max()
+    outputs["haor_peak_flood_area_sqkm"] = haor["max_area_sqkm"] * np.clip(
+        (peak_flow - driver["bankfull_m3s"]) / (driver["peak_m3s"] - driver["bankfull_m3s"]), 0.0, 1.0)
+    half_extent_flow = (driver["bankfull_m3s"] + driver["peak_m3s"]) / 2
+    with np.errstate(divide='ignore'):
+        outputs["haor_flood_days"] = _days_above(profiles[haor["river"]], step_days, half_extent_flow / flow_multiplier)
+
+    return {name: float(value) if np.ndim(value) == 0 else np.broadcast_to(value, shape)
+            for name, value in outputs.items()}
@@ -1,5 +1,38 @@
-class LandResourceModel:
+import logging
+
+import numpy as np
+
+from .base import ResourceModel, DataSection
+from .land_use import LandUseTransitionEngine, LAND_USE_CLASSES
+from ..spatial import indicator
+
+logger = logging.getLogger(__name__)
+
+
+class LandResourceModel(ResourceModel):
     """Model land resources, soil characteristics and land use dynamics in Bangladesh"""
+    STATE_KEY = 'land'
+    SIMULATE_METHOD = 'simulate_land_dynamics'
+    READS = ('climate', 'water')
+    PARAMETERS = {
+        "urban_growth_multiplier": ("land", 1.0), # 1.0 = current settlement expansion
+        "slm_adoption_rate": ("land", 5), # Percent points of area per year
+    }
+
+    # National land-use class shares, shape (1, K) or (n_scenarios, 1, K); on a spatial grid
+    # the per-cell shares are the 'land_use_shares' field instead
+    CHECKPOINT_ATTRIBUTES = ("land_use_shares",)
+    land_use_shares = None
+
+    DATA_PATH_KEY = 'land_data'
+    # Data sections, loaded on first access and cached process-wide
+    land_capability = DataSection('_load_land_capability')
+    soil_processes = DataSection('_load_soil_processes')
+    land_use_patterns = DataSection('_load_land_use_patterns')
+    degradation_processes = DataSection('_load_degradation_processes')
+    sustainable_management = DataSection('_load_slm_data')
+    spatial_parameters = DataSection('_load_spatial_parameters')
+
     def __init__(self, config):
         """
         Initializes the LandResourceModel.
@@ -8,17 +41,13 @@ class LandResourceModel:
             config: Configuration object/dictionary containing simulation parameters.
         """
         self.config = config
-        print("Initializing Land Resource Model...")
-        # Placeholder for loading initial land/soil data based on config
-        self.land_capability = self._load_land_capability(config)
-        self.soil_processes = self._load_soil_processes(config)
-        self.land_use_patterns = self._load_land_use_patterns(config)
-        self.degradation_processes = self._load_degradation_processes(config)
-        self.sustainable_management = self._load_slm_data(config)
+        logger.debug("Initializing Land Resource Model...")
+        # Initial land/soil data sections are loaded lazily on first access (see DataSection)
+        self._transition_engine = None # Built on first use; keeps its transition matrix cache across years
 
     def _load_land_capability(self, config):
         # Placeholder
-        print("Loading Land Capability Data...")
+        logger.debug("Loading Land Capability Data...")
         # Synthetic data examples
         return {"soil_fertility_distribution": {"high_percent": 15, "medium_percent": 45, "low_percent": 40},
                 "land_classification": {"agroecological_zones": 30, "dominant_type": "Floodplain"}, 
@@ -31,14 +60,14 @@ class LandResourceModel:
 
     def _load_soil_processes(self, config):
          # Placeholder for aspects not covered elsewhere (e.g., baseline process rates)
-        print("Loading Soil Process Data...")
+        logger.debug("Loading Soil Process Data...")
         # Synthetic data examples
         return {"organic_matter_avg_percent": 1.2,
                 "infiltration_rate_avg_mm_hr": 15}
         
     def _load_land_use_patterns(self, config):
         # Placeholder
-        print("Loading Land Use Pattern Data...")
+        logger.debug("Loading Land Use Pattern Data...")
         # Synthetic data examples
         return {"agricultural_land_percent_total": 60,
                 "agricultural_conversion_rate_sqkm_yr": 100, 
@@ -48,11 +77,21 @@ class LandResourceModel:
                 "char_land_utilization_percent": 70, # Percent of available char land used
                 "coastal_land_use": {"aquaculture_percent_area": 20, "salinity_affected_percent": 25},
                 "forest_cover_percent_total": 11,
-                "protected_area_land_use_percent_effective_restriction": 40}
+                "protected_area_land_use_percent_effective_restriction": 40,
+                "total_land_area_sqkm": 147570,
+                "land_use_class_shares": {"agriculture": 0.60, "forest": 0.11, "urban": 0.08,
+                                          "aquaculture": 0.04, "wetland": 0.10, "fallow": 0.07},
+                "national_mean_salinity_ppt": 3, # Drives salinity-related conversions without a spatial grid
+                # Annual conversion rates (share of the source class) at reference drivers
+                "transition_base_rates_per_yr": {"agriculture->urban": 3.8e-4, "agriculture->aquaculture": 3.0e-4,
+                                                 "agriculture->fallow": 3.3e-4, "fallow->agriculture": 2.9e-3,
+                                                 "fallow->urban": 3.8e-4, "forest->agriculture": 1.8e-4,
+                                                 "wetland->agriculture": 3.4e-4, "wetland->aquaculture": 3.6e-4,
+                                                 "aquaculture->agriculture": 4.2e-4}}
 
     def _load_degradation_processes(self, config):
         # Placeholder
-        print("Loading Land Degradation Data...")
+        logger.debug("Loading Land Degradation Data...")
         # Synthetic data examples
         return {"erosion_rates_t_ha_yr": {"average": 5, "high_risk_percent_area": 15},
                 "nutrient_depletion_rate_kg_ha_yr": {"N": 20, "P": 5, "K": 10}, # Net depletion
@@ -65,7 +104,7 @@ class LandResourceModel:
 
     def _load_slm_data(self, config):
         # Placeholder for Sustainable Land Management data
-        print("Loading Sustainable Land Management Data...")
+        logger.debug("Loading Sustainable Land Management Data...")
         # Synthetic data examples
         return {"conservation_agriculture_adoption_percent_area": 5,
                 "integrated_soil_fertility_adoption_percent_farmers": 25, 
@@ -76,6 +115,13 @@ class LandResourceModel:
                 "fallow_management_practice": "Limited",
                 "community_land_care_initiatives_count": 200}
 
+    def _load_spatial_parameters(self, config):
+        # Placeholder: land use change settings for the spatial grid
+        logger.debug("Loading Spatial Land Use Parameters...")
+        return {"max_developable_flood_depth_m": 1.0,
+                "crop_salinity_limit_ppt": 8,
+                "crop_flood_depth_limit_m": 1.0}
+
     def simulate_land_dynamics(self, year, state):
         """
         Simulates one time step for land resource dynamics.
@@ -87,7 +133,7 @@ class LandResourceModel:
         Returns:
             Updated state related to land resources.
         """
-        print(f"Simulating Land Dynamics for year {year}...")
+        logger.debug("Simulating Land Dynamics for year %s...", year)
         
         # Placeholder for simulation logic:
         # - Simulate land use changes based on drivers (urbanization, policy, climate)
@@ -96,10 +142,85 @@ class LandResourceModel:
         # - Assess effectiveness of sustainable land management practices
         
         # Calculate land resource outcomes using Bangladesh soil and land use data
-        updated_land_state = {
-            "agricultural_land_area_change": -50, # Example output (sq km)
-            "average_soil_organic_matter_change": -0.01, # Example output (%)
-            "urban_area_expansion": 20, # Example output (sq km)
-            "slm_coverage_increase": 5 # Example output (% points)
+        updated_land_state = self._compute_dynamics(year, state, self.get_parameters())
+        return updated_land_state
+
+    def _compute_dynamics(self, year, state, params):
+        # Land use changes follow the Markov transition engine (urbanization, salinity and policy
+        # drivers); sustainable land management (SLM) slows soil organic matter decline.
+        slm_rate = params["slm_adoption_rate"]
+        if self._transition_engine is None:
+            self._transition_engine = LandUseTransitionEngine(self.land_use_patterns["transition_base_rates_per_yr"])
+        rates = self._transition_engine.rate_table(params["urban_growth_multiplier"], slm_rate)
+        if self.spatial is not None:
+            cell_area = self.spatial.grid.attributes["area_sqkm"]
+            before, after, spatial_outputs = self._spatial_dynamics(rates)
+        else:
+            cell_area = np.array([self.land_use_patterns["total_land_area_sqkm"]], dtype=float)
+            before, after = self._national_dynamics(rates)
+            spatial_outputs = {}
+        area_before = (before * cell_area[:, None]).sum(axis=-2)
+        area_after = (after * cell_area[:, None]).sum(axis=-2)
+        agriculture, urban = LAND_USE_CLASSES.index("agriculture"), LAND_USE_CLASSES.index("urban")
+
+        outputs = {
+            "agricultural_land_area_change": indicator(area_after[..., agriculture] - area_before[..., agriculture]), # sq km
+            "average_soil_organic_matter_change": -0.01 + 0.002 * (slm_rate - 5), # Example output (%)
+            "urban_area_expansion": indicator(area_after[..., urban] - area_before[..., urban]), # sq km
+            "slm_coverage_increase": slm_rate # Example output (% points)
+        }
+        for k, name in enumerate(LAND_USE_CLASSES):
+            outputs[f"{name}_land_area_sqkm"] = indicator(area_after[..., k])
+        outputs.update(spatial_outputs)
+        return outputs
+
+    def _national_dynamics(self, rates):
+        """Advances the national land-use shares (a single cell) one year; returns (before, after)."""
+        before = self.land_use_shares
+        if before is None:
+            class_shares = self.land_use_patterns["land_use_class_shares"]
+            before = np.array([[class_shares[name] for name in LAND_USE_CLASSES]])
+        drivers = self._transition_engine.driver_classes(
+            before[..., LAND_USE_CLASSES.index("urban")], self.land_use_patterns["national_mean_salinity_ppt"], True)
+        self.land_use_shares = self._transition_engine.step(before, drivers, rates)
+        return before, self.land_use_shares
+
+    def _initial_cell_shares(self, grid):
+        """Per-cell class shares: the grid's urban fraction, the rest split in national proportions."""
+        class_shares = self.land_use_patterns["land_use_class_shares"]
+        national = np.array([class_shares[name] for name in LAND_USE_CLASSES])
+        urban_index = LAND_USE_CLASSES.index("urban")
+        urban = grid.attributes.get("urban_fraction", np.full(grid.n_cells, national[urban_index]))
+        rural = np.delete(national, urban_index)
+        shares = np.insert(np.outer(1 - urban, rural / rural.sum()), urban_index, urban, axis=1)
+        return shares
+
+    def _spatial_dynamics(self, rates):
+        """
+        Applies the transition engine to every cell's 'land_use_shares' (urbanization pressure
+        from the neighbors' urban share, salinity from climate, flood depth from water blocking
+        development), then reports cropland constrained by this year's salinity and flooding.
+
+        Returns:
+            tuple: (shares before, shares after, spatial outputs).
+        """
+        grid = self.spatial.grid
+        spatial = self.spatial_parameters
+        before = self.spatial.read(self, "land_use_shares")
+        if before is None:
+            before = self._initial_cell_shares(grid)
+        salinity = self.spatial.read(self, "soil_salinity_ppt", 0.0)
+        flood_depth = self.spatial.read(self, "flood_depth_m", 0.0)
+
+        engine = self._transition_engine
+        pressure = grid.neighbor_mean(before[..., LAND_USE_CLASSES.index("urban")])
+        drivers = engine.driver_classes(pressure, salinity, flood_depth < spatial["max_developable_flood_depth_m"])
+        after = engine.step(before, drivers, rates)
+        self.spatial.write(self, "land_use_shares", after)
+
+        cropland = after[..., LAND_USE_CLASSES.index("agriculture")]
+        return before, after, {
+            "urban_area_sqkm": indicator(grid.total_area(after[..., LAND_USE_CLASSES.index("urban")])),
+            "salinity_constrained_cropland_sqkm": indicator(grid.total_area(cropland * (salinity > spatial["crop_salinity_limit_ppt"]))),
+            "flood_affected_cropland_sqkm": indicator(grid.total_area(cropland * (flood_depth > spatial["crop_flood_depth_limit_m"]))),
         }
-        return updated_land_state 
\ No newline at end of file
@@ -0,0 +1,194 @@
+import hashlib
+
+import numpy as np
+
+LAND_USE_CLASSES = ("agriculture", "forest", "urban", "aquaculture", "wetland", "fallow")
+
+# Conversions that can occur (from class, to class); all other class changes have zero rate
+TRANSITIONS = (
+    ("agriculture", "urban"), ("agriculture", "aquaculture"), ("agriculture", "fallow"),
+    ("fallow", "agriculture"), ("fallow", "urban"), ("forest", "agriculture"),
+    ("wetland", "agriculture"), ("wetland", "aquaculture"), ("aquaculture", "agriculture"),
+)
+
+# Driver discretization: rates are evaluated per driver class, so transition matrices only
+# change when a cell moves between classes
+SALINITY_CLASS_EDGES_PPT = (2, 4, 8, 16)
+SALINITY_CLASS_CENTERS_PPT = (1, 3, 6, 12, 20)
+URBAN_PRESSURE_CLASSES = 10
+
+
+class LandUseTransitionEngine:
+    """Markov land-use transitions for all cells and scenarios at once, applied as one sparse matrix"""
+    def __init__(self, base_rates):
+        """
+        Initializes the LandUseTransitionEngine.
+
+        Args:
+            base_rates (dict): "<from>-><to>" -> annual conversion rate (share of the 'from' class)
+                               at reference drivers, for every entry of TRANSITIONS.
+        """
+        self.classes = LAND_USE_CLASSES
+        self.n_classes = len(self.classes)
+        index = {name: i for i, name in enumerate(self.classes)}
+        self.from_class = np.array([index[a] for a, _ in TRANSITIONS])
+        self.to_class = np.array([index[b] for _, b in TRANSITIONS])
+        self.base_rates = np.array([base_rates[f"{a}->{b}"] for a, b in TRANSITIONS], dtype=float)
+        self.n_driver_classes = len(SALINITY_CLASS_CENTERS_PPT) * URBAN_PRESSURE_CLASSES * 2
+
+        self._structure = None # (n_units, CSR matrix with placeholder data, CSR positions of the data)
+        self._matrix_key = None # (n_units, rate table shape, rate table digest) of the cached matrix
+        self._matrix = None
+        self._driver_class = None
+        self.matrix_builds = 0
+        self.matrix_updates = 0
+        self.matrix_reuses = 0
+
+    def driver_classes(self, urban_pressure, salinity_ppt, developable):
+        """
+        Discretizes per-cell drivers into driver class ids.
+
+        Args:
+            urban_pressure: Urban share around each cell, in [0, 1].
+            salinity_ppt: Soil salinity of each cell.
+            developable: Boolean, False where flooding rules out new settlement.
+
+        Returns:
+            np.ndarray: int16 class ids, broadcast over the inputs' shapes.
+        """
+        salinity_class = np.searchsorted(SALINITY_CLASS_EDGES_PPT, salinity_ppt, side='right')
+        pressure_class = np.clip((np.asarray(urban_pressure) * URBAN_PRESSURE_CLASSES).astype(int), 0, URBAN_PRESSURE_CLASSES - 1)
+        return ((salinity_class * URBAN_PRESSURE_CLASSES + pressure_class) * 2
+                + np.asarray(developable, dtype=int)).astype(np.int16)
+
+    def rate_table(self, urban_growth_multiplier, slm_adoption_rate):
+        """
+        Annual conversion rates of every transition for every driver class.
+
+        Args:
+            urban_growth_multiplier: Scalar or (n_scenarios,) policy parameter.
+            slm_adoption_rate: Scalar or (n_scenarios,) policy parameter (percent points per year).
+
+        Returns:
+            np.ndarray: Shape (..., n_driver_classes, n_transitions).
+        """
+        driver = np.arange(self.n_driver_classes)
+        developable = (driver % 2).astype(float)
+        pressure = ((driver // 2) % URBAN_PRESSURE_CLASSES + 0.5) / URBAN_PRESSURE_CLASSES
+        salinity = np.array(SALINITY_CLASS_CENTERS_PPT, dtype=float)[driver // (2 * URBAN_PRESSURE_CLASSES)]
+        stress = np.clip(salinity / 8, 0, 2) # Salinity stress relative to the crop tolerance limit
+
+        urban_growth = np.asarray(urban_growth_multiplier, dtype=float)[..., None]
+        slm = np.asarray(slm_adoption_rate, dtype=float)[..., None]
+        urbanization = urban_growth * (0.5 + 2 * pressure) * developable
+        factors = {
+            ("agriculture", "urban"): urbanization,
+            ("agriculture", "aquaculture"): stress,
+            ("agriculture", "fallow"): (1 + stress) * np.clip(1 - 0.05 * (slm - 5), 0, None),
+            ("fallow", "agriculture"): slm / 5 * np.ones_like(stress),
+            ("fallow", "urban"): urbanization,
+            ("forest", "agriculture"): np.ones_like(stress),
+            ("wetland", "agriculture"): np.ones_like(stress),
+            ("wetland", "aquaculture"): stress,
+            ("aquaculture", "agriculture"): np.clip(1 - stress / 2, 0, None),
+        }
+        shape = np.broadcast_shapes(urban_growth.shape, slm.shape, driver.shape)
+        table = np.stack([np.broadcast_to(factors[transition], shape) for transition in TRANSITIONS], axis=-1)
+        return table * self.base_rates
+
+    def _matrix_structure(self, n_units):
+        """
+        Sparsity pattern of the block-diagonal (n_units * K) x (n_units * K) transition matrix
+        (row = destination class, column = source class of the same unit). It depends only on
+        the number of units, so it is built once and only its data are replaced afterwards.
+
+        Returns:
+            tuple: (CSR matrix with placeholder data, CSR position of each entry of the flat
+                   [conversions (n_units, n_transitions), stays (n_units, K)] data vector).
+        """
+        if self._structure is None or self._structure[0] != n_units:
+            from scipy import sparse # Deferred: importing scipy.sparse dominates the package's import time
+
+            k = self.n_classes
+            offsets = np.arange(n_units)[:, None] * k
+            rows = np.concatenate(((offsets + self.to_class).ravel(), (offsets + np.arange(k)).ravel()))
+            cols = np.concatenate(((offsets + self.from_class).ravel(), (offsets + np.arange(k)).ravel()))
+            # Data = position in the flat vector, so the CSR data order reveals the permutation
+            matrix = sparse.csr_matrix((np.arange(len(rows), dtype=float), (rows, cols)), shape=(n_units * k, n_units * k))
+            position = np.empty(len(rows), dtype=np.intp)
+            position[matrix.data.astype(np.intp)] = np.arange(len(rows))
+            self._structure = (n_units, matrix, position)
+        return self._structure[1:]
+
+    def _column_data(self, driver_class, rate_table):
+        """Conversion rates (n, n_transitions) and stay probabilities (n, K) of the given units."""
+        rates = rate_table[driver_class]
+        # Cap total outflow of each class at 1 so every column stays a probability distribution
+        outflow = np.zeros((len(driver_class), self.n_classes))
+        for transition, source in enumerate(self.from_class):
+            outflow[:, source] += rates[:, transition]
+        scale = np.where(outflow > 1, 1 / np.maximum(outflow, 1e-12), 1.0)
+        return rates * scale[:, self.from_class], 1 - np.minimum(outflow, 1)
+
+    def transition_matrix(self, driver_class, rate_table):
+        """
+        Returns the sparse transition matrix for all units. While the rates are unchanged the
+        previous matrix is reused: as is when no unit changed driver class (typically across
+        most years), otherwise with only the changed units' entries rewritten.
+
+        Args:
+            driver_class (np.ndarray): Row of 'rate_table' for each unit, shape (n_units,).
+            rate_table (np.ndarray): Rates of shape (n_rows, n_transitions).
+        """
+        n_units = len(driver_class)
+        matrix, position = self._matrix_structure(n_units)
+        digest = hashlib.blake2b(np.ascontiguousarray(rate_table).tobytes(), digest_size=16).digest()
+        key = (n_units, rate_table.shape, digest)
+        if key == self._matrix_key:
+            changed = np.flatnonzero(driver_class != self._driver_class)
+            if len(changed) == 0:
+                self.matrix_reuses += 1
+                return self._matrix
+            if len(changed) < n_units // 2:
+                rates, stays = self._column_data(driver_class[changed], rate_table)
+                n_transitions = len(self.from_class)
+                rate_index = (changed[:, None] * n_transitions + np.arange(n_transitions)).ravel()
+                stay_index = n_units * n_transitions + (changed[:, None] * self.n_classes + np.arange(self.n_classes)).ravel()
+                self._matrix.data[position[rate_index]] = rates.ravel()
+                self._matrix.data[position[stay_index]] = stays.ravel()
+                self._driver_class = driver_class.copy()
+                self.matrix_updates += 1
+                return self._matrix
+
+        rates, stays = self._column_data(driver_class, rate_table)
+        flat = np.concatenate((rates.ravel(), stays.ravel()))
+        self._matrix = matrix.copy()
+        self._matrix.data[position] = flat
+        self._matrix_key, self._driver_class = key, driver_class.copy()
+        self.matrix_builds += 1
+        return self._matrix
+
+    def step(self, shares, driver_class, rate_table):
+        """
+        Advances land-use shares by one year.
+
+        Args:
+            shares (np.ndarray): Class shares of shape (n_cells, K) or, for batched scenarios,
+                                 (n_scenarios, n_cells, K).
+            driver_class (np.ndarray): Driver class ids of shape (n_cells,) or (n_scenarios, n_cells).
+            rate_table (np.ndarray): From rate_table(); (n_driver_classes, n_transitions), or
+                                     (n_scenarios, n_driver_classes, n_transitions) for batched policies.
+
+        Returns:
+            np.ndarray: New shares of shape (n_cells, K) or (n_scenarios, n_cells, K).
+        """
+        unit_shape = np.broadcast_shapes(shares.shape[:-1], np.shape(driver_class), rate_table.shape[:-2] + (1,))
+        shares = np.broadcast_to(shares, unit_shape + (self.n_classes,))
+        driver_class = np.broadcast_to(driver_class, unit_shape).ravel()
+        if rate_table.ndim == 3:
+            # One rate table per scenario: stack them and offset each scenario's driver classes
+            scenario = np.repeat(np.arange(len(rate_table)), unit_shape[-1])
+            driver_class = scenario * self.n_driver_classes + driver_class
+            rate_table = rate_table.reshape(-1, rate_table.shape[-1])
+        matrix = self.transition_matrix(driver_class, rate_table)
+        return (matrix @ shares.reshape(-1)).reshape(shares.shape)
@@ -1,5 +1,26 @@
-class MarineResourceModel:
+import logging
+
+from .base import ResourceModel, DataSection
+
+logger = logging.getLogger(__name__)
+
+
+class MarineResourceModel(ResourceModel):
     """Model ocean resources, coastal ecosystems and blue economy in Bangladesh"""
+    STATE_KEY = 'marine'
+    SIMULATE_METHOD = 'simulate_marine_dynamics'
+    READS = ('climate', 'water')
+    PARAMETERS = {
+        "fishing_effort_multiplier": ("marine", 1.0), # 1.0 = current fishing effort
+        "hilsa_regulation_compliance_percent": ("marine", 50),
+    }
+
+    # Data sections, loaded on first access and cached process-wide
+    fishery_resources = DataSection('_load_fishery_data')
+    coastal_ecosystems = DataSection('_load_coastal_ecosystem_data')
+    maritime_industries = DataSection('_load_maritime_industry_data')
+    integrated_management = DataSection('_load_coastal_management_data')
+
     def __init__(self, config):
         """
         Initializes the MarineResourceModel.
@@ -8,16 +29,12 @@ class MarineResourceModel:
             config: Configuration object/dictionary containing simulation parameters.
         """
         self.config = config
-        print("Initializing Marine Resource Model...")
-        # Placeholder for loading initial marine data based on config
-        self.fishery_resources = self._load_fishery_data(config)
-        self.coastal_ecosystems = self._load_coastal_ecosystem_data(config)
-        self.maritime_industries = self._load_maritime_industry_data(config)
-        self.integrated_management = self._load_coastal_management_data(config)
+        logger.debug("Initializing Marine Resource Model...")
+        # Initial marine data sections are loaded lazily on first access (see DataSection)
 
     def _load_fishery_data(self, config):
         # Placeholder
-        print("Loading Marine Fishery Data...")
+        logger.debug("Loading Marine Fishery Data...")
         # Synthetic data examples
         return {"offshore_fish_stock_status": {"demersal": "Overexploited", "pelagic": "Moderately Exploited"},
                 "artisanal_fishing_intensity_boats_count": 60000,
@@ -30,7 +47,7 @@ class MarineResourceModel:
 
     def _load_coastal_ecosystem_data(self, config):
         # Placeholder
-        print("Loading Coastal Ecosystem Data...")
+        logger.debug("Loading Coastal Ecosystem Data...")
         # Synthetic data examples
         return {"mangrove_forest_health_sundarbans_index": 70,
                 "seagrass_bed_distribution_area_sqkm": 100,
@@ -43,7 +60,7 @@ class MarineResourceModel:
 
     def _load_maritime_industry_data(self, config):
         # Placeholder
-        print("Loading Maritime Industry Data...")
+        logger.debug("Loading Maritime Industry Data...")
         # Synthetic data examples
         return {"marine_transport_activity_port_throughput_teu_yr": 4e6, # Twenty-foot Equivalent Units
                 "shipbuilding_breaking_capacity_gt_yr": 2e6, # Gross Tonnage
@@ -56,7 +73,7 @@ class MarineResourceModel:
 
     def _load_coastal_management_data(self, config):
         # Placeholder
-        print("Loading Coastal Zone Management Data...")
+        logger.debug("Loading Coastal Zone Management Data...")
         # Synthetic data examples
         return {"coastal_embankment_functionality_percent_effective": 60,
                 "shoreline_change_monitoring_coverage_percent": 70,
@@ -78,7 +95,7 @@ class MarineResourceModel:
         Returns:
             Updated state related to marine resources.
         """
-        print(f"Simulating Marine Dynamics for year {year}...")
+        logger.debug("Simulating Marine Dynamics for year %s...", year)
         
         # Placeholder for simulation logic:
         # - Update fish stocks based on fishing pressure, climate impacts, management
@@ -87,10 +104,17 @@ class MarineResourceModel:
         # - Assess effectiveness of coastal management interventions (embankments, adaptation)
         
         # Project marine resource outcomes using Bangladesh coastal and ocean data
-        updated_marine_state = {
-            "hilsa_catch_sustainability_index_change": -1.5, # Example output
+        updated_marine_state = self._compute_dynamics(year, state, self.get_parameters())
+        return updated_marine_state
+
+    def _compute_dynamics(self, year, state, params):
+        # Placeholder: Hilsa sustainability declines with fishing effort and improves with
+        # compliance to harvest regulations (e.g. seasonal bans).
+        effort = params["fishing_effort_multiplier"]
+        compliance = params["hilsa_regulation_compliance_percent"]
+        return {
+            "hilsa_catch_sustainability_index_change": -1.5 * effort + 0.06 * (compliance - 50), # Example output
             "mangrove_area_change_sqkm": -10,
-            "blue_economy_contribution_gdp_change_percent": 0.1,
+            "blue_economy_contribution_gdp_change_percent": 0.1 * effort,
             "coastal_vulnerability_index_change": 0.5 # Increasing vulnerability
         }
-        return updated_marine_state 
\ No newline at end of file
@@ -1,5 +1,25 @@
-class MineralResourceModel:
+import logging
+
+from .base import ResourceModel, DataSection
+
+logger = logging.getLogger(__name__)
+
+
+class MineralResourceModel(ResourceModel):
     """Model mineral deposits, extraction patterns and management in Bangladesh"""
+    STATE_KEY = 'mineral'
+    SIMULATE_METHOD = 'simulate_mineral_dynamics'
+    LAGGED_READS = ('governance',)
+    PARAMETERS = {
+        "extraction_multiplier": ("mineral", 1.0), # 1.0 = current gas and coal extraction
+    }
+
+    # Data sections, loaded on first access and cached process-wide
+    resource_assessment = DataSection('_load_assessment_data')
+    extraction_activities = DataSection('_load_extraction_data')
+    environmental_impacts = DataSection('_load_impact_data')
+    governance_approaches = DataSection('_load_governance_data')
+
     def __init__(self, config):
         """
         Initializes the MineralResourceModel.
@@ -8,16 +28,12 @@ class MineralResourceModel:
             config: Configuration object/dictionary containing simulation parameters.
         """
         self.config = config
-        print("Initializing Mineral Resource Model...")
-        # Placeholder for loading initial mineral data based on config
-        self.resource_assessment = self._load_assessment_data(config)
-        self.extraction_activities = self._load_extraction_data(config)
-        self.environmental_impacts = self._load_impact_data(config)
-        self.governance_approaches = self._load_governance_data(config)
+        logger.debug("Initializing Mineral Resource Model...")
+        # Initial mineral data sections are loaded lazily on first access (see DataSection)
 
     def _load_assessment_data(self, config):
         # Placeholder
-        print("Loading Mineral Resource Assessment Data...")
+        logger.debug("Loading Mineral Resource Assessment Data...")
         # Synthetic data examples
         return {"natural_gas_reserves_tcf": 10.5, # Trillion Cubic Feet (remaining proven + probable)
                 "coal_deposits_mt": 1200, # Million Tonnes (estimated)
@@ -30,7 +46,7 @@ class MineralResourceModel:
 
     def _load_extraction_data(self, config):
         # Placeholder
-        print("Loading Mineral Extraction Activity Data...")
+        logger.debug("Loading Mineral Extraction Activity Data...")
         # Synthetic data examples
         return {"natural_gas_production_bcf_yr": 900, # Billion Cubic Feet per year
                 "coal_mining_volume_mt_yr": 1.5, # Million Tonnes per year
@@ -43,7 +59,7 @@ class MineralResourceModel:
 
     def _load_impact_data(self, config):
         # Placeholder
-        print("Loading Environmental Impact Data (Minerals)...")
+        logger.debug("Loading Environmental Impact Data (Minerals)...")
         # Synthetic data examples
         return {"site_rehabilitation_status_percent_completed": 10,
                 "water_quality_protection_compliance_percent": 40,
@@ -56,7 +72,7 @@ class MineralResourceModel:
 
     def _load_governance_data(self, config):
         # Placeholder
-        print("Loading Extractive Sector Governance Data...")
+        logger.debug("Loading Extractive Sector Governance Data...")
         # Synthetic data examples
         return {"licensing_process_transparency_index": 45, # Scale 0-100
                 "revenue_transparency_eiti_compliance": "Partial", # Extractive Industries Transparency Initiative
@@ -78,7 +94,7 @@ class MineralResourceModel:
         Returns:
             Updated state related to mineral resources.
         """
-        print(f"Simulating Mineral Dynamics for year {year}...")
+        logger.debug("Simulating Mineral Dynamics for year %s...", year)
         
         # Placeholder for simulation logic:
         # - Update resource reserves based on extraction rates
@@ -87,10 +103,15 @@ class MineralResourceModel:
         # - Assess governance factors (e.g., compliance, benefit sharing)
         
         # Project mineral resource outcomes using Bangladesh geological data
-        updated_mineral_state = {
-            "natural_gas_reserve_depletion_rate": 0.05, # Example output (% per year)
-            "coal_production_change": 100000, # Example output (tonnes)
+        updated_mineral_state = self._compute_dynamics(year, state, self.get_parameters())
+        return updated_mineral_state
+
+    def _compute_dynamics(self, year, state, params):
+        # Placeholder: depletion, production and benefit-sharing funds scale with extraction
+        extraction = params["extraction_multiplier"]
+        return {
+            "natural_gas_reserve_depletion_rate": 0.05 * extraction, # Example output (% per year)
+            "coal_production_change": 100000 * extraction, # Example output (tonnes)
             "environmental_compliance_score": 65, # Example output
-            "local_benefit_sharing_funds_disbursed": 500000 # Example output (USD equivalent)
+            "local_benefit_sharing_funds_disbursed": 500000 * extraction # Example output (USD equivalent)
         }
-        return updated_mineral_state 
\ No newline at end of file
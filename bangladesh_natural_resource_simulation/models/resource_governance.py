@@ -1,5 +1,25 @@
-class ResourceGovernanceModel:
+import logging
+
+from .base import ResourceModel, DataSection
+
+logger = logging.getLogger(__name__)
+
+
+class ResourceGovernanceModel(ResourceModel):
     """Model policy frameworks and governance systems for Bangladesh natural resources"""
+    STATE_KEY = 'governance'
+    SIMULATE_METHOD = 'simulate_governance_dynamics'
+    READS = ('water', 'land', 'forest', 'marine', 'community')
+    PARAMETERS = {
+        "enforcement_effort_multiplier": ("governance", 1.0), # 1.0 = current enforcement effort
+    }
+
+    # Data sections, loaded on first access and cached process-wide
+    institutional_arrangements = DataSection('_load_institutional_data')
+    policy_frameworks = DataSection('_load_policy_data')
+    stakeholder_engagement = DataSection('_load_participatory_data')
+    compliance_mechanisms = DataSection('_load_compliance_data')
+
     def __init__(self, config):
         """
         Initializes the ResourceGovernanceModel.
@@ -8,16 +28,12 @@ class ResourceGovernanceModel:
             config: Configuration object/dictionary containing simulation parameters.
         """
         self.config = config
-        print("Initializing Resource Governance Model...")
-        # Placeholder for loading initial governance data based on config
-        self.institutional_arrangements = self._load_institutional_data(config)
-        self.policy_frameworks = self._load_policy_data(config)
-        self.stakeholder_engagement = self._load_participatory_data(config)
-        self.compliance_mechanisms = self._load_compliance_data(config)
+        logger.debug("Initializing Resource Governance Model...")
+        # Initial governance data sections are loaded lazily on first access (see DataSection)
 
     def _load_institutional_data(self, config):
         # Placeholder
-        print("Loading Institutional Framework Data...")
+        logger.debug("Loading Institutional Framework Data...")
         # Synthetic data examples (effectiveness indices 0-100)
         return {"moefcc_capacity_index": 60, # Ministry of Environment, Forest and Climate Change
                 "forest_department_effectiveness_index": 55,
@@ -30,7 +46,7 @@ class ResourceGovernanceModel:
 
     def _load_policy_data(self, config):
         # Placeholder
-        print("Loading Policy and Legal Instrument Data...")
+        logger.debug("Loading Policy and Legal Instrument Data...")
         # Synthetic data examples (implementation status/effectiveness)
         return {"environmental_policy_implementation_status": "Partially Implemented",
                 "forest_policy_application_effectiveness": "Moderate",
@@ -43,7 +59,7 @@ class ResourceGovernanceModel:
 
     def _load_participatory_data(self, config):
         # Placeholder
-        print("Loading Participatory Governance Data...")
+        logger.debug("Loading Participatory Governance Data...")
         # Synthetic data examples
         return {"community_based_nrm_effectiveness_index": 65, # NRM = Natural Resource Management
                 "co_management_arrangement_functionality": "Variable, depends on location",
@@ -56,7 +72,7 @@ class ResourceGovernanceModel:
 
     def _load_compliance_data(self, config):
         # Placeholder
-        print("Loading Compliance and Enforcement Data...")
+        logger.debug("Loading Compliance and Enforcement Data...")
         # Synthetic data examples
         return {"eia_effectiveness_score": 55, # Environmental Impact Assessment
                 "protected_area_enforcement_level": "Understaffed, moderate effectiveness",
@@ -79,7 +95,7 @@ class ResourceGovernanceModel:
         Returns:
             Updated state related to resource governance.
         """
-        print(f"Simulating Resource Governance Dynamics for year {year}...")
+        logger.debug("Simulating Resource Governance Dynamics for year %s...", year)
         
         # Placeholder for simulation logic:
         # - Model changes in institutional capacity based on funding, reforms
@@ -90,10 +106,15 @@ class ResourceGovernanceModel:
         #   enforcement reduces illegal logging)
 
         # Project governance effectiveness using Bangladesh resource management data
-        updated_governance_state = {
-            "overall_governance_effectiveness_index_change": 0.2, # Slight improvement
-            "policy_implementation_gap_change_percent_points": -0.5, # Gap slightly narrowing
-            "compliance_rate_change_percent_points": 0.3,
+        updated_governance_state = self._compute_dynamics(year, state, self.get_parameters())
+        return updated_governance_state
+
+    def _compute_dynamics(self, year, state, params):
+        # Placeholder: compliance and policy implementation improve with enforcement effort
+        enforcement = params["enforcement_effort_multiplier"]
+        return {
+            "overall_governance_effectiveness_index_change": 0.2 * enforcement, # Slight improvement
+            "policy_implementation_gap_change_percent_points": -0.5 * enforcement, # Gap slightly narrowing
+            "compliance_rate_change_percent_points": 0.3 * enforcement,
             "participatory_governance_score_change": 0.1
         }
-        return updated_governance_state 
\ No newline at end of file
@@ -1,5 +1,27 @@
-class SustainableUseModel:
+import logging
+
+from .base import ResourceModel, DataSection
+
+logger = logging.getLogger(__name__)
+
+
+class SustainableUseModel(ResourceModel):
     """Model sustainable resource use, green growth and circular approaches in Bangladesh"""
+    STATE_KEY = 'sustainable_use'
+    SIMULATE_METHOD = 'simulate_sustainability_dynamics'
+    READS = ('water', 'land', 'energy', 'mineral')
+    LAGGED_READS = ('governance',)
+    PARAMETERS = {
+        "green_technology_investment_multiplier": ("sustainable_use", 1.0), # 1.0 = current investment
+    }
+
+    # Data sections, loaded on first access and cached process-wide
+    consumption_patterns = DataSection('_load_consumption_data')
+    efficiency_measures = DataSection('_load_efficiency_data')
+    value_addition = DataSection('_load_value_chain_data')
+    circular_approaches = DataSection('_load_circular_data')
+    green_technology = DataSection('_load_green_tech_data')
+
     def __init__(self, config):
         """
         Initializes the SustainableUseModel.
@@ -8,17 +30,12 @@ class SustainableUseModel:
             config: Configuration object/dictionary containing simulation parameters.
         """
         self.config = config
-        print("Initializing Sustainable Use Model...")
-        # Placeholder for loading initial sustainability data based on config
-        self.consumption_patterns = self._load_consumption_data(config)
-        self.efficiency_measures = self._load_efficiency_data(config)
-        self.value_addition = self._load_value_chain_data(config)
-        self.circular_approaches = self._load_circular_data(config)
-        self.green_technology = self._load_green_tech_data(config)
+        logger.debug("Initializing Sustainable Use Model...")
+        # Initial sustainability data sections are loaded lazily on first access (see DataSection)
 
     def _load_consumption_data(self, config):
         # Placeholder for overall consumption patterns, perhaps linked to other models
-        print("Loading Consumption Pattern Data...")
+        logger.debug("Loading Consumption Pattern Data...")
         # Synthetic data examples
         return {"per_capita_water_consumption_lpcd": 150, # Liters per capita per day (total)
                 "per_capita_energy_consumption_kwh_yr": 550,
@@ -27,7 +44,7 @@ class SustainableUseModel:
 
     def _load_efficiency_data(self, config):
         # Placeholder
-        print("Loading Resource Use Efficiency Data...")
+        logger.debug("Loading Resource Use Efficiency Data...")
         # Synthetic data examples
         return {"water_productivity_usd_per_m3": 2.5, # GDP per cubic meter of water used
                 "energy_efficiency_gdp_per_koe": 7.0, # GDP per kg of oil equivalent energy
@@ -40,7 +57,7 @@ class SustainableUseModel:
 
     def _load_value_chain_data(self, config):
         # Placeholder
-        print("Loading Value Chain Sustainability Data...")
+        logger.debug("Loading Value Chain Sustainability Data...")
         # Synthetic data examples
         return {"sustainable_sourcing_practice_adoption_percent_firms": 20,
                 "processing_efficiency_improvement_rate_percent_yr": 1.2,
@@ -53,7 +70,7 @@ class SustainableUseModel:
 
     def _load_circular_data(self, config):
         # Placeholder
-        print("Loading Circular Economy Approach Data...")
+        logger.debug("Loading Circular Economy Approach Data...")
         # Synthetic data examples
         return {"waste_recovery_recycling_rate_percent_msw": 15, # Municipal Solid Waste
                 "industrial_symbiosis_projects_count": 10,
@@ -66,7 +83,7 @@ class SustainableUseModel:
 
     def _load_green_tech_data(self, config):
         # Placeholder
-        print("Loading Green Technology and Innovation Data...")
+        logger.debug("Loading Green Technology and Innovation Data...")
         # Synthetic data examples
         return {"cleaner_production_technology_adoption_percent_industry": 25,
                 "resource_efficient_equipment_market_share_percent": 15,
@@ -89,7 +106,7 @@ class SustainableUseModel:
         Returns:
             Updated state related to sustainable utilization.
         """
-        print(f"Simulating Sustainability Dynamics for year {year}...")
+        logger.debug("Simulating Sustainability Dynamics for year %s...", year)
         
         # Placeholder for simulation logic:
         # - Model changes in resource efficiency based on technology adoption, policy
@@ -99,10 +116,15 @@ class SustainableUseModel:
         # - Link sustainability performance to economic indicators and resource depletion rates
 
         # Project sustainable utilization using Bangladesh resource efficiency data
-        updated_sustainability_state = {
-            "overall_resource_efficiency_index_change": 0.25,
+        updated_sustainability_state = self._compute_dynamics(year, state, self.get_parameters())
+        return updated_sustainability_state
+
+    def _compute_dynamics(self, year, state, params):
+        # Placeholder: green technology uptake and resulting efficiency gains scale with investment
+        investment = params["green_technology_investment_multiplier"]
+        return {
+            "overall_resource_efficiency_index_change": 0.25 * investment,
             "circular_economy_indicator_score_change": 0.3,
-            "green_technology_adoption_rate_change": 0.5, # % point change
+            "green_technology_adoption_rate_change": 0.5 * investment, # % point change
             "value_chain_sustainability_index_change": 0.2
         }
-        return updated_sustainability_state 
\ No newline at end of file
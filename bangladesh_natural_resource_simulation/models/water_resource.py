@@ -1,5 +1,38 @@
-class WaterResourceModel:
+import logging
+
+import numpy as np
+
+from .base import ResourceModel, DataSection
+from .hydrology import seasonal_water_balance
+from ..spatial import indicator, per_scenario
+
+logger = logging.getLogger(__name__)
+
+
+class WaterResourceModel(ResourceModel):
     """Model diverse water resources and hydrological systems in Bangladesh"""
+    STATE_KEY = 'water'
+    SIMULATE_METHOD = 'simulate_step'
+    READS = ('climate',)
+    PARAMETERS = {
+        "transboundary_flow_multiplier": ("water", 1.0), # 1.0 = current upstream inflows
+        "irrigation_efficiency_target": ("water", 40), # Percent
+    }
+
+    DATA_PATH_KEY = 'water_data'
+    # Data sections, loaded on first access and cached process-wide
+    river_systems = DataSection('_load_river_data')
+    groundwater_dynamics = DataSection('_load_groundwater_data')
+    wetland_ecosystems = DataSection('_load_wetland_data')
+    water_quality_factors = DataSection('_load_water_quality_data')
+    transboundary_flows = DataSection('_load_transboundary_data')
+    seasonal_patterns = DataSection('_load_seasonal_data')
+    extraction_demands = DataSection('_load_extraction_data')
+    management_approaches = DataSection('_load_management_data')
+    spatial_parameters = DataSection('_load_spatial_parameters')
+    # (stage, flood depth field) of the last spatial flood computation
+    _flood_cache = None
+
     def __init__(self, config, river_systems=None, groundwater_dynamics=None, 
                  wetland_ecosystems=None, water_quality_factors=None, 
                  transboundary_flows=None, seasonal_patterns=None,
@@ -19,35 +52,36 @@ class WaterResourceModel:
             management_approaches: Data/parameters for water management approaches.
         """
         self.config = config
-        self.river_systems = river_systems if river_systems is not None else self._load_river_data(config)
-        self.groundwater_dynamics = groundwater_dynamics if groundwater_dynamics is not None else self._load_groundwater_data(config)
-        self.wetland_ecosystems = wetland_ecosystems if wetland_ecosystems is not None else self._load_wetland_data(config)
-        self.water_quality_factors = water_quality_factors if water_quality_factors is not None else self._load_water_quality_data(config)
-        self.transboundary_flows = transboundary_flows if transboundary_flows is not None else self._load_transboundary_data(config)
-        self.seasonal_patterns = seasonal_patterns if seasonal_patterns is not None else self._load_seasonal_data(config)
-        self.extraction_demands = extraction_demands if extraction_demands is not None else self._load_extraction_data(config)
-        self.management_approaches = management_approaches if management_approaches is not None else self._load_management_data(config)
+        # Sections passed in explicitly take precedence over the lazily loaded defaults
+        provided_sections = {"river_systems": river_systems, "groundwater_dynamics": groundwater_dynamics,
+                             "wetland_ecosystems": wetland_ecosystems, "water_quality_factors": water_quality_factors,
+                             "transboundary_flows": transboundary_flows, "seasonal_patterns": seasonal_patterns,
+                             "extraction_demands": extraction_demands, "management_approaches": management_approaches}
+        for name, section in provided_sections.items():
+            if section is not None:
+                setattr(self, name, section)
         
         # Initialize water resource parameters using Bangladesh hydrological data
-        print("Initializing Water Resource Model...")
+        logger.debug("Initializing Water Resource Model...")
         # Placeholder for detailed initialization logic based on loaded data/config
 
     def _load_river_data(self, config):
         # Placeholder: Load river system data based on config
-        print("Loading River System Data...")
+        logger.debug("Loading River System Data...")
         # Synthetic data examples (units might vary depending on specific data source)
         return {"ganges_padma_flow": {"average_m3s": 35000, "dry_season_m3s": 6000, "monsoon_peak_m3s": 90000}, 
-                "brahmaputra_jamuna_patterns": {"average_m3s": 40000, "monsoon_peak_m3s": 110000, "seasonality": "High"},
-                "meghna_behavior": {"average_m3s": 5000, "dominant_influence": "Local + Upstream"},
+                "brahmaputra_jamuna_patterns": {"average_m3s": 40000, "dry_season_m3s": 4000, "monsoon_peak_m3s": 110000, "seasonality": "High"},
+                "meghna_behavior": {"average_m3s": 5000, "dry_season_m3s": 1000, "monsoon_peak_m3s": 18000,
+                                    "bankfull_m3s": 8000, "dominant_influence": "Local + Upstream"},
                 "teesta_sharing": {"status": "Treaty Exists", "avg_share_percent": 40, "variability": "High"},
                 "dry_season_flow_criticality": {"minimum_threshold_m3s": 1500, "frequency_years": 3},
-                "monsoon_pulse_characteristics": {"duration_days": 90, "peak_timing": "July-August"},
+                "monsoon_pulse_characteristics": {"duration_days": 90, "peak_timing": "July-August", "peak_day_of_year": 212},
                 "sediment_transport_mt_yr": 1.2e9, # Million tonnes per year
                 "water_quality_variation": {"major_pollutants": ["Agrochemicals", "Industrial Effluents", "Salinity"], "trend": "Degrading"}}
 
     def _load_groundwater_data(self, config):
         # Placeholder: Load groundwater dynamics data based on config
-        print("Loading Groundwater Dynamics Data...")
+        logger.debug("Loading Groundwater Dynamics Data...")
         # Synthetic data examples
         return {"shallow_aquifer_extraction_mcm_yr": 50000, # Million Cubic Meters per year
                 "deep_aquifer_yield_mcm_yr": 15000,
@@ -56,11 +90,14 @@ class WaterResourceModel:
                 "recharge_rate_mm_yr": 250, # Average
                 "urban_depletion_m_yr": 0.5, # Average rate in major cities
                 "industrial_usage_mcm_yr": 3000,
+                "aquifer_area_sqkm": 147570, # Country area
+                "specific_yield": 0.1, # Fraction
+                "return_flow_fraction": 0.23, # Share of pumped water returning to the aquifer
                 "aquifer_surface_interaction": {"status": "Significant", "flow_direction": "Variable"}}
 
     def _load_wetland_data(self, config):
         # Placeholder: Load wetland ecosystem data based on config
-        print("Loading Wetland Ecosystem Data...")
+        logger.debug("Loading Wetland Ecosystem Data...")
         # Synthetic data examples
         return {"haor_flooding_max_area_sqkm": 6000,
                 "beel_retention_capacity_mcm": 2000,
@@ -73,21 +110,21 @@ class WaterResourceModel:
 
     def _load_water_quality_data(self, config):
         # Placeholder: Load water quality factors data based on config
-        print("Loading Water Quality Data...")
+        logger.debug("Loading Water Quality Data...")
         # Synthetic data examples
         return {"upstream_pollution_load_index": 70, # Scale 0-100
                 "land_use_impacts": {"dominant": ["Agriculture", "Urban Runoff"], "severity": "High"}}
 
     def _load_transboundary_data(self, config):
         # Placeholder: Load transboundary flow data based on config
-        print("Loading Transboundary Flow Data...")
+        logger.debug("Loading Transboundary Flow Data...")
         # Synthetic data examples
         return {"ganges_treaty_implementation_status": "Partially Effective", 
                 "teesta_bilateral_arrangements_status": "Negotiations Ongoing"} 
 
     def _load_seasonal_data(self, config):
         # Placeholder: Load seasonal pattern data based on config
-        print("Loading Seasonal Pattern Data...")
+        logger.debug("Loading Seasonal Pattern Data...")
         # Synthetic data examples
         return {"monsoon_rainfall_avg_mm": 2500, 
                 "dry_season_rainfall_avg_mm": 150,
@@ -95,7 +132,7 @@ class WaterResourceModel:
 
     def _load_extraction_data(self, config):
         # Placeholder: Load extraction demand data based on config
-        print("Loading Extraction Demand Data...")
+        logger.debug("Loading Extraction Demand Data...")
         # Synthetic data examples (MCM/yr)
         return {"irrigation_mcm_yr": 45000, 
                 "municipal_mcm_yr": 4000, 
@@ -104,7 +141,7 @@ class WaterResourceModel:
 
     def _load_management_data(self, config):
         # Placeholder: Load management approaches data based on config
-        print("Loading Water Management Data...")
+        logger.debug("Loading Water Management Data...")
         # Synthetic data examples
         return {"flood_control_infra_coverage_percent": 60, 
                 "irrigation_efficiency_percent": 35, 
@@ -115,6 +152,14 @@ class WaterResourceModel:
                 "integrated_planning_status": "Developing", 
                 "climate_adaptation_investment_usd_yr": 100e6}
 
+    def _load_spatial_parameters(self, config):
+        # Placeholder: flood spreading settings for the spatial grid
+        logger.debug("Loading Spatial Flood Parameters...")
+        return {"monsoon_stage_m": 4.0, # River stage above bed at current monsoon peak flows
+                "head_loss_m_per_cell": 0.35,
+                "max_flood_spread_steps": 30,
+                "flooded_depth_threshold_m": 0.1}
+
     def simulate_step(self, year, state):
         """
         Simulates one time step (e.g., one year) for the water resources.
@@ -127,7 +172,7 @@ class WaterResourceModel:
         Returns:
             Updated state related to water resources.
         """
-        print(f"Simulating Water Resources for year {year}...")
+        logger.debug("Simulating Water Resources for year %s...", year)
         
         # Placeholder for simulation logic:
         # - Update river flows based on seasonal patterns, transboundary inputs, climate impacts
@@ -136,12 +181,99 @@ class WaterResourceModel:
         # - Assess water quality changes based on pollution loads, flows
         # - Evaluate impacts of management strategies 
         
-        updated_water_state = {
-            "river_flow_status": "nominal", # Example output
-            "groundwater_level_change": -0.1, # Example output (meters)
-            "wetland_area_change": -10, # Example output (sq km)
-            "average_water_quality_index": 75 # Example output
-        }
+        updated_water_state = self._compute_dynamics(year, state, self.get_parameters())
         
         # Return the updated state for this component
-        return updated_water_state 
\ No newline at end of file
+        return updated_water_state
+
+    def _compute_dynamics(self, year, state, params):
+        # Placeholder elasticities around the baseline parameters (multiplier 1.0, efficiency 40%):
+        # reduced upstream flow raises groundwater pumping and wetland loss, better irrigation
+        # efficiency lowers extraction.
+        flow_deficit = 1.0 - params["transboundary_flow_multiplier"]
+        efficiency_gain = (params["irrigation_efficiency_target"] - 40) / 100
+        outputs = {
+            "river_flow_status": "nominal", # Example output
+            "groundwater_level_change": -0.1 * (1 + 0.5 * flow_deficit) * (1 - efficiency_gain), # Example output (meters)
+            "wetland_area_change": -10 * (1 + flow_deficit), # Example output (sq km)
+            "average_water_quality_index": 75 - 10 * flow_deficit # Example output
+        }
+        time_step = self.config.get("water_time_step", "annual")
+        if time_step != "annual":
+            outputs.update(self._seasonal_dynamics(time_step, params, flow_deficit, efficiency_gain))
+        if self.spatial is not None:
+            outputs.update(self._spatial_dynamics(params, outputs["groundwater_level_change"]))
+        return outputs
+
+    def _spatial_dynamics(self, params, groundwater_level_change):
+        """
+        Updates the spatial water fields for the year:
+            'flood_depth_m': monsoon river stage spread outwards from river cells, losing head
+                             with every cell crossed, flooding cells below the resulting level.
+            'groundwater_level_change_m': cumulative water table change, distributing the
+                                          national change by each cell's extraction weight.
+        """
+        grid = self.spatial.grid
+        spatial = self.spatial_parameters
+        elevation = grid.attributes["elevation_m"]
+        stage = spatial["monsoon_stage_m"] * per_scenario(params["transboundary_flow_multiplier"])
+        # The flood field depends only on the stage, so unchanged stages reuse last year's spreading
+        cached_stage, flood_depth = self._flood_cache if self._flood_cache is not None else (None, None)
+        if cached_stage is None or not np.array_equal(cached_stage, stage):
+            levels = np.where(grid.attributes["river"], elevation + stage, -np.inf)
+            levels = grid.propagate_level(levels, spatial["head_loss_m_per_cell"], spatial["max_flood_spread_steps"])
+            flood_depth = np.maximum(levels - elevation, 0.0)
+            self._flood_cache = (stage, flood_depth)
+        self.spatial.write(self, "flood_depth_m", flood_depth)
+
+        weight = grid.attributes.get("extraction_weight", np.ones(grid.n_cells))
+        groundwater = self.spatial.read(self, "groundwater_level_change_m", 0.0) + per_scenario(groundwater_level_change) * weight
+        self.spatial.write(self, "groundwater_level_change_m", groundwater)
+
+        flooded = (flood_depth > spatial["flooded_depth_threshold_m"]) & ~grid.attributes["river"]
+        flooded_area = grid.total_area(flooded)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_depth = np.where(flooded_area > 0, grid.total_area(flood_depth * flooded) / flooded_area, 0.0)
+        return {
+            "flooded_area_sqkm": indicator(flooded_area),
+            "mean_flood_depth_m": indicator(mean_depth),
+            "max_groundwater_decline_m": indicator(-np.minimum(groundwater.min(axis=-1), 0.0)),
+        }
+
+    def _seasonal_dynamics(self, time_step, params, flow_deficit, efficiency_gain):
+        """
+        Runs the sub-annual hydrological kernel (see hydrology.seasonal_water_balance) for one
+        year and aggregates it to annual indicators. Groundwater level change and river flow
+        status then come from the seasonal water balance instead of the annual placeholders.
+        """
+        rivers = {"ganges_padma": {"dry_m3s": self.river_systems["ganges_padma_flow"]["dry_season_m3s"],
+                                   "peak_m3s": self.river_systems["ganges_padma_flow"]["monsoon_peak_m3s"]},
+                  "brahmaputra_jamuna": {"dry_m3s": self.river_systems["brahmaputra_jamuna_patterns"]["dry_season_m3s"],
+                                         "peak_m3s": self.river_systems["brahmaputra_jamuna_patterns"]["monsoon_peak_m3s"]},
+                  "meghna": {"dry_m3s": self.river_systems["meghna_behavior"]["dry_season_m3s"],
+                             "peak_m3s": self.river_systems["meghna_behavior"]["monsoon_peak_m3s"],
+                             "bankfull_m3s": self.river_systems["meghna_behavior"]["bankfull_m3s"]}}
+        pulse = self.river_systems["monsoon_pulse_characteristics"]
+        demands = self.extraction_demands
+        groundwater = {"recharge_mm": self.groundwater_dynamics["recharge_rate_mm_yr"],
+                       # MCM over the aquifer area -> mm of water
+                       "pumping_mm": self.groundwater_dynamics["shallow_aquifer_extraction_mcm_yr"] / self.groundwater_dynamics["aquifer_area_sqkm"] * 1000,
+                       "irrigation_share": demands["irrigation_mcm_yr"] / (demands["irrigation_mcm_yr"] + demands["municipal_mcm_yr"] + demands["industrial_mcm_yr"]),
+                       "return_flow_fraction": self.groundwater_dynamics["return_flow_fraction"],
+                       "specific_yield": self.groundwater_dynamics["specific_yield"]}
+        balance = seasonal_water_balance(
+            time_step, rivers,
+            {"peak_day": pulse["peak_day_of_year"], "duration_days": pulse["duration_days"]},
+            {"monsoon_mm": self.seasonal_patterns["monsoon_rainfall_avg_mm"],
+             "dry_season_mm": self.seasonal_patterns["dry_season_rainfall_avg_mm"]},
+            groundwater,
+            {"max_area_sqkm": self.wetland_ecosystems["haor_flooding_max_area_sqkm"], "river": "meghna"},
+            flow_multiplier=params["transboundary_flow_multiplier"],
+            # Lower surface inflows raise pumping, more efficient irrigation lowers it
+            pumping_multiplier=(1 + 0.5 * flow_deficit) * (1 - efficiency_gain))
+
+        threshold = self.river_systems["dry_season_flow_criticality"]["minimum_threshold_m3s"]
+        dry_flow = np.asarray(balance["ganges_padma_min_flow_m3s"])
+        status = np.where(dry_flow < threshold, "critical", np.where(dry_flow < 2 * threshold, "low", "nominal"))
+        balance["river_flow_status"] = str(status) if status.ndim == 0 else status
+        return balance
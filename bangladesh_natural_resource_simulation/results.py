@@ -0,0 +1,286 @@
+# results.py
+
+import json
+import os
+from collections.abc import Mapping
+
+import numpy as np
+
+
+class SimulationResults(Mapping):
+    """Columnar store for simulation outputs with a dict-like, year-keyed read view"""
+    emulated = False # True for emulator predictions (emulator.EmulatedResults)
+
+    def __init__(self, start_year, end_year, columns=None, recorded=None):
+        """
+        Initializes an empty results store covering start_year..end_year (inclusive).
+
+        Numeric indicators are kept in one preallocated float64 array per
+        (model, indicator), indexed by year offset. Non-numeric indicators
+        (e.g. 'river_flow_status') are kept in a parallel object array.
+
+        Args:
+            start_year (int): First simulated year.
+            end_year (int): Last simulated year (inclusive).
+            columns (dict, optional): Preallocated float64 arrays keyed by (model, indicator),
+                                      e.g. views into a larger ensemble buffer. Columns not
+                                      listed here are allocated on first write.
+            recorded (np.ndarray, optional): Boolean array of length num_years marking which
+                                             years hold data. Allocated if not given.
+        """
+        self.start_year = start_year
+        self.end_year = end_year
+        self.years = np.arange(start_year, end_year + 1)
+        self._columns = dict(columns) if columns else {}
+        self._labels = {}
+        self._indicators = {} # model -> indicator names, in first-seen order
+        for model, indicator in self._columns:
+            self._indicators.setdefault(model, []).append(indicator)
+        self._recorded = recorded if recorded is not None else np.zeros(len(self.years), dtype=bool)
+
+    def _offset(self, year):
+        offset = int(year) - self.start_year
+        if offset < 0 or offset >= len(self.years):
+            raise KeyError(year)
+        return offset
+
+    def record(self, year, model, state):
+        """
+        Writes one model's output dictionary for a given year into the store.
+
+        Args:
+            year (int): The simulation year.
+            model (str): Model key (e.g. 'water', 'land').
+            state (dict): Indicator name -> value, as returned by the model's simulate method.
+        """
+        offset = self._offset(year)
+        indicators = self._indicators.setdefault(model, [])
+        for indicator, value in state.items():
+            key = (model, indicator)
+            if key not in self._columns and key not in self._labels:
+                if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+                    self._columns[key] = np.full(len(self.years), np.nan)
+                else:
+                    self._labels[key] = np.full(len(self.years), None, dtype=object)
+                indicators.append(indicator)
+            if key in self._columns:
+                self._columns[key][offset] = value
+            else:
+                self._labels[key][offset] = value
+        self._recorded[offset] = True
+
+    @property
+    def recorded_years(self):
+        """np.ndarray: The years that hold data, in ascending order."""
+        return self.years[self._recorded]
+
+    def models(self):
+        """Returns the model keys present in the store, in first-recorded order."""
+        return list(self._indicators)
+
+    def indicators(self, model):
+        """Returns the indicator names recorded for a model."""
+        return list(self._indicators.get(model, []))
+
+    def series(self, model, indicator):
+        """
+        Returns the time series of one indicator over the recorded years.
+
+        Args:
+            model (str): Model key (e.g. 'water').
+            indicator (str): Indicator name (e.g. 'groundwater_level_change').
+
+        Returns:
+            np.ndarray: float64 values for numeric indicators, object values otherwise.
+        """
+        key = (model, indicator)
+        column = self._columns[key] if key in self._columns else self._labels[key]
+        return column[self._recorded]
+
+    def column_array(self):
+        """
+        Stacks every numeric indicator into one array, e.g. for vectorized metrics.
+
+        Returns:
+            tuple: ((model, indicator) columns, float64 array of shape (n_columns, n_recorded_years)).
+        """
+        columns = [(model, indicator) for model in self._indicators for indicator in self._indicators[model]
+                   if (model, indicator) in self._columns]
+        values = np.empty((len(columns), int(self._recorded.sum())))
+        for c, key in enumerate(columns):
+            values[c] = self._columns[key][self._recorded]
+        return columns, values
+
+    def to_dict(self):
+        """
+        Converts the store to the nested {year: {model: {indicator: value}}} layout,
+        e.g. for JSON serialization.
+        """
+        return {year: {model: dict(model_view) for model, model_view in year_view.items()}
+                for year, year_view in self.items()}
+
+    # --- Mapping interface: results[year][model][indicator] ---
+
+    def __getitem__(self, year):
+        offset = self._offset(year)
+        if not self._recorded[offset]:
+            raise KeyError(year)
+        return _YearView(self, offset)
+
+    def __iter__(self):
+        return (int(year) for year in self.recorded_years)
+
+    def __len__(self):
+        return int(self._recorded.sum())
+
+
+class _YearView(Mapping):
+    """Read-only view of all model outputs for one year"""
+    def __init__(self, store, offset):
+        self._store = store
+        self._offset = offset
+
+    def __getitem__(self, model):
+        if model not in self._store._indicators:
+            raise KeyError(model)
+        return _ModelView(self._store, model, self._offset)
+
+    def __iter__(self):
+        return iter(self._store._indicators)
+
+    def __len__(self):
+        return len(self._store._indicators)
+
+    def __repr__(self):
+        return repr({model: dict(view) for model, view in self.items()})
+
+
+class _ModelView(Mapping):
+    """Read-only view of one model's indicators for one year"""
+    def __init__(self, store, model, offset):
+        self._store = store
+        self._model = model
+        self._offset = offset
+
+    def __getitem__(self, indicator):
+        key = (self._model, indicator)
+        if key in self._store._columns:
+            return float(self._store._columns[key][self._offset])
+        if key in self._store._labels:
+            return self._store._labels[key][self._offset]
+        raise KeyError(indicator)
+
+    def __iter__(self):
+        return iter(self._store._indicators[self._model])
+
+    def __len__(self):
+        return len(self._store._indicators[self._model])
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class EnsembleResults:
+    """Columnar store for many members of one simulation, optionally backed by .npy memmaps"""
+    def __init__(self, start_year, end_year, columns, n_members, values=None, recorded=None, path=None):
+        """
+        Initializes the ensemble store. Use create() / open() for a disk-backed store that
+        several worker processes can write into concurrently (one member row each).
+
+        Args:
+            start_year (int): First simulated year.
+            end_year (int): Last simulated year (inclusive).
+            columns (list): Ordered (model, indicator) pairs held by the store.
+            n_members (int): Number of ensemble members.
+            values (np.ndarray, optional): float64 array of shape (n_members, n_columns, n_years).
+            recorded (np.ndarray, optional): bool array of shape (n_members, n_years).
+            path (str, optional): Directory holding the memmapped arrays, if disk-backed.
+        """
+        self.start_year = start_year
+        self.end_year = end_year
+        self.years = np.arange(start_year, end_year + 1)
+        self.columns = [tuple(column) for column in columns]
+        self.n_members = n_members
+        self.path = path
+        self.parameters = {} # Sampled parameter values per member, keyed by dotted config path
+        self.statistics = None # Streaming EnsembleStatistics, when the run computed them
+        self._index = {column: c for c, column in enumerate(self.columns)}
+        shape = (n_members, len(self.columns), len(self.years))
+        self.values = values if values is not None else np.full(shape, np.nan)
+        self.recorded = recorded if recorded is not None else np.zeros((n_members, len(self.years)), dtype=bool)
+
+    @classmethod
+    def create(cls, path, start_year, end_year, columns, n_members):
+        """
+        Creates a disk-backed store in directory 'path' (values.npy, recorded.npy, layout.json).
+        """
+        os.makedirs(path, exist_ok=True)
+        shape = (n_members, len(columns), end_year - start_year + 1)
+        values = np.lib.format.open_memmap(os.path.join(path, 'values.npy'), mode='w+',
+                                           dtype=np.float64, shape=shape)
+        values[:] = np.nan
+        recorded = np.lib.format.open_memmap(os.path.join(path, 'recorded.npy'), mode='w+',
+                                             dtype=bool, shape=(shape[0], shape[2]))
+        with open(os.path.join(path, 'layout.json'), 'w') as f:
+            json.dump({"start_year": start_year, "end_year": end_year,
+                       "columns": [list(column) for column in columns], "n_members": n_members}, f)
+        values.flush()
+        recorded.flush()
+        return cls(start_year, end_year, columns, n_members, values=values, recorded=recorded, path=path)
+
+    @classmethod
+    def open(cls, path, mode='r'):
+        """
+        Opens an existing disk-backed store. Use mode='r+' in workers that write member rows.
+        """
+        with open(os.path.join(path, 'layout.json')) as f:
+            layout = json.load(f)
+        values = np.load(os.path.join(path, 'values.npy'), mmap_mode=mode)
+        recorded = np.load(os.path.join(path, 'recorded.npy'), mmap_mode=mode)
+        return cls(layout["start_year"], layout["end_year"], layout["columns"], layout["n_members"],
+                   values=values, recorded=recorded, path=path)
+
+    def flush(self):
+        """Writes pending changes of a disk-backed store to its files."""
+        for array in (self.values, self.recorded):
+            if isinstance(array, np.memmap):
+                array.flush()
+
+    def member(self, member):
+        """
+        Returns a SimulationResults view of one member. Recording into the view writes
+        directly into this store; indicators outside the store's columns stay private to the view.
+        """
+        columns = {column: self.values[member, c] for column, c in self._index.items()}
+        return SimulationResults(self.start_year, self.end_year, columns=columns,
+                                 recorded=self.recorded[member])
+
+    def record_batch(self, year, model, outputs):
+        """
+        Writes one model's batched outputs for a year (indicator -> array of shape (n_members,)).
+        Indicators that are not columns of the store (e.g. status strings) are skipped.
+        """
+        offset = int(year) - self.start_year
+        for indicator, values in outputs.items():
+            c = self._index.get((model, indicator))
+            if c is not None:
+                self.values[:, c, offset] = values
+        self.recorded[:, offset] = True
+
+    def series(self, model, indicator):
+        """
+        Returns one indicator for all members.
+
+        Returns:
+            np.ndarray: Array of shape (n_members, n_years).
+        """
+        return self.values[:, self._index[(model, indicator)], :]
+
+    def quantiles(self, model, indicator, q=(0.05, 0.5, 0.95)):
+        """
+        Computes per-year quantiles of one indicator across members (e.g. uncertainty bands).
+
+        Returns:
+            np.ndarray: Array of shape (len(q), n_years).
+        """
+        return np.nanquantile(self.series(model, indicator), q, axis=0)
@@ -0,0 +1,173 @@
+# scheduler.py
+
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class DependencyCycleError(ValueError):
+    """Raised when model state dependencies form a cycle within one year"""
+
+
+class UndeclaredStateReadError(RuntimeError):
+    """Raised when a model reads a current_state key it did not declare"""
+
+
+class _DeclaredState(Mapping):
+    """
+    Read-only view of current_state handed to one model. Same-year reads see this year's
+    outputs, lagged reads see the previous year's, and any other key raises.
+    """
+    def __init__(self, model_key, same_year, lagged, year_outputs, previous_state):
+        self._model_key = model_key
+        self._same_year = same_year
+        self._lagged = lagged
+        self._year_outputs = year_outputs
+        self._previous_state = previous_state
+
+    def __getitem__(self, key):
+        if key in self._same_year:
+            return self._year_outputs[key]
+        if key in self._lagged:
+            return self._previous_state[key]
+        raise UndeclaredStateReadError(
+            f"Model '{self._model_key}' read current_state['{key}'] without declaring it in READS or LAGGED_READS")
+
+    def __iter__(self):
+        return (key for key in (*self._same_year, *self._lagged)
+                if key in self._year_outputs or key in self._previous_state)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class ModelScheduler:
+    """Order and run component models from their declared current_state reads and writes"""
+    def __init__(self, models, max_workers=1):
+        """
+        Builds the dependency graph of the models and validates it.
+
+        Each model writes current_state[model.STATE_KEY] and declares:
+            READS: keys it needs from the same year (these become graph edges).
+            LAGGED_READS: keys it uses from the previous year (no edge, so they may form loops).
+
+        Args:
+            models (list): Component models; their list order breaks ties between independent models.
+            max_workers (int): Threads used to run independent models concurrently. 1 runs
+                               the models sequentially in topological order.
+
+        Raises:
+            ValueError: If two models write the same key or a model reads a key no model writes.
+            DependencyCycleError: If same-year reads form a cycle.
+        """
+        self.models = list(models)
+        self.max_workers = max_workers
+        self.producers = {}
+        for model in self.models:
+            if model.STATE_KEY in self.producers:
+                raise ValueError(f"Models {type(self.producers[model.STATE_KEY]).__name__} and "
+                                 f"{type(model).__name__} both write current_state['{model.STATE_KEY}']")
+            self.producers[model.STATE_KEY] = model
+        for model in self.models:
+            unknown = (set(model.READS) | set(model.LAGGED_READS)) - set(self.producers)
+            if unknown:
+                raise ValueError(f"Model '{model.STATE_KEY}' reads {sorted(unknown)}, which no model writes")
+
+        self.dependencies = {model.STATE_KEY: set(model.READS) for model in self.models}
+        self.dependents = {key: [] for key in self.dependencies}
+        for key, dependencies in self.dependencies.items():
+            for dependency in dependencies:
+                self.dependents[dependency].append(key)
+        self.order = self._topological_order()
+
+    def _topological_order(self):
+        """Kahn's algorithm, breaking ties by the models' list order so runs are reproducible."""
+        order = []
+        done = set()
+        remaining = [model.STATE_KEY for model in self.models]
+        while remaining:
+            ready = next((key for key in remaining if self.dependencies[key] <= done), None)
+            if ready is None:
+                raise DependencyCycleError(
+                    f"Same-year state dependencies form a cycle among {self._cycle_members(remaining)}; "
+                    "declare one of the reads in LAGGED_READS")
+            order.append(ready)
+            done.add(ready)
+            remaining.remove(ready)
+        return order
+
+    def _cycle_members(self, remaining):
+        """Drops models that are merely downstream of a cycle, leaving the models on it."""
+        members = list(remaining)
+        pruned = True
+        while pruned:
+            pruned = False
+            for key in list(members):
+                if not any(dependent in members for dependent in self.dependents[key]):
+                    members.remove(key)
+                    pruned = True
+        return members
+
+    def levels(self):
+        """
+        Groups the models into waves that only depend on earlier waves.
+        Models in the same wave are independent of each other.
+        """
+        depth = {}
+        for key in self.order:
+            depth[key] = 1 + max((depth[dependency] for dependency in self.dependencies[key]), default=-1)
+        waves = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+        for key in self.order:
+            waves[depth[key]].append(key)
+        return waves
+
+    def _state_for(self, key, year_outputs, previous_state):
+        model = self.producers[key]
+        return _DeclaredState(key, frozenset(model.READS), frozenset(model.LAGGED_READS),
+                              year_outputs, previous_state)
+
+    def run_year(self, year, current_state, step=None):
+        """
+        Runs every model once for the given year and updates current_state in place.
+
+        Args:
+            year: The current simulation year.
+            current_state (dict): State from the previous year; updated with this year's outputs.
+            step (callable, optional): step(model, year, state) -> output dict. Defaults to
+                                       calling the model's simulate method (model.SIMULATE_METHOD).
+
+        Returns:
+            dict: This year's outputs keyed by STATE_KEY, in topological order.
+        """
+        step = step or (lambda model, year, state: getattr(model, model.SIMULATE_METHOD)(year, state))
+        previous_state = dict(current_state)
+        year_outputs = {}
+
+        if self.max_workers == 1:
+            for key in self.order:
+                year_outputs[key] = step(self.producers[key], year, self._state_for(key, year_outputs, previous_state))
+        else:
+            # Start each model as soon as all of its same-year inputs are available
+            waiting = {key: len(self.dependencies[key]) for key in self.order}
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                running = {}
+
+                def submit(key):
+                    state = self._state_for(key, dict(year_outputs), previous_state)
+                    running[executor.submit(step, self.producers[key], year, state)] = key
+
+                for key in self.order:
+                    if waiting[key] == 0:
+                        submit(key)
+                while running:
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        key = running.pop(future)
+                        year_outputs[key] = future.result()
+                        for dependent in self.dependents[key]:
+                            waiting[dependent] -= 1
+                            if waiting[dependent] == 0:
+                                submit(dependent)
+            year_outputs = {key: year_outputs[key] for key in self.order}
+
+        current_state.update(year_outputs)
+        return year_outputs
@@ -0,0 +1,308 @@
+# sensitivity.py
+
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .simulation import BangladeshNaturalResourceSimulation
+from .frozen_config import FrozenConfig
+from .logging_config import preserved_log_level
+from .analysis.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+SENSITIVITY_METHODS = ("sobol", "morris")
+
+
+def scale_samples(unit, ranges):
+    """
+    Maps unit-hypercube samples to parameter values.
+
+    Args:
+        unit (np.ndarray): Shape (n_rows, n_parameters), values in [0, 1].
+        ranges (list): One specification per column, as for ensemble distributions:
+                       ("uniform", low, high) for a continuous parameter, or ("choice", options)
+                       for a categorical one (e.g. RCP scenarios), chosen by splitting [0, 1)
+                       into equal intervals.
+
+    Returns:
+        list: One array of shape (n_rows,) per column.
+    """
+    values = []
+    for i, spec in enumerate(ranges):
+        kind, *args = spec
+        if kind == "uniform":
+            low, high = args
+            values.append(low + unit[:, i] * (high - low))
+        elif kind == "choice":
+            options = np.array(args[0])
+            values.append(options[np.minimum((unit[:, i] * len(options)).astype(int), len(options) - 1)])
+        else:
+            raise ValueError(f"Unknown range '{kind}' in sensitivity specification {spec}, expected 'uniform' or 'choice'")
+    return values
+
+
+def _run_chunk(task):
+    """
+    Worker entry point: runs one chunk of design rows as a single batch and reduces every
+    numeric output over the years. Only the (n_rows, n_outputs) metric array is returned.
+    """
+    config, parameter_sets, start_year, end_year, metric = task
+    simulation = BangladeshNaturalResourceSimulation(config=config)
+    batch = simulation.run_batch(parameter_sets, start_year=start_year, end_year=end_year)
+    outputs = METRICS[metric](batch.values, batch.years.astype(float))
+    return batch.columns, outputs
+
+
+class SensitivityStudy:
+    """
+    Global sensitivity analysis of every numeric output over ranges of model_params:
+    Sobol first/total-order indices from a Saltelli design, or Morris elementary effects.
+
+    Samples are drawn in increments: extend() runs only the new design rows and appends their
+    outputs, so a study can be grown (or saved, loaded and grown later) without rerunning.
+    """
+    def __init__(self, base_config, ranges, method="sobol", seed=0, metric="cumulative",
+                 start_year=None, end_year=None, batch_size=2048, max_workers=1, morris_levels=4):
+        """
+        Args:
+            base_config (dict): Configuration shared by all runs.
+            ranges (dict): Dotted config path -> ("uniform", low, high) or ("choice", options),
+                           e.g. {"model_params.land.urban_growth_multiplier": ("uniform", 0.5, 2.0),
+                                 "model_params.climate.rcp_scenario": ("choice", ["RCP4.5", "RCP8.5"])}.
+                           Every path must be a declared model parameter (see run_batch).
+            method (str): 'sobol' (N * (k + 2) runs for N base samples and k parameters) or
+                          'morris' (N * (k + 1) runs for N trajectories).
+            seed (int): Seed of the design; the i-th sample is the same however the study
+                        is split into extend() calls.
+            metric (str): Reduction of each output over the years (analysis.metrics.METRICS).
+            start_year (int, optional): Defaults to base_config['start_year'].
+            end_year (int, optional): Defaults to base_config['end_year'].
+            batch_size (int): Design rows per run_batch call (and per worker task).
+            max_workers (int): Processes running batches; 1 runs them in the current process.
+            morris_levels (int): Grid levels per parameter for Morris trajectories.
+        """
+        if method not in SENSITIVITY_METHODS:
+            raise ValueError(f"Unknown sensitivity method '{method}', expected one of {SENSITIVITY_METHODS}")
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric '{metric}', expected one of {sorted(METRICS)}")
+        self.base_config = FrozenConfig(base_config).override({"quiet": True})
+        self.parameters = sorted(ranges)
+        self.ranges = [tuple(ranges[path]) for path in self.parameters]
+        self.method = method
+        self.seed = seed
+        self.metric = metric
+        self.start_year = start_year if start_year is not None else self.base_config["start_year"]
+        self.end_year = end_year if end_year is not None else self.base_config["end_year"]
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.morris_levels = morris_levels
+
+        self.n_samples = 0 # Base samples (Sobol) or trajectories (Morris) run so far
+        self.columns = None # (model, indicator) of every output, set by the first run
+        self.unit_samples = np.empty((0, self.points_per_sample, len(self.parameters)))
+        self.outputs = None # (n_samples, points_per_sample, n_outputs)
+
+    @property
+    def points_per_sample(self):
+        k = len(self.parameters)
+        return k + 2 if self.method == "sobol" else k + 1
+
+    # --- Designs in the unit hypercube, shape (n, points_per_sample, k) ---
+
+    def _sobol_design(self, first, n):
+        # Scrambled Sobol' points in 2k dimensions: the first k are matrix A, the last k matrix B.
+        # Each base sample contributes A, B and the k rows AB_i (A with column i taken from B).
+        from scipy.stats import qmc # Imported here: scipy is slow to import
+
+        k = len(self.parameters)
+        sampler = qmc.Sobol(d=2 * k, scramble=True, seed=self.seed)
+        if first:
+            sampler.fast_forward(first)
+        points = sampler.random(n)
+        a, b = points[:, :k], points[:, k:]
+        design = np.repeat(a[:, None, :], k + 2, axis=1)
+        design[:, 1] = b
+        columns = np.arange(k)
+        design[:, 2 + columns, columns] = b[:, columns]
+        return design
+
+    def _morris_design(self, first, n):
+        # One-at-a-time trajectories on a grid of p levels with step delta = p / (2 (p - 1));
+        # each trajectory has its own generator, so it does not depend on how the study is split
+        k = len(self.parameters)
+        levels = self.morris_levels
+        delta = levels / (2 * (levels - 1))
+        design = np.empty((n, k + 1, k))
+        for t in range(n):
+            rng = np.random.default_rng([self.seed, first + t])
+            x = rng.integers(0, levels, size=k) / (levels - 1)
+            design[t, 0] = x
+            for step, i in enumerate(rng.permutation(k)):
+                x = x.copy()
+                x[i] = x[i] + delta if x[i] + delta <= 1 + 1e-12 else x[i] - delta
+                design[t, step + 1] = x
+        return design
+
+    def _run_design(self, unit):
+        """Runs every row of a (n_rows, k) unit design; returns outputs of shape (n_rows, n_outputs)."""
+        values = scale_samples(unit, self.ranges)
+        tasks = []
+        for start in range(0, len(unit), self.batch_size):
+            stop = min(start + self.batch_size, len(unit))
+            parameter_sets = {path: values[i][start:stop] for i, path in enumerate(self.parameters)}
+            tasks.append((self.base_config, parameter_sets, self.start_year, self.end_year, self.metric))
+
+        if self.max_workers == 1 or len(tasks) == 1:
+            with preserved_log_level():
+                chunks = [_run_chunk(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.max_workers or os.cpu_count() or 1, len(tasks))) as executor:
+                chunks = list(executor.map(_run_chunk, tasks))
+
+        columns = chunks[0][0]
+        if self.columns is None:
+            self.columns = columns
+        elif columns != self.columns:
+            raise ValueError("Model outputs differ from earlier runs of this study (code or configuration changed?)")
+        return np.concatenate([outputs for _, outputs in chunks])
+
+    def extend(self, n):
+        """
+        Draws and runs n more base samples (Sobol) or trajectories (Morris).
+
+        Args:
+            n (int): Number of new samples. Sobol' designs are best balanced when the total
+                     number of base samples is a power of two.
+
+        Returns:
+            SensitivityStudy: self, for chaining (e.g. study.extend(256).indices()).
+        """
+        design = (self._sobol_design if self.method == "sobol" else self._morris_design)(self.n_samples, n)
+        logger.info("--- Sensitivity study (%s): running %s new samples, %s simulations ---",
+                    self.method, n, design.shape[0] * design.shape[1])
+        outputs = self._run_design(design.reshape(-1, len(self.parameters)))
+        outputs = outputs.reshape(n, self.points_per_sample, -1)
+        self.unit_samples = np.concatenate([self.unit_samples, design])
+        self.outputs = outputs if self.outputs is None else np.concatenate([self.outputs, outputs])
+        self.n_samples += n
+        return self
+
+    # --- Indices ---
+
+    @staticmethod
+    def _sobol_estimates(outputs):
+        # Saltelli (2010) first-order and Jansen (1999) total-order estimators
+        f_a, f_b, f_ab = outputs[:, 0], outputs[:, 1], outputs[:, 2:] # f_ab: (n, k, n_outputs)
+        variance = np.var(np.concatenate([f_a, f_b]), axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            first = np.mean(f_b[:, None] * (f_ab - f_a[:, None]), axis=0) / variance
+            total = 0.5 * np.mean((f_a[:, None] - f_ab) ** 2, axis=0) / variance
+        valid = variance > 0
+        return np.where(valid, first, np.nan).T, np.where(valid, total, np.nan).T # (n_outputs, k)
+
+    def _morris_effects(self):
+        # Elementary effects per trajectory, in output units per unit of the normalized range
+        steps = np.diff(self.unit_samples, axis=1) # (n, k, k): one non-zero entry per step
+        changed = np.argmax(np.abs(steps), axis=2) # Parameter moved at each step
+        step_size = np.take_along_axis(steps, changed[..., None], axis=2)[..., 0]
+        effects = np.empty((self.n_samples, len(self.parameters), self.outputs.shape[2]))
+        rows = np.arange(self.n_samples)[:, None]
+        effects[rows, changed] = np.diff(self.outputs, axis=1) / step_size[..., None]
+        return effects # (n, k, n_outputs)
+
+    def indices(self, n_bootstrap=100):
+        """
+        Returns:
+            dict: Statistic name -> array of shape (n_outputs, n_parameters), rows following
+                  self.columns and columns following self.parameters.
+                  Sobol: 'S1' and 'ST' with 95% bootstrap half-widths 'S1_conf' and 'ST_conf'.
+                  Morris: 'mu', 'mu_star' (mean absolute effect, the usual ranking measure) and 'sigma'.
+        """
+        if not self.n_samples:
+            raise ValueError("The study has no samples yet; call extend(n) first")
+        if self.method == "morris":
+            effects = self._morris_effects()
+            return {"mu": effects.mean(axis=0).T, "mu_star": np.abs(effects).mean(axis=0).T,
+                    "sigma": effects.std(axis=0, ddof=1).T if self.n_samples > 1 else np.full(effects.shape[1:], np.nan).T}
+
+        first, total = self._sobol_estimates(self.outputs)
+        indices = {"S1": first, "ST": total}
+        if n_bootstrap:
+            rng = np.random.default_rng(self.seed)
+            resampled = [self._sobol_estimates(self.outputs[rng.integers(0, self.n_samples, self.n_samples)])
+                         for _ in range(n_bootstrap)]
+            indices["S1_conf"] = 1.96 * np.std([s1 for s1, _ in resampled], axis=0)
+            indices["ST_conf"] = 1.96 * np.std([st for _, st in resampled], axis=0)
+        return indices
+
+    def ranking(self, model, indicator, statistic=None):
+        """
+        Parameters ordered by their influence on one output.
+
+        Args:
+            statistic (str, optional): Defaults to 'ST' (Sobol) or 'mu_star' (Morris).
+
+        Returns:
+            list: (dotted parameter path, value) pairs, most influential first.
+        """
+        statistic = statistic or ("ST" if self.method == "sobol" else "mu_star")
+        row = self.indices(n_bootstrap=0)[statistic][self.columns.index((model, indicator))]
+        order = np.argsort(-np.nan_to_num(row, nan=-np.inf))
+        return [(self.parameters[i], float(row[i])) for i in order]
+
+    def rows(self, n_bootstrap=100):
+        """Yields (model, indicator, parameter, {statistic: value}) for report tables."""
+        indices = self.indices(n_bootstrap)
+        for c, (model, indicator) in enumerate(self.columns):
+            for p, parameter in enumerate(self.parameters):
+                yield model, indicator, parameter, {name: float(values[c, p]) for name, values in indices.items()}
+
+    # --- Persistence, so a study can be extended in a later session ---
+
+    def save(self, path):
+        """Writes the design, outputs and settings to an .npz file."""
+        settings = {"parameters": self.parameters, "ranges": self.ranges, "method": self.method,
+                    "seed": self.seed, "metric": self.metric, "start_year": self.start_year,
+                    "end_year": self.end_year, "morris_levels": self.morris_levels,
+                    "columns": self.columns, "n_samples": self.n_samples}
+        tmp_path = path + '.tmp.npz'
+        np.savez(tmp_path, unit_samples=self.unit_samples,
+                 outputs=self.outputs if self.outputs is not None else np.empty(0),
+                 settings=np.array(json.dumps(settings)))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, base_config, batch_size=2048, max_workers=1):
+        """Restores a saved study; base_config must match the one it was run with."""
+        with np.load(path) as data:
+            settings = json.loads(str(data["settings"]))
+            study = cls(base_config, dict(zip(settings["parameters"], settings["ranges"])),
+                        method=settings["method"], seed=settings["seed"], metric=settings["metric"],
+                        start_year=settings["start_year"], end_year=settings["end_year"],
+                        batch_size=batch_size, max_workers=max_workers, morris_levels=settings["morris_levels"])
+            study.n_samples = settings["n_samples"]
+            study.columns = [tuple(column) for column in settings["columns"]] if settings["columns"] else None
+            study.unit_samples = data["unit_samples"]
+            study.outputs = data["outputs"] if study.n_samples else None
+        return study
+
+
+# Example usage (if run directly)
+if __name__ == '__main__':
+    from .config import ACTIVE_CONFIG, SENSITIVITY_SETTINGS
+
+    logging.basicConfig(level=logging.INFO)
+
+    settings = SENSITIVITY_SETTINGS
+    study = SensitivityStudy(ACTIVE_CONFIG, settings["ranges"], method=settings["method"], seed=settings["seed"],
+                             metric=settings["metric"], batch_size=settings["batch_size"],
+                             max_workers=settings["max_workers"], morris_levels=settings["morris_levels"])
+    study.extend(settings["n_samples"])
+    for model, indicator in settings["report_outputs"]:
+        print(f"\n{model}.{indicator} ({study.method}, {study.n_samples} samples):")
+        for parameter, value in study.ranking(model, indicator):
+            print(f"    {parameter:<60} {value:8.3f}")
@@ -1,5 +1,11 @@
 # simulation.py
 
+import copy
+import logging
+import os
+
+import numpy as np
+
 from .models.water_resource import WaterResourceModel
 from .models.land_resource import LandResourceModel
 from .models.forest_resource import ForestResourceModel
@@ -12,9 +18,19 @@ from .models.resource_governance import ResourceGovernanceModel
 from .models.community_resource import CommunityResourceModel
 from .models.sustainable_use import SustainableUseModel
 from .models.conservation import ConservationModel
+from .results import SimulationResults, EnsembleResults
+from .scheduler import ModelScheduler
+from .logging_config import configure_logging
+from .instrumentation import Profiler
+from .checkpoint import Checkpoint, checkpoint_path
+from .cache import ScenarioResultCache, config_fingerprint, content_digest, MODEL_OUTPUT_CACHE
+from .spatial import SpatialGrid, SpatialState
+from . import kernels
 
 # Potential future: from .data.handler import NaturalResourceDataHandler
 
+logger = logging.getLogger(__name__)
+
 class BangladeshNaturalResourceSimulation:
     """Main simulation environment integrating all components"""
     def __init__(self, config):
@@ -24,8 +40,13 @@ class BangladeshNaturalResourceSimulation:
         Args:
             config: Configuration object/dictionary containing simulation parameters.
         """
-        print("--- Initializing Simulation Environment --- W")
+        configure_logging(config)
+        logger.info("--- Initializing Simulation Environment ---")
         self.config = config
+        # Per-model, per-year timings of this simulation (see instrumentation.Profiler)
+        self.profiler = Profiler.from_config(config)
+        kernels.set_backend(config.get("kernel_backend", "auto"))
+        self.current_state = {} # State after the last simulated year
         # Potential future: self.data_handler = NaturalResourceDataHandler(config)
         # Potential future: self.data_handler.load_historical_data()
         
@@ -42,9 +63,115 @@ class BangladeshNaturalResourceSimulation:
         self.community_resource = CommunityResourceModel(config)
         self.sustainable_use = SustainableUseModel(config)
         self.conservation = ConservationModel(config)
-        print("--- Simulation Environment Initialized --- \n")
+
+        # Component models; their execution order is derived from declared state dependencies
+        self.models = [self.climate_resilience, self.water_resources, self.land_resources,
+                       self.forest_resources, self.biodiversity, self.marine_resources,
+                       self.mineral_resources, self.energy_resources, self.community_resource,
+                       self.resource_governance, self.sustainable_use, self.conservation]
+        # Optional district/upazila or raster state shared by the spatial models (land, water, climate)
+        self.spatial = SpatialState(SpatialGrid.from_config(config["spatial_grid"])) if config.get("spatial_grid") else None
+        for model in self.models:
+            model.profiler = self.profiler
+            model.spatial = self.spatial
+        self.scheduler = ModelScheduler(self.models, max_workers=config.get("model_workers", 1))
+        # Reuse model steps whose inputs are unchanged since an earlier run (see _incremental_step).
+        # Not on a spatial grid: models exchange grid fields outside their declared state reads.
+        self.output_cache = (MODEL_OUTPUT_CACHE if config.get("incremental_models", False) and self.spatial is None
+                             else None)
+        logger.info("--- Simulation Environment Initialized ---")
+
+    def _timed_step(self, model, year, state):
+        """Scheduler step running the model's simulate method under the profiler."""
+        with self.profiler.measure('simulate', model.STATE_KEY, year):
+            return getattr(model, model.SIMULATE_METHOD)(year, state)
         
-    def run_simulation(self, start_year=2025, end_year=2035, scenarios=None):
+    def _begin_incremental(self, start_year, checkpoint=None):
+        """
+        Starts each model's chain of step keys for a run. The chain begins with everything
+        constant over the run: the configuration apart from model_params (plus data file times
+        and code version, see config_fingerprint), the model's own resolved parameters and,
+        when resuming, its checkpointed internal state.
+        """
+        base = config_fingerprint({key: value for key, value in self.config.items() if key != "model_params"},
+                                  start_year)
+        self._step_keys = {}
+        for model in self.models:
+            start = [base, type(model).__name__, sorted(model.get_parameters().items())]
+            if checkpoint is not None:
+                start += [checkpoint.year, content_digest(checkpoint.model_states.get(model.STATE_KEY, {}))]
+            self._step_keys[model.STATE_KEY] = content_digest(start)
+        self._output_digests = {} # (year, state key) -> digest of that model's outputs
+        self._reused_steps = 0
+
+    def _incremental_step(self, model, year, state):
+        """
+        Scheduler step that reuses a cached step when its inputs are unchanged.
+
+        A step's key combines the model's previous step key (so it covers the model's parameters
+        and its internal state history) with digests of this year's READS and last year's
+        LAGGED_READS outputs. Changing a downstream parameter (e.g. a conservation budget)
+        therefore reruns only that model and models whose inputs actually change.
+        """
+        inputs = [self._step_keys[model.STATE_KEY], year]
+        for read in sorted(model.READS):
+            inputs.append((read, self._output_digests[(year, read)]))
+        for read in sorted(model.LAGGED_READS):
+            digest = self._output_digests.get((year - 1, read))
+            if digest is None and read in state: # First year after resuming from a checkpoint
+                digest = content_digest(state[read])
+            inputs.append(('lagged', read, digest))
+        step_key = content_digest(inputs)
+
+        cached = self.output_cache.get(step_key)
+        if cached is not None:
+            outputs, model_state, digest = cached
+            model.set_checkpoint_state(model_state)
+            self._reused_steps += 1
+        else:
+            outputs = self._timed_step(model, year, state)
+            digest = content_digest(outputs)
+            self.output_cache.put(step_key, outputs, model.get_checkpoint_state(), digest)
+        self._step_keys[model.STATE_KEY] = step_key
+        self._output_digests[(year, model.STATE_KEY)] = digest
+        return outputs
+
+    def make_checkpoint(self, year, current_state, results):
+        """
+        Captures the run after 'year': current_state, every model's internal state and the
+        results recorded so far.
+        """
+        return Checkpoint(year, current_state,
+                          {model.STATE_KEY: model.get_checkpoint_state() for model in self.models},
+                          Checkpoint.snapshot_results(results), scenario=self.config.get("scenario"),
+                          spatial=self.spatial.snapshot() if self.spatial is not None else None)
+
+    def save_checkpoint(self, path, year, current_state, results):
+        """Writes make_checkpoint() to 'path'."""
+        checkpoint = self.make_checkpoint(year, current_state, results)
+        checkpoint.save(path)
+        logger.info("Checkpoint after year %s saved to: %s", year, path)
+        return checkpoint
+
+    def _restore_checkpoint(self, checkpoint):
+        """
+        Restores every model's internal state (and spatial fields) from a checkpoint.
+
+        Returns:
+            dict: A copy of the checkpoint's current_state. Copies, so scenarios forked from the
+                  same checkpoint object never share mutable state.
+        """
+        for model in self.models:
+            model.reset_state()
+            model.set_checkpoint_state(copy.deepcopy(checkpoint.model_states.get(model.STATE_KEY, {})))
+        if self.spatial is not None:
+            self.spatial.reset()
+            if checkpoint.spatial is not None:
+                self.spatial.restore(copy.deepcopy(checkpoint.spatial))
+        return copy.deepcopy(checkpoint.current_state)
+
+    def run_simulation(self, start_year=2025, end_year=2035, scenarios=None, results=None, writer=None,
+                       checkpoint_every=None, checkpoint_dir=None, resume_from=None):
         """
         Execute the simulation over the specified time period.
         
@@ -53,81 +180,221 @@ class BangladeshNaturalResourceSimulation:
             end_year (int): The ending year of the simulation (inclusive).
             scenarios (list, optional): List of scenario configurations to run. 
                                      Currently placeholder, runs one baseline.
+                                     Use ensemble.EnsembleRunner for Monte Carlo ensembles.
+            results (SimulationResults, optional): Store to record into, e.g. one member's
+                                                   view of a shared ensemble store. A new
+                                                   store is created if not given.
+            writer (optional): Streaming writer (see writers.open_results_writer) receiving
+                               each year's outputs as soon as they are produced, so long runs
+                               leave partial output behind if they fail. Not closed here.
+            checkpoint_every (int, optional): Write a checkpoint every N simulated years and after
+                                              the last year. Defaults to config['checkpoint_every_years'];
+                                              0 or None disables checkpointing.
+            checkpoint_dir (str, optional): Directory for checkpoint files. Defaults to
+                                            config['checkpoint_dir'].
+            resume_from (str or Checkpoint, optional): Continue from a checkpoint instead of
+                                                       starting fresh. Simulation resumes in the year
+                                                       after the checkpoint, and the checkpointed
+                                                       years within start_year..end_year are copied
+                                                       into the results. The checkpoint may come from
+                                                       a different configuration, e.g. to fork policy
+                                                       variants from a shared spin-up (see fork_scenarios).
                                      
         Returns:
-            dict: A dictionary containing the simulation results, structured by year.
+            SimulationResults: Columnar results store; reads like a dictionary
+                               structured by year (results[year][model][indicator]).
         """
-        print(f"--- Starting Simulation Run: {start_year}-{end_year} ---")
-        num_years = end_year - start_year + 1
-        simulation_results = {}
+        logger.info("--- Starting Simulation Run: %s-%s ---", start_year, end_year)
+        simulation_results = results if results is not None else SimulationResults(start_year, end_year)
         current_state = {} # Stores the latest state from all models
+        first_year = start_year
+
+        if checkpoint_every is None:
+            checkpoint_every = self.config.get("checkpoint_every_years", 0)
+        if checkpoint_dir is None:
+            checkpoint_dir = self.config.get("checkpoint_dir") or os.path.join(self.config.get("output_dir", "./outputs/"), "checkpoints")
 
-        # --- Initial State Setup (Optional) ---
-        # Could populate current_state with initial values from models if needed
-        # e.g., current_state['water'] = self.water_resources.get_initial_state()
-        print("Setting up initial state (placeholders)...")
+        if resume_from is not None:
+            checkpoint = resume_from if isinstance(resume_from, Checkpoint) else Checkpoint.load(resume_from)
+            if checkpoint.year < start_year - 1:
+                raise ValueError(f"Checkpoint ends in {checkpoint.year}, which leaves a gap before start year {start_year}")
+            current_state = self._restore_checkpoint(checkpoint)
+            checkpoint.restore_results(simulation_results)
+            first_year = checkpoint.year + 1
+            logger.info("Resuming from checkpoint after year %s (scenario: %s)", checkpoint.year, checkpoint.scenario)
+        else:
+            for model in self.models:
+                model.reset_state()
+            if self.spatial is not None:
+                self.spatial.reset()
+            # --- Initial State Setup (Optional) ---
+            # Could populate current_state with initial values from models if needed
+            # e.g., current_state['water'] = self.water_resources.get_initial_state()
+            logger.debug("Setting up initial state (placeholders)...")
+
+        step = self._timed_step
+        if self.output_cache is not None:
+            self._begin_incremental(start_year, checkpoint if resume_from is not None else None)
+            step = self._incremental_step
 
         # --- Simulation Loop ---
-        for i in range(num_years):
-            year = start_year + i
-            print(f"\n--- Simulating Year {year} ---")
-            year_results = {}
-            
-            # Define the order of model execution (can be adjusted based on dependencies)
-            # E.g., Climate impacts affect water, which affects land, etc.
-            # Passing 'current_state' allows models to potentially react to others' outputs
-            # from the same year, though current stubs are simple.
+        for year in range(first_year, end_year + 1):
+            logger.info("--- Simulating Year %s ---", year)
             
-            climate_state = self.climate_resilience.simulate_resilience_dynamics(year, current_state)
-            current_state['climate'] = climate_state
-            year_results['climate'] = climate_state
+            # The scheduler runs the models in dependency order (see each model's READS /
+            # LAGGED_READS): e.g. climate impacts affect water, which affects land, etc.
+            # Each model only sees the current_state keys it declared.
+            year_outputs = self.scheduler.run_year(year, current_state, step=step)
+            for key, model_state in year_outputs.items():
+                simulation_results.record(year, key, model_state)
+            if writer is not None:
+                writer.write_year(year, year_outputs)
 
-            water_state = self.water_resources.simulate_step(year, current_state)
-            current_state['water'] = water_state
-            year_results['water'] = water_state
-            
-            land_state = self.land_resources.simulate_land_dynamics(year, current_state)
-            current_state['land'] = land_state
-            year_results['land'] = land_state
-            
-            forest_state = self.forest_resources.simulate_forest_dynamics(year, current_state)
-            current_state['forest'] = forest_state
-            year_results['forest'] = forest_state
-            
-            biodiversity_state = self.biodiversity.simulate_biodiversity_dynamics(year, current_state)
-            current_state['biodiversity'] = biodiversity_state
-            year_results['biodiversity'] = biodiversity_state
-            
-            marine_state = self.marine_resources.simulate_marine_dynamics(year, current_state)
-            current_state['marine'] = marine_state
-            year_results['marine'] = marine_state
-            
-            mineral_state = self.mineral_resources.simulate_mineral_dynamics(year, current_state)
-            current_state['mineral'] = mineral_state
-            year_results['mineral'] = mineral_state
-            
-            energy_state = self.energy_resources.simulate_energy_dynamics(year, current_state)
-            current_state['energy'] = energy_state
-            year_results['energy'] = energy_state
-            
-            community_state = self.community_resource.simulate_community_dynamics(year, current_state)
-            current_state['community'] = community_state
-            year_results['community'] = community_state
-            
-            governance_state = self.resource_governance.simulate_governance_dynamics(year, current_state)
-            current_state['governance'] = governance_state
-            year_results['governance'] = governance_state
+            if checkpoint_every and ((year - start_year + 1) % checkpoint_every == 0 or year == end_year):
+                self.save_checkpoint(checkpoint_path(checkpoint_dir, self.config.get("scenario", "scenario"), year),
+                                     year, current_state, simulation_results)
             
-            sustainability_state = self.sustainable_use.simulate_sustainability_dynamics(year, current_state)
-            current_state['sustainable_use'] = sustainability_state
-            year_results['sustainable_use'] = sustainability_state
-            
-            conservation_state = self.conservation.simulate_conservation_dynamics(year, current_state)
-            current_state['conservation'] = conservation_state
-            year_results['conservation'] = conservation_state
-            
-            simulation_results[year] = year_results
-            print(f"--- Finished Simulating Year {year} ---")
+            logger.debug("--- Finished Simulating Year %s ---", year)
+
+        self.current_state = current_state
+        if self.output_cache is not None and self._reused_steps:
+            logger.info("Incremental run: %s of %s model steps reused from earlier runs", self._reused_steps,
+                        len(self.models) * (end_year - first_year + 1))
+        logger.info("--- Simulation Run Finished (%s-%s) ---", start_year, end_year)
+        return simulation_results
+
+    def run_simulation_cached(self, start_year=2025, end_year=2035, writer=None, cache=None):
+        """
+        Like run_simulation, but served from the content-addressed result cache (see cache.py)
+        where possible. A cached run of the same configuration and start year that reaches
+        end_year is returned without simulating; a shorter one is extended, simulating only
+        the missing years. New results are stored back into the cache.
+
+        On a full hit the simulation ends up as after a real run: self.current_state holds the
+        end_year outputs and, when the cached run ends at end_year, every model's internal state
+        is restored too, so make_checkpoint() / run_simulation(resume_from=...) continue from it.
+        When the cached run is longer than requested, only the end_year outputs are available
+        and the models are reset to their initial internal state.
+
+        Args:
+            start_year (int): The starting year of the simulation.
+            end_year (int): The ending year of the simulation (inclusive).
+            writer (optional): Streaming writer, receiving cached years as well as simulated ones.
+            cache (ScenarioResultCache, optional): Defaults to a cache in config['result_cache_dir'].
+
+        Returns:
+            SimulationResults: Results for start_year..end_year.
+        """
+        cache = cache or ScenarioResultCache(self.config.get("result_cache_dir", "./cache/results/"))
+        key = config_fingerprint(self.config, start_year)
+        cached = cache.get(key)
+        if cached is None:
+            logger.info("Result cache miss (%s...)", key[:12])
+        elif cached.year >= end_year:
+            logger.info("Result cache hit (%s...): %s-%s served from cache", key[:12], start_year, end_year)
+        else:
+            logger.info("Result cache prefix hit (%s...): reusing %s-%s", key[:12], start_year, cached.year)
+
+        results = SimulationResults(start_year, end_year)
+        if cached is not None:
+            cached.restore_results(results)
+            if writer is not None:
+                for year, year_view in results.items():
+                    writer.write_year(year, {model: dict(model_view) for model, model_view in year_view.items()})
+            if cached.year == end_year:
+                self.current_state = self._restore_checkpoint(cached)
+                return results
+            if cached.year > end_year:
+                for model in self.models:
+                    model.reset_state()
+                if self.spatial is not None:
+                    self.spatial.reset()
+                self.current_state = {model: dict(model_view) for model, model_view in results[end_year].items()}
+                return results
+
+        results = self.run_simulation(start_year=start_year, end_year=end_year, results=results,
+                                      writer=writer, resume_from=cached)
+        cache.put(key, self.make_checkpoint(end_year, self.current_state, results))
+        return results
+
+    def run_batch(self, parameter_sets, start_year=2025, end_year=2035):
+        """
+        Execute the simulation for a batch of scenarios at once. Each year, every model
+        advances all scenarios in a single NumPy pass (see ResourceModel.simulate_batch)
+        instead of one Python call per scenario.
+
+        Args:
+            parameter_sets (dict): Dotted config path -> array of shape (n_scenarios,), e.g.
+                                   {"model_params.policy.renewable_energy_subsidy_level": np.linspace(0, 0.5, 500)}.
+                                   Parameters not listed are taken from the configuration.
+            start_year (int): The starting year of the simulation.
+            end_year (int): The ending year of the simulation (inclusive).
+
+        Returns:
+            EnsembleResults: One member per scenario, holding the numeric indicators.
+        """
+        sizes = {len(values) for values in parameter_sets.values()}
+        if len(sizes) != 1:
+            raise ValueError(f"All parameter arrays must have the same length, got {sorted(sizes)}")
+        n_scenarios = sizes.pop()
+        logger.info("--- Starting Batched Simulation Run: %s scenarios, %s-%s ---", n_scenarios, start_year, end_year)
+
+        # Route each dotted path to the model that declares the parameter
+        model_params = {}
+        for model in self.models:
+            model_params[model.STATE_KEY] = {
+                name: np.asarray(parameter_sets[f"model_params.{section}.{name}"])
+                for name, (section, _) in model.PARAMETERS.items()
+                if f"model_params.{section}.{name}" in parameter_sets}
+        unknown = set(parameter_sets) - {f"model_params.{section}.{name}" for model in self.models
+                                         for name, (section, _) in model.PARAMETERS.items()}
+        if unknown:
+            raise ValueError(f"No model declares parameters {sorted(unknown)}")
+
+        def batch_step(model, year, state):
+            with self.profiler.measure('simulate_batch', model.STATE_KEY, year):
+                return model.simulate_batch(year, state, model_params[model.STATE_KEY], n_scenarios)
+
+        for model in self.models:
+            model.reset_state()
+        if self.spatial is not None:
+            self.spatial.reset()
+        batch_results = None
+        current_state = {}
+        for year in range(start_year, end_year + 1):
+            year_outputs = self.scheduler.run_year(year, current_state, step=batch_step)
+
+            if batch_results is None:
+                columns = [(key, indicator) for key, outputs in year_outputs.items()
+                           for indicator, values in outputs.items() if values.dtype == np.float64]
+                batch_results = EnsembleResults(start_year, end_year, columns, n_scenarios)
+                batch_results.parameters = {path: list(values) for path, values in parameter_sets.items()}
+            for key, outputs in year_outputs.items():
+                batch_results.record_batch(year, key, outputs)
+
+        logger.info("--- Batched Simulation Run Finished (%s-%s) ---", start_year, end_year)
+        return batch_results
+
+
+def fork_scenarios(checkpoint, scenario_configs, end_year):
+    """
+    Continues several scenarios from one checkpoint, e.g. policy variants sharing a spin-up
+    period that was simulated (and checkpointed) once.
+
+    Args:
+        checkpoint (str or Checkpoint): The spin-up checkpoint.
+        scenario_configs (dict): Scenario name -> configuration dictionary.
+        end_year (int): Last year to simulate for every scenario.
 
-        print(f"\n--- Simulation Run Finished ({start_year}-{end_year}) ---")
-        return simulation_results 
\ No newline at end of file
+    Returns:
+        dict: Scenario name -> SimulationResults covering the spin-up and the scenario's own years.
+    """
+    if not isinstance(checkpoint, Checkpoint):
+        checkpoint = Checkpoint.load(checkpoint)
+    start_year = int(checkpoint.results["years"][0]) if len(checkpoint.results["years"]) else checkpoint.year + 1
+    forked = {}
+    for name, scenario_config in scenario_configs.items():
+        logger.info("--- Forking scenario '%s' from year %s ---", name, checkpoint.year)
+        simulation = BangladeshNaturalResourceSimulation(config=scenario_config)
+        forked[name] = simulation.run_simulation(start_year=start_year, end_year=end_year, resume_from=checkpoint)
+    return forked
@@ -0,0 +1,281 @@
+# spatial.py
+
+import numpy as np
+
+from . import kernels
+from .scheduler import UndeclaredStateReadError
+
+
+def indicator(value):
+    """Returns a national aggregate as a float, or as an array for batched scenarios."""
+    return float(value) if np.ndim(value) == 0 else value
+
+
+def per_scenario(value):
+    """Adds a trailing cell axis to a scalar or (n_scenarios,) parameter so it broadcasts against fields."""
+    return np.asarray(value, dtype=float)[..., None]
+
+
+class SpatialGrid:
+    """Raster cells or administrative units (districts/upazilas) with attributes and a neighbor graph, held in flat NumPy arrays"""
+    def __init__(self, attributes, edges, shape=None):
+        """
+        Initializes the SpatialGrid.
+
+        Field values are arrays of shape (n_cells,) or, for batched scenarios,
+        (n_scenarios, n_cells); all operators work along the last axis.
+
+        Args:
+            attributes (dict): Per-cell arrays of length n_cells. Required: 'area_sqkm',
+                               'elevation_m', 'coastal' (bool), 'river' (bool) and 'district'
+                               (int, 0-based). Optional: 'extraction_weight', 'urban_fraction',
+                               'initial_salinity_ppt'.
+            edges (tuple): (sources, targets) integer arrays listing every neighbor pair in
+                           both directions.
+            shape (tuple, optional): (rows, cols) for rasters, used by as_raster().
+        """
+        self.attributes = {name: np.asarray(values) for name, values in attributes.items()}
+        self.n_cells = len(self.attributes["area_sqkm"])
+        self.shape = shape
+        sources, targets = (np.asarray(side, dtype=np.intp) for side in edges)
+        # CSR layout: neighbors of cell i are targets[indptr[i]:indptr[i + 1]]
+        order = np.argsort(sources, kind='stable')
+        self.targets = targets[order]
+        self.degree = np.bincount(sources, minlength=self.n_cells)
+        self.indptr = np.concatenate(([0], np.cumsum(self.degree)))
+        # reduceat needs valid start indices; isolated cells are zeroed after the reduction
+        self._starts = np.minimum(self.indptr[:-1], max(len(self.targets) - 1, 0))
+        self._isolated = self.degree == 0
+        self._any_isolated = bool(self._isolated.any())
+        self._inverse_degree = 1.0 / np.maximum(self.degree, 1)
+        self.n_districts = int(self.attributes["district"].max()) + 1 if self.n_cells else 0
+        # Set by raster(): neighbors are the 4-neighborhood, so operators can use shifted slices
+        self._four_neighbor_raster = False
+
+    @classmethod
+    def raster(cls, rows, cols, cell_km=1.0, districts_per_side=8):
+        """
+        Builds a synthetic, Bangladesh-like raster with 4-neighbor connectivity: the coast
+        along the southern edge, elevation rising inland, Ganges-Padma, Brahmaputra-Jamuna
+        and Meghna channels, urban centres at Dhaka, Chattogram and Khulna, and
+        districts_per_side**2 rectangular districts.
+        Placeholder until rasterized national datasets are ingested.
+        """
+        row, col = np.divmod(np.arange(rows * cols), cols)
+        y = row / max(rows - 1, 1) # 0 north .. 1 coast
+        x = col / max(cols - 1, 1) # 0 west .. 1 east
+        distance_from_coast_km = (rows - 1 - row) * cell_km
+        elevation = 0.3 + 0.12 * distance_from_coast_km + 1.5 * (1 + np.sin(6 * np.pi * x) * np.sin(4 * np.pi * y))
+        channel_width = max(1.5 / cols, 0.004)
+        jamuna = (y < 0.5) & (np.abs(x - (0.45 + 0.03 * np.sin(5 * np.pi * y))) < channel_width)
+        ganges = (x < 0.45) & (np.abs(y - (0.5 + 0.03 * np.sin(4 * np.pi * x))) < channel_width)
+        padma_meghna = (y >= 0.5) & (np.abs(x - (0.45 + 0.3 * (y - 0.5))) < channel_width)
+        upper_meghna = (y >= 0.2) & (y < 0.5) & (np.abs(x - (0.75 - 0.2 * (y - 0.2))) < channel_width)
+        river = jamuna | ganges | padma_meghna | upper_meghna
+        elevation = np.where(river, elevation - 1.0, elevation).clip(min=0.1)
+
+        urban = np.zeros(rows * cols)
+        for cx, cy, radius in ((0.5, 0.45, 0.04), (0.85, 0.8, 0.025), (0.3, 0.85, 0.02)): # Dhaka, Chattogram, Khulna
+            urban = np.maximum(urban, 0.9 * np.exp(-((x - cx) ** 2 + (y - cy) ** 2) / (2 * radius ** 2)))
+
+        district = (row * districts_per_side // rows) * districts_per_side + (col * districts_per_side // cols)
+        attributes = {
+            "area_sqkm": np.full(rows * cols, cell_km ** 2),
+            "elevation_m": elevation,
+            "coastal": row == rows - 1,
+            "river": river,
+            "district": district,
+            "extraction_weight": 0.5 + (1 - y) * (1 - x) * 1.5, # Heaviest pumping in the north-west (Barind)
+            "urban_fraction": urban,
+            "initial_salinity_ppt": 30 * np.exp(-distance_from_coast_km / 25) * np.exp(-elevation / 3),
+        }
+
+        index = np.arange(rows * cols).reshape(rows, cols)
+        pairs = [(index[:, :-1].ravel(), index[:, 1:].ravel()), (index[:-1, :].ravel(), index[1:, :].ravel())]
+        sources = np.concatenate([side for a, b in pairs for side in (a, b)])
+        targets = np.concatenate([side for a, b in pairs for side in (b, a)])
+        grid = cls(attributes, (sources, targets), shape=(rows, cols))
+        grid._four_neighbor_raster = True
+        return grid
+
+    @classmethod
+    def from_units_file(cls, path):
+        """
+        Loads polygon units (e.g. 64 districts or ~495 upazilas) from an .npz file holding
+        one array per attribute plus 'edges' of shape (n_pairs, 2) listing each adjacent pair once.
+        """
+        with np.load(path) as data:
+            attributes = {name: data[name] for name in data.files if name != "edges"}
+            pairs = data["edges"]
+        sources = np.concatenate((pairs[:, 0], pairs[:, 1]))
+        targets = np.concatenate((pairs[:, 1], pairs[:, 0]))
+        return cls(attributes, (sources, targets))
+
+    @classmethod
+    def from_config(cls, spec):
+        """
+        Builds a grid from config['spatial_grid']:
+            {"kind": "raster", "rows": 390, "cols": 390, "cell_km": 1.0} (synthetic ~1 km raster)
+            {"kind": "units", "path": "./data/input/spatial/upazilas.npz"}
+        """
+        if spec["kind"] == "raster":
+            return cls.raster(spec["rows"], spec["cols"], cell_km=spec.get("cell_km", 1.0),
+                              districts_per_side=spec.get("districts_per_side", 8))
+        if spec["kind"] == "units":
+            return cls.from_units_file(spec["path"])
+        raise ValueError(f"Unknown spatial grid kind '{spec['kind']}'; expected 'raster' or 'units'")
+
+    # --- Neighbor operators (vectorized over all cells and any leading scenario axes) ---
+
+    def _reduce_neighbors(self, ufunc, values, empty):
+        values = np.asarray(values)
+        if self._four_neighbor_raster:
+            return self._reduce_raster_neighbors(ufunc, values, empty)
+        if not len(self.targets):
+            return np.full(values.shape, empty, dtype=values.dtype)
+        reduced = ufunc.reduceat(values[..., self.targets], self._starts, axis=-1)
+        reduced[..., self._isolated] = empty
+        return reduced
+
+    def _reduce_raster_neighbors(self, ufunc, values, empty):
+        """Same result as the CSR gather, from four shifted slices without an edge-sized temporary."""
+        field = values.reshape(values.shape[:-1] + self.shape)
+        reduced = np.full(field.shape, empty, dtype=np.result_type(values, empty))
+        ufunc(reduced[..., :, 1:], field[..., :, :-1], out=reduced[..., :, 1:]) # West neighbor
+        ufunc(reduced[..., :, :-1], field[..., :, 1:], out=reduced[..., :, :-1]) # East
+        ufunc(reduced[..., 1:, :], field[..., :-1, :], out=reduced[..., 1:, :]) # North
+        ufunc(reduced[..., :-1, :], field[..., 1:, :], out=reduced[..., :-1, :]) # South
+        return reduced.reshape(values.shape)
+
+    def neighbor_sum(self, values):
+        """Sum of each cell's neighbor values."""
+        return self._reduce_neighbors(np.add, values, 0)
+
+    def neighbor_mean(self, values):
+        """Mean of each cell's neighbor values (the cell's own value for isolated cells)."""
+        mean = self.neighbor_sum(values) * self._inverse_degree
+        return np.where(self._isolated, values, mean) if self._any_isolated else mean
+
+    def neighbor_max(self, values):
+        """Maximum of each cell's neighbor values (-inf for isolated cells)."""
+        return self._reduce_neighbors(np.maximum, np.asarray(values, dtype=float), -np.inf)
+
+    def diffuse(self, values, rate, iterations=1, fixed=None, fixed_values=None):
+        """
+        Explicit diffusion: each iteration moves every cell 'rate' of the way towards its
+        neighbor mean. Cells in the 'fixed' mask are held at fixed_values (boundary sources).
+
+        Args:
+            values: Field of shape (..., n_cells).
+            rate: Scalar or per-cell array in [0, 1].
+            iterations (int): Number of diffusion steps.
+            fixed (np.ndarray, optional): Boolean mask of boundary cells.
+            fixed_values: Boundary value; scalar or broadcastable to (..., n_cells), e.g. shape
+                          (n_scenarios, 1) for one boundary value per scenario.
+        """
+        values = np.asarray(values, dtype=float)
+        loop = kernels.loop_kernel("diffuse_csr")
+        if loop is not None:
+            rows = values.reshape(-1, self.n_cells)
+            fixed_mask = np.zeros(self.n_cells, dtype=bool) if fixed is None else np.asarray(fixed, dtype=bool)
+            fixed_rows = np.zeros_like(rows) if fixed is None else np.ascontiguousarray(np.broadcast_to(fixed_values, values.shape), dtype=float).reshape(rows.shape)
+            rate_rows = np.ascontiguousarray(np.broadcast_to(rate, values.shape), dtype=float).reshape(rows.shape)
+            return loop(rows, self.indptr, self.targets, rate_rows, iterations, fixed_mask, fixed_rows).reshape(values.shape)
+        for _ in range(iterations):
+            if fixed is not None:
+                values = np.where(fixed, fixed_values, values)
+            values = values + rate * (self.neighbor_mean(values) - values)
+        if fixed is not None:
+            values = np.where(fixed, fixed_values, values)
+        return values
+
+    def propagate_level(self, levels, loss_per_step, iterations):
+        """
+        Spreads a water (or salt front) level outwards: each iteration a cell takes the highest
+        neighbor level minus loss_per_step if that exceeds its own. Stops early once stable.
+        """
+        levels = np.array(levels, dtype=float)
+        loop = kernels.loop_kernel("propagate_level_csr")
+        if loop is not None:
+            return loop(levels.reshape(-1, self.n_cells), self.indptr, self.targets, float(loss_per_step), iterations).reshape(levels.shape)
+        for _ in range(iterations):
+            updated = np.maximum(levels, self.neighbor_max(levels) - loss_per_step)
+            if np.array_equal(updated, levels):
+                break
+            levels = updated
+        return levels
+
+    # --- Aggregation ---
+
+    def total_area(self, mask):
+        """Area (sq km) of the cells in a boolean mask, or weighted by a fraction field, of shape (..., n_cells)."""
+        return np.asarray(mask, dtype=float) @ self.attributes["area_sqkm"]
+
+    def area_weighted_mean(self, values):
+        """National area-weighted mean of a field of shape (..., n_cells)."""
+        area = self.attributes["area_sqkm"]
+        return np.asarray(values, dtype=float) @ area / area.sum()
+
+    def aggregate(self, values, by="district"):
+        """
+        Area-weighted mean of a (n_cells,) field per unit of an integer attribute (e.g. district).
+
+        Returns:
+            np.ndarray: One value per unit (0..max id).
+        """
+        units = self.attributes[by]
+        area = self.attributes["area_sqkm"]
+        return np.bincount(units, weights=values * area) / np.maximum(np.bincount(units, weights=area), 1e-12)
+
+    def as_raster(self, values):
+        """Reshapes a (..., n_cells) field to (..., rows, cols) for plotting."""
+        if self.shape is None:
+            raise ValueError("Grid has no raster shape (polygon units)")
+        return np.asarray(values).reshape(np.shape(values)[:-1] + self.shape)
+
+
+class SpatialState:
+    """Named per-cell fields of one simulation run, written by their owning model"""
+    def __init__(self, grid):
+        """
+        Args:
+            grid (SpatialGrid): The grid shared by all spatial models.
+        """
+        self.grid = grid
+        self.fields = {}
+        self.owners = {}
+
+    def reset(self):
+        """Drops all fields, e.g. at the start of a new run."""
+        self.fields = {}
+        self.owners = {}
+
+    def write(self, model, name, values):
+        """Stores a field owned by 'model' (its STATE_KEY)."""
+        self.owners[name] = model.STATE_KEY
+        self.fields[name] = values
+
+    def read(self, model, name, default=None):
+        """
+        Returns a field for 'model'. Fields of other models may only be read if their owner is
+        in the reader's READS (this year's field) or LAGGED_READS (the previous year's field, as
+        the owner runs later in the year), mirroring the scheduler's current_state rules.
+
+        Raises:
+            UndeclaredStateReadError: If the field's owner is not a declared dependency.
+        """
+        if name not in self.fields:
+            return default
+        owner = self.owners[name]
+        if owner != model.STATE_KEY and owner not in model.READS and owner not in model.LAGGED_READS:
+            raise UndeclaredStateReadError(
+                f"Model '{model.STATE_KEY}' read spatial field '{name}' of '{owner}' without declaring it in READS or LAGGED_READS")
+        return self.fields[name]
+
+    def snapshot(self):
+        """Fields and owners for a checkpoint."""
+        return {"fields": dict(self.fields), "owners": dict(self.owners)}
+
+    def restore(self, snapshot):
+        self.fields = dict(snapshot["fields"])
+        self.owners = dict(snapshot["owners"])
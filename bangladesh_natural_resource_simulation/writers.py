@@ -0,0 +1,186 @@
+# writers.py
+
+import glob
+import json
+import os
+
+import numpy as np
+
+from .results import SimulationResults
+
+
+def _json_default(value):
+    """Serializes NumPy scalars as plain numbers and anything else as its string form."""
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+class NDJSONResultsWriter:
+    """Append each simulated year to a newline-delimited JSON file as soon as it is produced"""
+    def __init__(self, path):
+        """
+        Opens the output file. Every line is one compact JSON object:
+            {"year": 2025, "water": {"groundwater_level_change": -0.05, ...}, "land": {...}, ...}
+
+        Args:
+            path (str): Output file (conventionally *.ndjson); replaced if it exists.
+        """
+        self.path = path
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def write_year(self, year, year_outputs):
+        """
+        Appends one year's outputs and flushes, so a crashed run leaves every completed year on disk.
+
+        Args:
+            year (int): The simulation year.
+            year_outputs (dict): Model key -> indicator dict, as returned by ModelScheduler.run_year.
+        """
+        record = {"year": int(year)}
+        record.update(year_outputs)
+        self._file.write(json.dumps(record, separators=(',', ':'), default=_json_default))
+        self._file.write('\n')
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+        return False
+
+
+class NpzChunkResultsWriter:
+    """Buffer years and write them as columnar .npz chunks of a fixed number of years"""
+    def __init__(self, directory, chunk_years=10):
+        """
+        Each chunk file 'chunk_<first year>_<last year>.npz' holds a 'year' array plus one
+        array per '<model>.<indicator>' over the chunk's years (float64 for numeric indicators,
+        unicode strings otherwise). Chunks are written atomically, so a crashed run leaves only
+        complete chunks; at most chunk_years years are held in memory.
+
+        Args:
+            directory (str): Output directory; created if missing. Existing chunks are removed.
+            chunk_years (int): Number of years per chunk.
+        """
+        self.directory = directory
+        self.path = directory
+        self.chunk_years = chunk_years
+        os.makedirs(directory, exist_ok=True)
+        for stale in glob.glob(os.path.join(directory, 'chunk_*.npz')):
+            os.remove(stale)
+        self._years = []
+        self._buffer = {}
+
+    def write_year(self, year, year_outputs):
+        """
+        Buffers one year's outputs, writing a chunk once chunk_years years are buffered.
+
+        Args:
+            year (int): The simulation year.
+            year_outputs (dict): Model key -> indicator dict, as returned by ModelScheduler.run_year.
+        """
+        for model, state in year_outputs.items():
+            for indicator, value in state.items():
+                column = self._buffer.setdefault(f"{model}.{indicator}", [None] * len(self._years))
+                column.append(value)
+        self._years.append(int(year))
+        for column in self._buffer.values():
+            if len(column) < len(self._years):
+                column.append(None)
+        if len(self._years) >= self.chunk_years:
+            self._write_chunk()
+
+    def _write_chunk(self):
+        if not self._years:
+            return
+        arrays = {"year": np.array(self._years)}
+        for name, values in self._buffer.items():
+            if all(isinstance(value, (int, float, np.number)) and not isinstance(value, bool)
+                   for value in values if value is not None):
+                arrays[name] = np.array([np.nan if value is None else value for value in values], dtype=float)
+            else:
+                arrays[name] = np.array(['' if value is None else str(value) for value in values])
+        path = os.path.join(self.directory, f"chunk_{self._years[0]}_{self._years[-1]}.npz")
+        tmp_path = os.path.join(self.directory, f".partial_{self._years[0]}.npz")
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+        self._years = []
+        self._buffer = {}
+
+    def close(self):
+        """Writes the final, possibly partial chunk."""
+        self._write_chunk()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+        return False
+
+
+def open_results_writer(config, output_dir):
+    """
+    Creates the streaming writer selected by config['results_format'].
+
+    Config keys:
+        results_format (str): 'ndjson' (default), 'npz' or 'none'.
+        results_chunk_years (int): Years per chunk for 'npz' (default 10).
+
+    Returns:
+        NDJSONResultsWriter, NpzChunkResultsWriter or None.
+    """
+    results_format = config.get("results_format", "ndjson")
+    scenario = config.get("scenario", "scenario")
+    if results_format == "ndjson":
+        return NDJSONResultsWriter(os.path.join(output_dir, f"simulation_results_{scenario}.ndjson"))
+    if results_format == "npz":
+        return NpzChunkResultsWriter(os.path.join(output_dir, f"simulation_results_{scenario}"),
+                                     chunk_years=config.get("results_chunk_years", 10))
+    if results_format == "none":
+        return None
+    raise ValueError(f"Unknown results_format '{results_format}'; expected 'ndjson', 'npz' or 'none'")
+
+
+def read_ndjson_results(path):
+    """
+    Loads an NDJSON results file back into a SimulationResults store.
+    Partial files from interrupted runs load the years that were completed.
+    """
+    with open(path, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    if not records:
+        raise ValueError(f"No simulated years in {path}")
+    years = [record["year"] for record in records]
+    results = SimulationResults(min(years), max(years))
+    for record in records:
+        year = record.pop("year")
+        for model, state in record.items():
+            results.record(year, model, state)
+    return results
+
+
+def read_npz_chunks(directory):
+    """
+    Loads the .npz chunks of a run and concatenates them per column.
+
+    Returns:
+        dict: 'year' and '<model>.<indicator>' -> array over all written years.
+    """
+    paths = sorted(glob.glob(os.path.join(directory, 'chunk_*.npz')),
+                   key=lambda path: int(os.path.basename(path).split('_')[1]))
+    chunks = []
+    for path in paths:
+        with np.load(path) as chunk:
+            chunks.append({name: chunk[name] for name in chunk.files})
+    names = {name for chunk in chunks for name in chunk}
+    # Indicators first produced in a later chunk are NaN-padded for the earlier years
+    return {name: np.concatenate([chunk[name] if name in chunk else np.full(len(chunk["year"]), np.nan)
+                                  for chunk in chunks])
+            for name in names}
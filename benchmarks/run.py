@@ -0,0 +1,154 @@
+# run.py
+
+"""
+Benchmark runner: times every case in benchmarks/suite.py, appends the run to a history
+file and compares it with a stored baseline.
+
+    python -m benchmarks.run                     # run all, compare with the baseline
+    python -m benchmarks.run -k run_simulation   # only benchmarks whose name contains the text
+    python -m benchmarks.run --save-baseline     # make this run the new baseline
+    python -m benchmarks.run --scale 4           # 4x scenarios / districts in the scale-up cases
+
+Exits with status 1 if any benchmark's median is more than --threshold slower than its baseline.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from bangladesh_natural_resource_simulation import kernels
+from .suite import BENCHMARKS
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    """Machine and software details stored with every run; baselines only compare like with like."""
+    return {"machine": platform.node(), "platform": platform.platform(), "python": platform.python_version(),
+            "numpy": np.__version__, "kernel_backend": kernels.get_backend(), "commit": _git_commit()}
+
+
+def time_benchmark(setup, param, scale, repeat, workdir, min_sample_seconds=0.01):
+    """
+    Runs the setup once, then the timed callable once to warm up and 'repeat' more times.
+    Fast callables are called several times per timed sample (at least min_sample_seconds),
+    as with timeit's autorange.
+
+    Returns:
+        dict: 'min', 'median' and 'mean' seconds per call, the number of samples and calls per sample.
+    """
+    function = setup(param, scale, workdir)
+    start = time.perf_counter_ns()
+    function()
+    warmup = (time.perf_counter_ns() - start) / 1e9
+    number = max(1, int(min_sample_seconds / max(warmup, 1e-9)))
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter_ns() - start) / 1e9 / number)
+    return {"min": min(timings), "median": statistics.median(timings), "mean": statistics.fmean(timings),
+            "runs": repeat, "number": number}
+
+
+def run_benchmarks(names, scale=1, repeat=5):
+    """Times the named benchmarks in a temporary working directory; returns name -> timing stats."""
+    results = {}
+    workdir = tempfile.mkdtemp(prefix="bnrs_bench_")
+    try:
+        for name in names:
+            setup, param = BENCHMARKS[name]
+            results[name] = time_benchmark(setup, param, scale, repeat, workdir)
+            print(f"{name:<40} {results[name]['median'] * 1e3:>12.3f} ms", flush=True)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Compares median timings with a baseline run.
+
+    Returns:
+        list: (name, baseline median, median, ratio) for benchmarks slower than 1 + threshold.
+    """
+    regressions = []
+    for name, stats in results.items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            continue
+        ratio = stats["median"] / reference["median"]
+        if ratio > 1 + threshold:
+            regressions.append((name, reference["median"], stats["median"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the simulation, analysis and serialization stages.")
+    parser.add_argument("-k", "--filter", default="", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark (after one warm-up run)")
+    parser.add_argument("--scale", type=int, default=1, help="Multiplier for scenarios/districts in scale-up cases")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown of the median (0.25 = 25%%)")
+    parser.add_argument("--results-dir", default=RESULTS_DIR, help="Where the baseline and history are kept")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if args.filter in name]
+    if not names:
+        parser.error(f"No benchmark matches '{args.filter}'")
+    run = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "scale": args.scale, "environment": environment(),
+           "results": run_benchmarks(names, scale=args.scale, repeat=args.repeat)}
+
+    os.makedirs(args.results_dir, exist_ok=True)
+    with open(os.path.join(args.results_dir, "history.jsonl"), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(run) + "\n")
+
+    baseline_path = os.path.join(args.results_dir, f"baseline_scale{args.scale}.json")
+    status = 0
+    if os.path.exists(baseline_path):
+        with open(baseline_path, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline["environment"]["machine"] != run["environment"]["machine"]:
+            print(f"Note: baseline was recorded on '{baseline['environment']['machine']}'; timings may not be comparable")
+        regressions = compare(run["results"], baseline, args.threshold)
+        for name, reference, median, ratio in regressions:
+            print(f"REGRESSION {name}: {reference * 1e3:.3f} ms -> {median * 1e3:.3f} ms ({ratio:.2f}x)")
+        if regressions:
+            status = 1
+        else:
+            print(f"No regressions against baseline from {baseline['timestamp']} (threshold {args.threshold:.0%})")
+    else:
+        print(f"No baseline at {baseline_path}; run with --save-baseline to create one")
+
+    if args.save_baseline:
+        if os.path.exists(baseline_path):
+            with open(baseline_path, encoding='utf-8') as f:
+                previous = json.load(f)
+            # Keep the timings of benchmarks not run this time (e.g. with --filter)
+            run["results"] = {**previous["results"], **run["results"]}
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(run, f, indent=2)
+        print(f"Baseline saved to {baseline_path}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+# suite.py
+
+import copy
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+from bangladesh_natural_resource_simulation.config import SIMULATION_CONFIG, BASELINE_CONFIG, SENSITIVITY_SETTINGS
+from bangladesh_natural_resource_simulation.simulation import BangladeshNaturalResourceSimulation
+from bangladesh_natural_resource_simulation.analysis.engine import NaturalResourceAnalysisEngine
+from bangladesh_natural_resource_simulation.checkpoint import Checkpoint
+from bangladesh_natural_resource_simulation.emulator import Emulator
+from bangladesh_natural_resource_simulation.frozen_config import FrozenConfig
+from bangladesh_natural_resource_simulation.writers import NDJSONResultsWriter, NpzChunkResultsWriter
+
+# Benchmark name -> (setup function, parameter values); filled by @benchmark
+BENCHMARKS = {}
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+START_YEAR = 2025
+MODEL_KEYS = ("climate", "water", "land", "forest", "biodiversity", "marine", "mineral",
+              "energy", "community", "governance", "sustainable_use", "conservation")
+
+
+def benchmark(name, params=(None,)):
+    """
+    Registers a benchmark. The decorated setup function is called as setup(param, scale, workdir)
+    outside the timed region and returns the zero-argument callable that is timed.
+
+    Args:
+        name (str): Benchmark name; parametrized benchmarks are reported as 'name[param]'.
+        params (tuple): Parameter values, one benchmark per value.
+    """
+    def register(setup):
+        for param in params:
+            BENCHMARKS[name if param is None else f"{name}[{param}]"] = (setup, param)
+        return setup
+    return register
+
+
+def benchmark_config(workdir, **overrides):
+    """Baseline configuration with output, caching and logging switched off or redirected to 'workdir'."""
+    config = copy.deepcopy(SIMULATION_CONFIG)
+    config.update({"quiet": True, "result_cache": False, "results_format": "none",
+                   "checkpoint_every_years": 0, "output_dir": os.path.join(workdir, "outputs"),
+                   "checkpoint_dir": os.path.join(workdir, "checkpoints")})
+    config.update(overrides)
+    return config
+
+
+def _years(n_years):
+    return START_YEAR, START_YEAR + n_years - 1
+
+
+# --- Import time (fresh interpreter per call, so module caches do not hide the cost) ---
+
+IMPORT_TARGETS = {
+    "interpreter": "pass", # Reference: interpreter startup alone
+    "package": "import bangladesh_natural_resource_simulation",
+    "simulation": "import bangladesh_natural_resource_simulation.simulation",
+    "ensemble": "import bangladesh_natural_resource_simulation.ensemble",
+    "main": "import bangladesh_natural_resource_simulation.main",
+}
+
+
+@benchmark("import_time", params=tuple(IMPORT_TARGETS))
+def import_time(target, scale, workdir):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (REPO_ROOT, os.environ.get("PYTHONPATH")))))
+    command = [sys.executable, "-c", IMPORT_TARGETS[target]]
+    return lambda: subprocess.run(command, env=env, cwd=workdir, check=True)
+
+
+# --- Simulation ---
+
+@benchmark("construction")
+def construction(param, scale, workdir):
+    config = benchmark_config(workdir)
+    return lambda: BangladeshNaturalResourceSimulation(config)
+
+
+@benchmark("model_step", params=MODEL_KEYS)
+def model_step(key, scale, workdir):
+    simulation = BangladeshNaturalResourceSimulation(benchmark_config(workdir))
+    simulation.run_simulation(START_YEAR, START_YEAR) # Populates the state a second year reads
+    model = next(model for model in simulation.models if model.STATE_KEY == key)
+    step = getattr(model, model.SIMULATE_METHOD)
+    state = simulation.current_state
+    return lambda: step(START_YEAR + 1, state)
+
+
+@benchmark("run_simulation", params=(11, 50, 100))
+def run_simulation(n_years, scale, workdir):
+    simulation = BangladeshNaturalResourceSimulation(benchmark_config(workdir))
+    return lambda: simulation.run_simulation(*_years(n_years))
+
+
+@benchmark("incremental_rerun", params=("conservation", "land"))
+def incremental_rerun(model, scale, workdir):
+    # Rerun after changing one model's parameter (a new value every call), reusing unchanged model steps
+    path = {"conservation": "model_params.conservation.restoration_budget_multiplier",
+            "land": "model_params.land.urban_growth_multiplier"}[model]
+    config = FrozenConfig(benchmark_config(workdir, incremental_models=True))
+    BangladeshNaturalResourceSimulation(config).run_simulation(*_years(11))
+    values = iter(np.linspace(0.5, 2.0, 1_000_000))
+    return lambda: BangladeshNaturalResourceSimulation(config.override({path: next(values)})).run_simulation(*_years(11))
+
+
+@benchmark("run_simulation_daily_water", params=(11,))
+def run_simulation_daily_water(n_years, scale, workdir):
+    simulation = BangladeshNaturalResourceSimulation(benchmark_config(workdir, water_time_step="daily"))
+    return lambda: simulation.run_simulation(*_years(n_years))
+
+
+@benchmark("sweep_configs", params=(10000,))
+def sweep_configs(n_configs, scale, workdir):
+    # Overlay variants of the frozen baseline, as built for ensemble members and parameter sweeps
+    values = np.linspace(0.6, 1.2, n_configs * scale)
+    return lambda: [BASELINE_CONFIG.override({"model_params.water.transboundary_flow_multiplier": value,
+                                              "model_params.climate.rcp_scenario": "RCP8.5"})
+                    for value in values]
+
+
+# --- Synthetic scale-up: more scenarios, more districts/cells ---
+
+@benchmark("run_batch_scenarios", params=(1000,))
+def run_batch_scenarios(n_scenarios, scale, workdir):
+    simulation = BangladeshNaturalResourceSimulation(benchmark_config(workdir))
+    rng = np.random.default_rng(0)
+    n = n_scenarios * scale
+    parameter_sets = {
+        "model_params.water.transboundary_flow_multiplier": rng.uniform(0.6, 1.2, n),
+        "model_params.land.urban_growth_multiplier": rng.uniform(0.5, 2.0, n),
+        "model_params.forest.deforestation_multiplier": rng.uniform(0.5, 1.5, n),
+    }
+    return lambda: simulation.run_batch(parameter_sets, *_years(11))
+
+
+@benchmark("run_spatial_districts", params=(64, 256))
+def run_spatial_districts(n_districts, scale, workdir):
+    # ~12 x 12 cells per district, so cells grow with the number of districts
+    side = int(round(np.sqrt(n_districts * scale)))
+    grid = {"kind": "raster", "rows": 12 * side, "cols": 12 * side, "cell_km": 1.0, "districts_per_side": side}
+    simulation = BangladeshNaturalResourceSimulation(benchmark_config(workdir, spatial_grid=grid))
+    return lambda: simulation.run_simulation(*_years(11))
+
+
+@benchmark("emulator_evaluate", params=(256,))
+def emulator_evaluate(n_training, scale, workdir):
+    # One slider-style query against an emulator trained on a run_batch design
+    config = benchmark_config(workdir)
+    simulation = BangladeshNaturalResourceSimulation(config)
+    rng = np.random.default_rng(0)
+    ranges = {path: spec for path, spec in SENSITIVITY_SETTINGS["ranges"].items() if spec[0] == "uniform"}
+    parameter_sets = {path: rng.uniform(low, high, n_training) for path, (_, low, high) in ranges.items()}
+    emulator = Emulator.fit(simulation.run_batch(parameter_sets, *_years(11)), config, ranges=ranges)
+    query = {path: (low + high) / 2 for path, (_, low, high) in ranges.items()}
+    return lambda: emulator.evaluate(query)
+
+
+# --- Analysis and serialization ---
+
+def _results(workdir, n_years):
+    simulation = BangladeshNaturalResourceSimulation(benchmark_config(workdir))
+    return simulation, simulation.run_simulation(*_years(n_years))
+
+
+@benchmark("run_analysis", params=(11,))
+def run_analysis(n_years, scale, workdir):
+    simulation, results = _results(workdir, n_years)
+    config = benchmark_config(workdir)
+    return lambda: NaturalResourceAnalysisEngine(results, config).run_analysis()
+
+
+@benchmark("serialize", params=("ndjson", "npz", "checkpoint"))
+def serialize(fmt, scale, workdir):
+    simulation, results = _results(workdir, 100)
+    if fmt == "checkpoint":
+        path = os.path.join(workdir, "bench.ckpt")
+        return lambda: simulation.save_checkpoint(path, results.end_year, simulation.current_state, results)
+    years = results.to_dict()
+
+    def write():
+        if fmt == "ndjson":
+            writer = NDJSONResultsWriter(os.path.join(workdir, "bench.ndjson"))
+        else:
+            writer = NpzChunkResultsWriter(tempfile.mkdtemp(dir=workdir))
+        with writer:
+            for year, year_outputs in years.items():
+                writer.write_year(year, year_outputs)
+    return write
+
+
+@benchmark("checkpoint_load", params=(100,))
+def checkpoint_load(n_years, scale, workdir):
+    simulation, results = _results(workdir, n_years)
+    path = os.path.join(workdir, "load.ckpt")
+    simulation.save_checkpoint(path, results.end_year, simulation.current_state, results)
+    return lambda: Checkpoint.load(path)
@@ -0,0 +1,29 @@
+import os
+
+from bangladesh_natural_resource_simulation.config import BASELINE_CONFIG
+from bangladesh_natural_resource_simulation.ensemble import EnsembleRunner
+from bangladesh_natural_resource_simulation.analysis.engine import NaturalResourceAnalysisEngine
+from bangladesh_natural_resource_simulation.analysis.ensemble_stats import EnsembleStatistics
+
+
+def test_run_analysis_on_ensemble_results_renders_fan_charts(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = BASELINE_CONFIG.override({
+        "start_year": 2025, "end_year": 2028, "quiet": True, "result_cache": False,
+        "results_format": "none", "plot_workers": 1, "output_dir": str(tmp_path / "outputs"),
+    })
+    runner = EnsembleRunner(config, {"model_params.water.transboundary_flow_multiplier": ("uniform", 0.8, 1.1)},
+                            n_members=4, seed=1, max_workers=1)
+    ensemble = runner.run(store_path=str(tmp_path / "store"),
+                          statistics=lambda columns, years: EnsembleStatistics(columns, years))
+
+    engine = NaturalResourceAnalysisEngine(ensemble, config)
+    engine.run_analysis()
+
+    assert engine.ensemble_plots
+    assert not engine.indicator_plots
+    for model, indicator, filename in engine.ensemble_plots:
+        assert os.path.exists(os.path.join(engine.viz_dir, filename))
+    assert os.path.exists(os.path.join(engine.viz_dir, 'urban_expansion_trend.png'))
+    with open(engine.report_file, encoding='utf-8') as f:
+        assert "Ensemble Statistics (4 members)" in f.read()
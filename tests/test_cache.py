@@ -0,0 +1,45 @@
+import os
+
+from bangladesh_natural_resource_simulation.cache import config_fingerprint
+
+
+def _rewrite_in_place(path, text, directory):
+    # Same directory mtime before and after, as when an editor saves over an existing file
+    directory_stat = os.stat(directory)
+    with open(path, 'w') as f:
+        f.write(text)
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 1_000_000))
+    os.utime(directory, ns=(directory_stat.st_atime_ns, directory_stat.st_mtime_ns))
+
+
+def test_fingerprint_changes_when_a_data_file_is_edited_in_place(tmp_path):
+    data_dir = tmp_path / "water"
+    data_dir.mkdir()
+    data_file = data_dir / "flows.csv"
+    data_file.write_text("year,flow\n2020,1.0\n")
+    config = {"data_paths": {"water_data": str(data_dir)}}
+    before = config_fingerprint(config, 2025)
+
+    _rewrite_in_place(data_file, "year,flow\n2020,2.0\n", data_dir)
+
+    assert config_fingerprint(config, 2025) != before
+
+
+def test_fingerprint_changes_when_a_historical_source_is_edited(tmp_path):
+    source = tmp_path / "groundwater.csv"
+    source.write_text("year,dhaka\n2020,1.0\n")
+    config = {"historical_sources": {"water": {"groundwater": str(source)}}}
+    before = config_fingerprint(config, 2025)
+
+    _rewrite_in_place(source, "year,dhaka\n2020,1.5\n", tmp_path)
+
+    assert config_fingerprint(config, 2025) != before
+
+
+def test_fingerprint_ignores_plotting_and_kernel_backend_settings():
+    config = {"start_year": 2025, "model_params": {"water": {"transboundary_flow_multiplier": 1.0}},
+              "plot_workers": None, "plot_all_indicators": True, "kernel_backend": "auto"}
+    before = config_fingerprint(config, 2025)
+    changed = dict(config, plot_workers=1, plot_all_indicators=False, kernel_backend="numpy")
+    assert config_fingerprint(changed, 2025) == before
+    assert config_fingerprint(dict(config, model_params={"water": {"transboundary_flow_multiplier": 0.9}}), 2025) != before
@@ -0,0 +1,63 @@
+import os
+
+import numpy as np
+
+from bangladesh_natural_resource_simulation.config import BASELINE_CONFIG, SCENARIO_GREEN_POLICY
+from bangladesh_natural_resource_simulation.checkpoint import Checkpoint, checkpoint_path
+from bangladesh_natural_resource_simulation.simulation import BangladeshNaturalResourceSimulation, fork_scenarios
+
+
+def _settings(tmp_path):
+    return {"quiet": True, "results_format": "none", "result_cache": False, "output_dir": str(tmp_path / "outputs")}
+
+
+def _assert_same_results(actual, expected, years=None):
+    if years is None:
+        assert list(actual.recorded_years) == list(expected.recorded_years)
+    for model in expected.models():
+        for indicator in expected.indicators(model):
+            expected_series = expected.series(model, indicator)
+            actual_series = actual.series(model, indicator)
+            if years is not None:
+                expected_series = expected_series[np.isin(expected.recorded_years, years)]
+                actual_series = actual_series[np.isin(actual.recorded_years, years)]
+            if expected_series.dtype == np.float64:
+                np.testing.assert_allclose(actual_series, expected_series, rtol=0, atol=1e-12,
+                                           err_msg=f"{model}.{indicator}")
+            else:
+                assert list(actual_series) == list(expected_series), f"{model}.{indicator}"
+
+
+def test_resume_from_a_mid_run_checkpoint_matches_a_straight_run(tmp_path):
+    config = BASELINE_CONFIG.override(_settings(tmp_path))
+    straight = BangladeshNaturalResourceSimulation(config).run_simulation(2025, 2035)
+
+    checkpoint_dir = str(tmp_path / "checkpoints")
+    BangladeshNaturalResourceSimulation(config).run_simulation(2025, 2030, checkpoint_every=3, checkpoint_dir=checkpoint_dir)
+    path = checkpoint_path(checkpoint_dir, config["scenario"], 2027)
+    assert os.path.exists(path)
+
+    resumed = BangladeshNaturalResourceSimulation(config).run_simulation(2025, 2035, resume_from=path)
+    _assert_same_results(resumed, straight)
+
+
+def test_fork_matches_a_full_run_of_the_forked_config(tmp_path):
+    baseline = BASELINE_CONFIG.override(_settings(tmp_path))
+    green = SCENARIO_GREEN_POLICY.override(_settings(tmp_path))
+    spin_up = BangladeshNaturalResourceSimulation(baseline)
+    spin_up_results = spin_up.run_simulation(2025, 2029)
+    checkpoint = spin_up.make_checkpoint(2029, spin_up.current_state, spin_up_results)
+
+    forks = fork_scenarios(checkpoint, {"baseline": baseline, "green": green}, end_year=2035)
+
+    # Forking the spin-up's own configuration is an uninterrupted run of it
+    _assert_same_results(forks["baseline"], BangladeshNaturalResourceSimulation(baseline).run_simulation(2025, 2035))
+    # A forked variant keeps the shared spin-up years and continues exactly like resuming it on its own
+    _assert_same_results(forks["green"], spin_up_results, years=range(2025, 2030))
+    alone = BangladeshNaturalResourceSimulation(green).run_simulation(
+        2025, 2035, resume_from=Checkpoint(checkpoint.year, checkpoint.current_state, checkpoint.model_states,
+                                           checkpoint.results, scenario=checkpoint.scenario))
+    _assert_same_results(forks["green"], alone)
+    # Years after the fork follow the forked configuration, not the spin-up's
+    assert not np.allclose(forks["green"].series('energy', 'energy_mix_renewable_share_change_percent_points')[5:],
+                           forks["baseline"].series('energy', 'energy_mix_renewable_share_change_percent_points')[5:])
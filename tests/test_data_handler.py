@@ -0,0 +1,98 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from bangladesh_natural_resource_simulation.data.handler import NaturalResourceDataHandler
+
+
+def _ingest(task):
+    store_dir, csv_path, series = task
+    handler = NaturalResourceDataHandler({"data_paths": {"store": store_dir}})
+    handler.ingest_csv('water', series, csv_path)
+
+
+def test_concurrent_ingests_keep_every_manifest_entry(tmp_path):
+    store_dir = str(tmp_path / "store")
+    tasks = []
+    for i in range(16):
+        csv_path = tmp_path / f"series_{i}.csv"
+        csv_path.write_text("year,value\n" + "".join(f"{2000 + y},{i + y}\n" for y in range(20)))
+        tasks.append((store_dir, str(csv_path), f"series_{i}"))
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        list(executor.map(_ingest, tasks))
+
+    handler = NaturalResourceDataHandler({"data_paths": {"store": store_dir}})
+    assert sorted(handler._read_manifest()) == sorted(f"water/series_{i}" for i in range(16))
+    assert handler.open_series('water', 'series_3').values[0, 0] == 3.0
+
+
+@pytest.mark.parametrize("text", ["", "year,value\n", "year\n2020\n"])
+def test_ingest_rejects_csv_without_data(tmp_path, text):
+    csv_path = tmp_path / "empty.csv"
+    csv_path.write_text(text)
+    handler = NaturalResourceDataHandler({"data_paths": {"store": str(tmp_path / "store")}})
+    with pytest.raises(ValueError):
+        handler.ingest_csv('water', 'empty', str(csv_path))
+
+
+@pytest.mark.parametrize("text", ["year,dhaka,khulna\n2020,1.0,2.0\n2021,1.5\n", "year,dhaka\n2020,1.0\n20x1,2.0\n"])
+def test_failed_ingest_leaves_no_partial_files(tmp_path, text):
+    csv_path = tmp_path / "malformed.csv"
+    csv_path.write_text(text)
+    store_dir = tmp_path / "store"
+    handler = NaturalResourceDataHandler({"data_paths": {"store": str(store_dir)}})
+    with pytest.raises(ValueError):
+        handler.ingest_csv('water', 'malformed', str(csv_path))
+    assert [path.name for path in store_dir.rglob('*') if path.is_file() and not path.name.endswith('.lock')] == []
+    assert handler.open_series('water', 'malformed') is None
+
+
+def _handler(tmp_path, text, extrapolation="linear"):
+    csv_path = tmp_path / "levels.csv"
+    csv_path.write_text(text)
+    handler = NaturalResourceDataHandler({
+        "data_paths": {"store": str(tmp_path / "store")}, "data_extrapolation": extrapolation,
+        "historical_sources": {"water": {"levels": str(csv_path)}}})
+    handler.load_historical_data(sources=["water/levels"])
+    return handler
+
+
+YEARLY = "year,dhaka,khulna\n2000,1.0,10.0\n2002,3.0,14.0\n2003,4.0,20.0\n"
+
+
+def test_year_lookup_reads_known_years_and_interpolates_gaps(tmp_path):
+    handler = _handler(tmp_path, YEARLY)
+    np.testing.assert_array_equal(handler.get_data_for_year(2002, 'water', 'levels'), [3.0, 14.0])
+    np.testing.assert_allclose(handler.get_data_for_year(2001, 'water', 'levels'), [2.0, 12.0])
+    np.testing.assert_allclose(handler.get_data_for_year(2002.5, 'water', 'levels'), [3.5, 17.0])
+    assert handler.get_data_for_year(2001, 'water', 'levels', column='khulna') == 12.0
+    assert not handler.get_data_for_year(2002, 'water', 'levels').flags.writeable
+    assert handler.get_data_for_year(2002, 'water', 'missing') is None
+
+
+@pytest.mark.parametrize("extrapolation, before, after", [
+    ("linear", [-1.0, 6.0], [6.0, 32.0]), # Trend of the first/last two years
+    ("hold", [1.0, 10.0], [4.0, 20.0]), # First/last value
+])
+def test_years_outside_the_record_are_extrapolated(tmp_path, extrapolation, before, after):
+    handler = _handler(tmp_path, YEARLY, extrapolation)
+    np.testing.assert_allclose(handler.get_data_for_year(1998, 'water', 'levels'), before)
+    np.testing.assert_allclose(handler.get_data_for_year(2005, 'water', 'levels'), after)
+    years = [1998, 2000, 2001, 2003, 2005]
+    np.testing.assert_allclose(handler.get_data_for_years(years, 'water', 'levels'),
+                               [handler.get_data_for_year(year, 'water', 'levels') for year in years])
+
+
+def test_dated_observations_are_aggregated_to_annual_means(tmp_path):
+    handler = _handler(tmp_path, "date,flow\n2019-01-01,1.0\n2019-06-01,3.0\n2020-03-01,\n2020-09-01,8.0\n")
+    assert handler.get_data_for_year(2019, 'water', 'levels') == 2.0
+    assert handler.get_data_for_year(2020, 'water', 'levels') == 8.0 # NaN cells are ignored
+
+
+def test_reloading_after_an_edit_clears_cached_lookups(tmp_path):
+    handler = _handler(tmp_path, YEARLY)
+    assert handler.get_data_for_year(2000, 'water', 'levels', column='dhaka') == 1.0
+    (tmp_path / "levels.csv").write_text(YEARLY.replace("2000,1.0", "2000,5.0") + "2004,6.0,22.0\n")
+    handler.load_historical_data(sources=["water/levels"])
+    assert handler.get_data_for_year(2000, 'water', 'levels', column='dhaka') == 5.0
@@ -0,0 +1,47 @@
+import numpy as np
+
+from bangladesh_natural_resource_simulation.config import BASELINE_CONFIG
+from bangladesh_natural_resource_simulation.emulator import Emulator
+from bangladesh_natural_resource_simulation.simulation import BangladeshNaturalResourceSimulation
+
+RANGES = {
+    "model_params.land.urban_growth_multiplier": ("uniform", 0.5, 2.0),
+    "model_params.water.transboundary_flow_multiplier": ("uniform", 0.6, 1.2),
+}
+
+
+def _fit(tmp_path):
+    config = BASELINE_CONFIG.override({"quiet": True, "results_format": "none", "result_cache": False,
+                                       "output_dir": str(tmp_path / "outputs")})
+    rng = np.random.default_rng(3)
+    values = {path: rng.uniform(low, high, 40) for path, (_, low, high) in RANGES.items()}
+    training = BangladeshNaturalResourceSimulation(config).run_batch(values, 2025, 2030)
+    return config, training, Emulator.fit(training, config, ranges=RANGES)
+
+
+def test_emulator_reproduces_its_training_points(tmp_path):
+    config, training, emulator = _fit(tmp_path)
+    for member in (0, 17, 39):
+        params = {path: float(training.parameters[path][member]) for path in RANGES}
+        results = emulator.evaluate(params)
+        assert results.emulated
+        for c, (model, indicator) in enumerate(training.columns):
+            expected = training.values[member, c]
+            np.testing.assert_allclose(results.series(model, indicator), expected,
+                                       atol=1e-3 * max(np.ptp(training.values[:, c]), 1e-9) + 1e-9,
+                                       err_msg=f"{model}.{indicator}")
+    assert emulator.fallbacks == 0
+
+
+def test_emulator_falls_back_to_the_simulation_outside_its_training_ranges(tmp_path):
+    config, training, emulator = _fit(tmp_path)
+    outside = {"model_params.land.urban_growth_multiplier": 3.0}
+    results = emulator.evaluate(outside)
+    expected = BangladeshNaturalResourceSimulation(config.override(outside)).run_simulation(2025, 2030)
+    assert not results.emulated
+    np.testing.assert_array_equal(results.series('land', 'urban_area_expansion'),
+                                  expected.series('land', 'urban_area_expansion'))
+
+    # A parameter the training did not vary also needs the full simulation
+    assert not emulator.evaluate({"model_params.climate.rcp_scenario": "RCP8.5"}).emulated
+    assert emulator.fallbacks == 2
@@ -0,0 +1,25 @@
+import numpy as np
+
+from bangladesh_natural_resource_simulation.config import BASELINE_CONFIG
+from bangladesh_natural_resource_simulation.ensemble import EnsembleRunner
+
+
+def test_members_do_not_depend_on_the_worker_count(tmp_path):
+    config = BASELINE_CONFIG.override({"start_year": 2025, "end_year": 2030, "quiet": True, "result_cache": False,
+                                       "results_format": "none", "output_dir": str(tmp_path / "outputs")})
+    distributions = {
+        "model_params.water.transboundary_flow_multiplier": ("uniform", 0.8, 1.1),
+        "model_params.climate.rcp_scenario": ("choice", ["RCP4.5", "RCP8.5"]),
+        "model_params.land.urban_growth_multiplier": ("normal", 1.0, 0.2),
+    }
+    runs = {}
+    for workers in (1, 2):
+        runner = EnsembleRunner(config, distributions, n_members=6, seed=11, max_workers=workers)
+        runs[workers] = runner.run(store_path=str(tmp_path / f"store_{workers}"))
+
+    assert runs[1].columns == runs[2].columns
+    assert runs[1].parameters == runs[2].parameters
+    assert np.array_equal(runs[1].values, runs[2].values)
+    assert runs[1].recorded.all() and runs[2].recorded.all()
+    # Members differ from each other, so the comparison is not trivially true
+    assert not np.array_equal(runs[1].values[0], runs[1].values[1])
@@ -0,0 +1,44 @@
+import numpy as np
+
+from bangladesh_natural_resource_simulation.analysis.ensemble_stats import P2Quantiles, EnsembleStatistics
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+# P-square is approximate, and least accurate in the tails: allowed error in standard deviations
+TOLERANCE = np.array([0.1, 0.03, 0.03, 0.03, 0.1])
+
+
+def test_p2_quantiles_match_sample_quantiles():
+    rng = np.random.default_rng(2025)
+    draws = rng.normal(loc=[[0.0, 10.0], [-3.0, 100.0]], scale=[[1.0, 2.0], [0.5, 25.0]], size=(4000, 2, 2))
+    estimator = P2Quantiles(QUANTILES, (2, 2))
+    for draw in draws:
+        estimator.add(draw)
+
+    expected = np.quantile(draws, QUANTILES, axis=0)
+    scale = draws.std(axis=0)
+    assert estimator.count == 4000
+    assert np.all(np.abs(estimator.estimates() - expected) <= TOLERANCE[:, None, None] * scale)
+
+
+def test_p2_quantiles_are_exact_for_the_first_observations():
+    estimator = P2Quantiles((0.25, 0.5), (1,))
+    for value in (3.0, 1.0, 2.0):
+        estimator.add([value])
+    np.testing.assert_allclose(estimator.estimates()[:, 0], np.quantile([3.0, 1.0, 2.0], (0.25, 0.5)))
+
+
+def test_ensemble_statistics_welford_moments_and_quantiles():
+    rng = np.random.default_rng(7)
+    columns = [("water", "groundwater_level_change"), ("land", "urban_area_expansion")]
+    years = np.arange(2025, 2031)
+    members = rng.normal(loc=[[-0.05], [40.0]], scale=[[0.02], [6.0]], size=(3000, 2, len(years)))
+    statistics = EnsembleStatistics(columns, years, quantiles=QUANTILES)
+    for member in members:
+        statistics.add_member(member, columns)
+
+    for c, (model, indicator) in enumerate(columns):
+        series = members[:, c]
+        np.testing.assert_allclose(statistics.mean(model, indicator), np.mean(series, axis=0), rtol=1e-12, atol=1e-12)
+        np.testing.assert_allclose(statistics.std(model, indicator) ** 2, np.var(series, axis=0, ddof=1), rtol=1e-10)
+        assert np.all(np.abs(statistics.quantiles(model, indicator) - np.quantile(series, QUANTILES, axis=0))
+                      <= TOLERANCE[:, None] * series.std(axis=0))
@@ -0,0 +1,43 @@
+import copy
+
+import pytest
+
+from bangladesh_natural_resource_simulation import config as config_module
+from bangladesh_natural_resource_simulation.config import BASELINE_CONFIG, SIMULATION_CONFIG
+from bangladesh_natural_resource_simulation.frozen_config import FrozenConfig, thaw
+
+
+def test_scenarios_leave_the_baseline_unchanged():
+    snapshot = copy.deepcopy(SIMULATION_CONFIG)
+    digest = BASELINE_CONFIG.digest()
+    high_climate = config_module.SCENARIO_HIGH_CLIMATE_IMPACT
+    green = BASELINE_CONFIG.override({
+        "scenario": "Green Policy Push",
+        "model_params.policy.renewable_energy_subsidy_level": 0.25,
+        "model_params.water.irrigation_efficiency_target": 50,
+    })
+
+    assert thaw(BASELINE_CONFIG) == snapshot
+    assert BASELINE_CONFIG.digest() == digest
+    assert BASELINE_CONFIG["model_params"]["climate"]["rcp_scenario"] == "RCP4.5"
+    assert BASELINE_CONFIG["model_params"]["water"]["transboundary_flow_multiplier"] == 1.0
+    assert high_climate["model_params"]["climate"]["rcp_scenario"] == "RCP8.5"
+    assert green == config_module.SCENARIO_GREEN_POLICY
+    with pytest.raises(TypeError):
+        high_climate["model_params"]["water"]["irrigation_efficiency_target"] = 99
+    # The plain dictionary the baseline was frozen from is not aliased either
+    assert SIMULATION_CONFIG == snapshot
+
+
+def test_nested_overrides_do_not_leak_between_sibling_overlays():
+    base = FrozenConfig({"model_params": {"water": {"flow": 1.0, "target": 40}, "climate": {"rcp": "RCP4.5"}}})
+    flow = base.override({"model_params.water.flow": 0.8})
+    target = base.override({"model_params.water.target": 60})
+
+    assert flow["model_params"]["water"] == {"flow": 0.8, "target": 40}
+    assert target["model_params"]["water"] == {"flow": 1.0, "target": 60}
+    assert base["model_params"]["water"] == {"flow": 1.0, "target": 40}
+    # Untouched sections are shared, not copied
+    assert flow["model_params"]["climate"] is base["model_params"]["climate"]
+    assert target["model_params"]["climate"] is base["model_params"]["climate"]
+    assert flow.digest() != target.digest() != base.digest()
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from bangladesh_natural_resource_simulation.config import BASELINE_CONFIG
+from bangladesh_natural_resource_simulation.cache import MODEL_OUTPUT_CACHE
+from bangladesh_natural_resource_simulation.simulation import BangladeshNaturalResourceSimulation
+
+
+def _assert_only_downstream_steps(simulation, changed, recomputed):
+    # A step may only rerun for the changed model itself, or when a model it reads reran in the
+    # same year (READS) or the year before (LAGGED_READS)
+    models = {model.STATE_KEY: model for model in simulation.models}
+    for key, year in recomputed:
+        model = models[key]
+        assert (key == changed or any((read, year) in recomputed for read in model.READS)
+                or any((read, year - 1) in recomputed for read in model.LAGGED_READS)), (key, year)
+
+
+@pytest.mark.parametrize("path, model", [
+    ("model_params.conservation.restoration_budget_multiplier", "conservation"),
+    ("model_params.land.urban_growth_multiplier", "land"),
+])
+def test_incremental_rerun_matches_a_full_rerun_and_recomputes_only_downstream_models(tmp_path, path, model):
+    MODEL_OUTPUT_CACHE.clear()
+    settings = {"quiet": True, "results_format": "none", "result_cache": False, "output_dir": str(tmp_path / "outputs")}
+    incremental = BASELINE_CONFIG.override(dict(settings, incremental_models=True))
+    BangladeshNaturalResourceSimulation(incremental).run_simulation(2025, 2035)
+
+    rerun = BangladeshNaturalResourceSimulation(incremental.override({path: 1.7}))
+    recomputed = set()
+    timed_step = rerun._timed_step
+
+    def recording_step(step_model, year, state):
+        recomputed.add((step_model.STATE_KEY, year))
+        return timed_step(step_model, year, state)
+
+    rerun._timed_step = recording_step
+    results = rerun.run_simulation(2025, 2035)
+    expected = BangladeshNaturalResourceSimulation(
+        BASELINE_CONFIG.override(dict(settings, incremental_models=False)).override({path: 1.7})).run_simulation(2025, 2035)
+
+    for column_model in expected.models():
+        for indicator in expected.indicators(column_model):
+            expected_series = expected.series(column_model, indicator)
+            if expected_series.dtype == np.float64:
+                np.testing.assert_array_equal(results.series(column_model, indicator), expected_series)
+            else:
+                assert list(results.series(column_model, indicator)) == list(expected_series)
+    assert {(model, year) for year in range(2025, 2036)} <= recomputed
+    _assert_only_downstream_steps(rerun, model, recomputed)
+    assert rerun._reused_steps == len(rerun.models) * 11 - len(recomputed) > 0
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from bangladesh_natural_resource_simulation import kernels
+
+
+def _assert_parity(backend):
+    differences = kernels.check_parity(backend=backend)
+    assert set(differences) == {"diffuse_csr[raster]", "diffuse_csr[units]", "propagate_level_csr[raster]",
+                                "propagate_level_csr[units]", "level_path_minimum"}
+    for name, difference in differences.items():
+        assert np.isfinite(difference) and difference <= 1e-9, name
+
+
+def test_python_loops_match_numpy():
+    _assert_parity("python")
+
+
+def test_numba_loops_match_numpy():
+    pytest.importorskip("numba")
+    _assert_parity("numba")
+
+
+def test_check_parity_restores_the_selected_backend():
+    previous = kernels.get_backend()
+    kernels.set_backend("numpy")
+    try:
+        kernels.check_parity(backend="python")
+        assert kernels.get_backend() == "numpy"
+    finally:
+        kernels.set_backend(previous)
@@ -0,0 +1,69 @@
+import os
+
+from bangladesh_natural_resource_simulation.models.base import ResourceModel, DataSection, clear_data_cache
+from bangladesh_natural_resource_simulation.data.handler import path_signature
+
+
+class _FileBackedModel(ResourceModel):
+    STATE_KEY = 'file_backed'
+    DATA_PATH_KEY = 'test_data'
+    levels = DataSection('_load_levels')
+
+    loads = 0
+
+    def __init__(self, config):
+        self.config = config
+
+    def _load_levels(self, config):
+        type(self).loads += 1
+        with open(os.path.join(config["data_paths"]["test_data"], 'levels.csv')) as f:
+            return f.read()
+
+
+def test_data_section_reloads_after_a_file_is_edited_in_place(tmp_path):
+    clear_data_cache()
+    data_file = tmp_path / "levels.csv"
+    data_file.write_text("1.0\n")
+    config = {"data_paths": {"test_data": str(tmp_path)}}
+    assert _FileBackedModel(config).levels == "1.0\n"
+    assert _FileBackedModel(config).levels == "1.0\n"
+
+    directory_stat = os.stat(tmp_path)
+    data_file.write_text("2.5\n")
+    os.utime(data_file, ns=(data_file.stat().st_atime_ns, data_file.stat().st_mtime_ns + 1_000_000))
+    os.utime(tmp_path, ns=(directory_stat.st_atime_ns, directory_stat.st_mtime_ns))
+
+    assert _FileBackedModel(config).levels == "2.5\n"
+
+
+def test_data_section_is_loaded_once_and_shared_across_instances(tmp_path):
+    clear_data_cache()
+    (tmp_path / "levels.csv").write_text("1.0\n")
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "levels.csv").write_text("7.0\n")
+    _FileBackedModel.loads = 0
+    config = {"data_paths": {"test_data": str(tmp_path)}}
+
+    first, second = _FileBackedModel(dict(config)), _FileBackedModel(dict(config))
+    assert first.levels is second.levels
+    assert _FileBackedModel.loads == 1
+    # A different data path is a different cache entry
+    assert _FileBackedModel({"data_paths": {"test_data": str(other)}}).levels == "7.0\n"
+    assert _FileBackedModel.loads == 2
+
+
+def test_data_section_reloads_when_the_path_signature_changes(tmp_path):
+    clear_data_cache()
+    (tmp_path / "levels.csv").write_text("1.0\n")
+    _FileBackedModel.loads = 0
+    config = {"data_paths": {"test_data": str(tmp_path)}}
+    _FileBackedModel(config).levels
+    signature = path_signature(str(tmp_path))
+
+    (tmp_path / "notes.txt").write_text("new file under the data path\n")
+    assert path_signature(str(tmp_path)) != signature
+    _FileBackedModel(config).levels
+    assert _FileBackedModel.loads == 2
+    _FileBackedModel(config).levels
+    assert _FileBackedModel.loads == 2
@@ -0,0 +1,48 @@
+import pytest
+
+from bangladesh_natural_resource_simulation.scheduler import (
+    ModelScheduler, DependencyCycleError, UndeclaredStateReadError)
+
+
+def _model(key, reads=(), lagged_reads=(), compute=None):
+    # Minimal component model: writes {'value': compute(year, state)} to current_state[key]
+    def simulate(self, year, state):
+        return {"value": compute(year, state) if compute else year}
+    return type(f"{key.title()}Model", (), {"STATE_KEY": key, "READS": tuple(reads), "LAGGED_READS": tuple(lagged_reads),
+                                           "SIMULATE_METHOD": "simulate", "simulate": simulate})()
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_undeclared_read_is_detected(max_workers):
+    scheduler = ModelScheduler([_model("climate"), _model("water", compute=lambda year, state: state["climate"]["value"])],
+                               max_workers=max_workers)
+    with pytest.raises(UndeclaredStateReadError, match="water.*climate"):
+        scheduler.run_year(2025, {})
+
+
+def test_declared_reads_change_the_schedule():
+    def water(year, state):
+        return state["climate"]["value"] * 2
+
+    undeclared = ModelScheduler([_model("water"), _model("climate")])
+    assert undeclared.order == ["water", "climate"]
+
+    scheduler = ModelScheduler([_model("water", reads=["climate"], compute=water),
+                                _model("climate", compute=lambda year, state: year + 0.5)])
+    assert scheduler.order == ["climate", "water"]
+    assert scheduler.levels() == [["climate"], ["water"]]
+    assert scheduler.run_year(2025, {})["water"]["value"] == 4051.0
+
+
+def test_lagged_reads_see_the_previous_year_and_do_not_constrain_order():
+    scheduler = ModelScheduler([_model("land", lagged_reads=["water"], compute=lambda year, state: state["water"]["value"]),
+                                _model("water")])
+    assert scheduler.order == ["land", "water"]
+    current_state = {"water": {"value": 2024}}
+    assert scheduler.run_year(2025, current_state)["land"]["value"] == 2024
+    assert current_state["water"]["value"] == 2025
+
+
+def test_same_year_cycle_is_rejected():
+    with pytest.raises(DependencyCycleError, match="climate.*water|water.*climate"):
+        ModelScheduler([_model("water", reads=["climate"]), _model("climate", reads=["water"]), _model("land", reads=["water"])])
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from bangladesh_natural_resource_simulation.config import BASELINE_CONFIG
+from bangladesh_natural_resource_simulation.cache import ScenarioResultCache
+from bangladesh_natural_resource_simulation.simulation import BangladeshNaturalResourceSimulation
+
+
+def _simulation(tmp_path):
+    return BangladeshNaturalResourceSimulation(BASELINE_CONFIG.override({
+        "quiet": True, "results_format": "none", "output_dir": str(tmp_path / "outputs")}))
+
+
+def test_result_cache_hit_restores_the_final_state(tmp_path):
+    cache = ScenarioResultCache(str(tmp_path / "cache"))
+    first = _simulation(tmp_path)
+    first.run_simulation_cached(2025, 2030, cache=cache)
+    expected = _simulation(tmp_path).run_simulation(2025, 2035)
+
+    served = _simulation(tmp_path)
+    results = served.run_simulation_cached(2025, 2030, cache=cache)
+    assert served.current_state == first.current_state
+
+    # Continuing from the served state matches an uninterrupted run
+    continued = served.run_simulation(2025, 2035, resume_from=served.make_checkpoint(2030, served.current_state, results))
+    for model in expected.models():
+        for indicator in expected.indicators(model):
+            if expected.series(model, indicator).dtype == np.float64:
+                np.testing.assert_allclose(continued.series(model, indicator), expected.series(model, indicator))
+
+
+@pytest.mark.parametrize("water_time_step", ["annual", "monthly"])
+def test_run_batch_matches_per_scenario_runs(tmp_path, water_time_step):
+    parameter_sets = {
+        "model_params.climate.rcp_scenario": np.array(["RCP2.6", "RCP4.5", "RCP8.5", "RCP6.0"]),
+        "model_params.water.transboundary_flow_multiplier": np.array([0.7, 1.0, 0.85, 1.15]),
+        "model_params.land.urban_growth_multiplier": np.array([0.5, 1.0, 2.0, 1.3]),
+        "model_params.conservation.restoration_budget_multiplier": np.array([1.0, 0.5, 1.5, 2.0]),
+    }
+    config = BASELINE_CONFIG.override({"quiet": True, "results_format": "none", "result_cache": False,
+                                       "water_time_step": water_time_step, "output_dir": str(tmp_path / "outputs")})
+    batch = BangladeshNaturalResourceSimulation(config).run_batch(parameter_sets, 2025, 2030)
+
+    for scenario in range(4):
+        scenario_config = config.override({path: values[scenario].item() for path, values in parameter_sets.items()})
+        expected = BangladeshNaturalResourceSimulation(scenario_config).run_simulation(2025, 2030)
+        for model, indicator in batch.columns:
+            np.testing.assert_allclose(batch.series(model, indicator)[scenario], expected.series(model, indicator),
+                                       rtol=1e-12, atol=1e-12, err_msg=f"{model}.{indicator}, scenario {scenario}")
@@ -0,0 +1,41 @@
+import numpy as np
+
+from bangladesh_natural_resource_simulation.config import BASELINE_CONFIG
+from bangladesh_natural_resource_simulation.simulation import BangladeshNaturalResourceSimulation
+from bangladesh_natural_resource_simulation.writers import (
+    NDJSONResultsWriter, NpzChunkResultsWriter, read_ndjson_results, read_npz_chunks)
+
+
+def _run(tmp_path, writer):
+    config = BASELINE_CONFIG.override({"quiet": True, "results_format": "none", "result_cache": False,
+                                       "output_dir": str(tmp_path / "outputs")})
+    with writer:
+        results = BangladeshNaturalResourceSimulation(config).run_simulation(2025, 2035, writer=writer)
+    expected = results.to_dict()
+    labels = [(model, indicator) for model in results.models() for indicator in results.indicators(model)
+              if results.series(model, indicator).dtype != np.float64]
+    assert labels, "expected non-numeric status indicators in the run"
+    return expected
+
+
+def test_ndjson_round_trip(tmp_path):
+    path = str(tmp_path / "results.ndjson")
+    expected = _run(tmp_path, NDJSONResultsWriter(path))
+    assert read_ndjson_results(path).to_dict() == expected
+
+
+def test_npz_chunks_round_trip(tmp_path):
+    directory = str(tmp_path / "chunks")
+    expected = _run(tmp_path, NpzChunkResultsWriter(directory, chunk_years=4))
+    columns = read_npz_chunks(directory)
+
+    assert list(columns["year"]) == sorted(expected)
+    for offset, year in enumerate(columns["year"]):
+        for model, indicators in expected[int(year)].items():
+            for indicator, value in indicators.items():
+                stored = columns[f"{model}.{indicator}"][offset]
+                if isinstance(value, str):
+                    assert str(stored) == value
+                else:
+                    assert float(stored) == value, (year, model, indicator)
+    assert len(columns) == 1 + sum(len(indicators) for indicators in expected[2025].values())